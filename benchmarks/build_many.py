@@ -0,0 +1,62 @@
+"""
+Throughput of `Judgement.build_many` vs a loop of single constructors, each
+wrapped into its own try/except (as it used to be done before).
+
+Usage: python -m benchmarks.build_many
+"""
+
+import time
+
+from bundlebuilder.constants import VALIDATION_ENGINE_CHOICES
+from bundlebuilder.exceptions import ValidationError
+from bundlebuilder.models import Judgement
+from bundlebuilder.models.entity import set_validation_engine
+from benchmarks.utils import judgement_data
+
+ROWS_COUNT = 20000
+
+# Every tenth row is invalid.
+INVALID_ROW_EVERY = 10
+
+
+def make_rows():
+    rows = []
+    for index in range(ROWS_COUNT):
+        row = judgement_data()
+        if index % INVALID_ROW_EVERY == 0:
+            row['priority'] = -1
+        rows.append(row)
+    return rows
+
+
+def build_one_by_one(rows):
+    entities, failures = [], []
+    for index, row in enumerate(rows):
+        try:
+            entities.append(Judgement(**row))
+        except ValidationError as error:
+            failures.append((index, error.args))
+    return entities, failures
+
+
+def throughput(function, rows):
+    start = time.perf_counter()
+    function(rows)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main():
+    rows = make_rows()
+
+    for engine in VALIDATION_ENGINE_CHOICES:
+        set_validation_engine(engine)
+
+        single = throughput(build_one_by_one, rows)
+        batch = throughput(Judgement.build_many, rows)
+
+        print(f'{engine:<12} single: {single:>10.0f} rows/s   '
+              f'batch: {batch:>10.0f} rows/s   ({batch / single:.2f} x)')
+
+
+if __name__ == '__main__':
+    main()
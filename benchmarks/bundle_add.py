@@ -0,0 +1,60 @@
+"""
+Cost of adding lots of entities to a bundle with the old approach (a fresh
+field per entity appended to a plain list), one by one (a cached field per
+entity type) and in bulk.
+
+Usage: python -m benchmarks.bundle_add
+"""
+
+from bundlebuilder.models import (
+    Bundle,
+    Sighting,
+)
+from bundlebuilder.models.fields import EntityField
+from benchmarks.utils import (
+    make_sighting,
+    measure,
+    report,
+)
+
+
+def old_add_sightings(bundle, sightings, ref=False):
+    for sighting in sightings:
+        field = EntityField(type=Sighting, ref=ref)
+        data = field.deserialize(sighting)
+        key = 'sighting' + ('_refs' if ref else 's')
+        bundle.json.setdefault(key, []).append(data)
+
+
+def main():
+    sightings = [make_sighting() for _ in range(1000)]
+
+    for ref in [False, True]:
+        name = '1000 sighting refs' if ref else '1000 sightings'
+
+        report(
+            f'{name}: old',
+            measure(
+                lambda: old_add_sightings(Bundle(), sightings, ref),
+                number=20,
+            ),
+        )
+
+        def add_one_by_one():
+            bundle = Bundle()
+            for sighting in sightings:
+                bundle.add_sighting(sighting, ref)
+            return bundle.json
+
+        report(f'{name}: one by one', measure(add_one_by_one, number=20))
+
+        def add_in_bulk():
+            bundle = Bundle()
+            bundle.add_sightings(sightings, ref)
+            return bundle.json
+
+        report(f'{name}: in bulk', measure(add_in_bulk, number=20))
+
+
+if __name__ == '__main__':
+    main()
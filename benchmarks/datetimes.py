@@ -0,0 +1,61 @@
+"""
+Cost of normalizing timestamps with the old approach (a full round trip
+through marshmallow's ISO 8601 parser) vs the new one (a dedicated parser
+for the most common shape with a cache of recently normalized values).
+
+Usage: python -m benchmarks.datetimes
+"""
+
+import datetime as dt
+
+from marshmallow import fields as f
+
+from bundlebuilder.models.fields import (
+    DateTimeField,
+    _normalize_datetime,
+)
+from benchmarks.utils import (
+    measure,
+    report,
+)
+
+
+class OldDateTimeField(f.NaiveDateTime):
+
+    def __init__(self, **kwargs):
+        kwargs['format'] = 'iso8601'
+        kwargs['timezone'] = dt.timezone.utc
+        super().__init__(**kwargs)
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, dt.datetime):
+            value = value.isoformat()
+
+        datetime = super()._deserialize(value, attr, data, **kwargs)
+
+        return datetime.isoformat(timespec='milliseconds') + 'Z'
+
+
+def main():
+    old = OldDateTimeField()
+    new = DateTimeField()
+
+    for name, value in [
+        ('string', '2019-03-01T22:26:29.229Z'),
+        ('naive datetime', dt.datetime(2019, 3, 1, 22, 26, 29, 229000)),
+        ('aware datetime',
+         dt.datetime(2019, 3, 1, 22, 26, 29, 229000, tzinfo=dt.timezone.utc)),
+    ]:
+        report(f'{name}: old', measure(lambda: old.deserialize(value)))
+
+        def uncached():
+            _normalize_datetime.cache_clear()
+            return new.deserialize(value)
+
+        report(f'{name}: new (uncached)', measure(uncached))
+        report(f'{name}: new (cached)',
+               measure(lambda: new.deserialize(value)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Time of re-encoding a bundle of sightings (e.g. when retrying an upload) by
+dumping its whole JSON every time vs joining the cached encoded entities,
+with each JSON encoder available.
+
+Usage: python -m benchmarks.encoding
+"""
+
+import json
+
+from bundlebuilder.constants import JSON_ENCODER_CHOICES
+from bundlebuilder.encoding import (
+    get_json_encoder,
+    set_json_encoder,
+)
+from bundlebuilder.models import (
+    Bundle,
+    Observable,
+    Sighting,
+)
+from benchmarks.utils import (
+    measure,
+    report,
+    sighting_data,
+)
+
+
+def make_sighting(index):
+    return Sighting(**{
+        **sighting_data(),
+        'observables': [Observable(type='domain',
+                                   value=f'{index}.example.com')],
+    })
+
+
+def main():
+    previous_encoder = get_json_encoder()
+
+    for count in [100, 1000]:
+        bundle = Bundle()
+        bundle.add_sightings(make_sighting(index) for index in range(count))
+
+        report(
+            f'{count} sightings: json.dumps',
+            measure(lambda: json.dumps(bundle.json), number=10),
+        )
+
+        for encoder in JSON_ENCODER_CHOICES:
+            try:
+                set_json_encoder(encoder)
+            except ValueError:
+                print(f'{count} sightings: {encoder} is not installed')
+                continue
+
+            bundle.to_bytes()
+            report(
+                f'{count} sightings: to_bytes ({encoder}, cached)',
+                measure(bundle.to_bytes, number=10),
+            )
+
+    set_json_encoder(previous_encoder)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Cost of generating XIDs with the old approach (formatting, encoding and fully
+hashing every seed tuple) vs the new one (a generator per XID prefix and entity
+type reusing a pre-hashed state, memoizing digests and deferring the whole
+computation until the XIDs are actually needed).
+
+Usage: python -m benchmarks.external_ids
+"""
+
+from hashlib import sha256
+from itertools import chain
+
+from bundlebuilder.models import Sighting
+from bundlebuilder.models.external_ids import ExternalIdGenerator
+from bundlebuilder.session import get_session
+from benchmarks.utils import (
+    measure,
+    report,
+    sighting_data,
+)
+
+
+def old_external_ids(external_id_prefix, type_, seed_values_list, salts):
+    return [
+        '{prefix}-{type}-{sha256}'.format(
+            prefix=external_id_prefix,
+            type=type_,
+            sha256=sha256(
+                bytes(
+                    '|'.join(
+                        filter(
+                            bool,
+                            chain((external_id_prefix,) + seed_values, salts),
+                        )
+                    ),
+                    'utf-8',
+                )
+            ).hexdigest(),
+        )
+        for seed_values in seed_values_list
+    ]
+
+
+def main():
+    external_id_prefix = get_session().external_id_prefix
+
+    for observables_count in [1, 100, 5000]:
+        number = max(10, 10000 // observables_count)
+
+        sighting = Sighting(**sighting_data(observables_count))
+        seed_values_list = list(sighting._generate_external_id_seed_values())
+
+        name = f'{observables_count} observable(s)'
+
+        report(
+            f'{name}: old',
+            measure(
+                lambda: old_external_ids(
+                    external_id_prefix, 'sighting', seed_values_list, [],
+                ),
+                number=number,
+            ),
+        )
+
+        def uncached():
+            generator = ExternalIdGenerator(external_id_prefix, 'sighting')
+            return generator.generate(seed_values_list, [])
+
+        report(f'{name}: new (uncached)', measure(uncached, number=number))
+
+        generator = ExternalIdGenerator(external_id_prefix, 'sighting')
+        report(
+            f'{name}: new (cached)',
+            measure(
+                lambda: generator.generate(seed_values_list, []),
+                number=number,
+            ),
+        )
+
+        data = sighting_data(observables_count)
+        report(
+            f'{name}: build sighting (lazy XIDs)',
+            measure(lambda: Sighting(**data), number=number),
+        )
+        report(
+            f'{name}: build sighting + read XIDs',
+            measure(lambda: Sighting(**data).external_ids, number=number),
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Throughput of building judgements and verdicts out of a feed of observables
+with different numbers of worker processes.
+
+Usage: python -m benchmarks.feeds
+"""
+
+import os
+import time
+
+from bundlebuilder.feeds import (
+    EntityMapping,
+    iter_feed_entities,
+)
+from bundlebuilder.models.entity import set_validation_engine
+
+MAPPING = EntityMapping({
+    'observable': {'type': 'domain', 'value': '$domain'},
+    'judgement': {
+        'confidence': 'High',
+        'disposition': 2,
+        'disposition_name': 'Malicious',
+        'priority': 95,
+        'severity': 'High',
+        'valid_time': {},
+    },
+    'verdict': True,
+})
+
+
+def main():
+    set_validation_engine('compiled')
+
+    count = 20000
+    records = [{'domain': f'{index}.example.com'} for index in range(count)]
+
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        for _ in iter_feed_entities(records, MAPPING, workers=workers):
+            pass
+        elapsed = time.perf_counter() - start
+
+        print(f'{count} records: {workers:>2} workers '
+              f'{count / elapsed:>10.0f} records/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Cold start import time (as reported by `python -X importtime`) of the models
+package alone, of a single model, and of all the models (i.e. what importing
+the models package alone used to cost before the models became lazy).
+
+Usage: python -m benchmarks.import_time
+"""
+
+import statistics
+import subprocess
+import sys
+
+RUNS = 10
+
+STATEMENTS = [
+    # The imports of the interpreter itself (e.g. `site`).
+    'pass',
+    'import bundlebuilder.models',
+    'from bundlebuilder.models import Judgement',
+    'from bundlebuilder.models import ' + ', '.join([
+        'Bundle', 'Indicator', 'Judgement', 'Relationship', 'Sighting',
+        'Verdict', 'ObservedTime', 'ValidTime',
+    ]),
+    'import bundlebuilder.models; bundlebuilder.preload(freeze=False)',
+]
+
+
+def measure_import_time(statement):
+    """Return the total import time (in seconds) of a fresh interpreter."""
+
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    ).stderr
+
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        # Count only the top-level imports (nested ones are indented).
+        if cumulative.strip().isdigit() and not name.startswith('  '):
+            total += int(cumulative)
+    return total / 1e6
+
+
+def main():
+    for statement in STATEMENTS:
+        seconds = statistics.median(
+            measure_import_time(statement) for _ in range(RUNS)
+        )
+        print(f'{seconds * 1e3:>8.2f} ms  {statement[:70]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Peak memory and time of reading the entities of a bundle file by loading its
+whole JSON at once (the old approach) vs loading them incrementally one by
+one. The entities are just counted in both cases.
+
+Usage: python -m benchmarks.loading
+"""
+
+import json
+import tempfile
+import time
+import tracemalloc
+
+from bundlebuilder.models import (
+    Bundle,
+    Observable,
+    Sighting,
+)
+from bundlebuilder.writer import BundleWriter
+from benchmarks.utils import sighting_data
+
+
+def json_load(fp):
+    return sum(1 for _ in json.load(fp)['sightings'])
+
+
+def iter_load(fp):
+    return sum(1 for _ in Bundle.iter_load(fp))
+
+
+def main():
+    for count in [1000, 10000]:
+        with tempfile.TemporaryFile('w+', encoding='utf-8') as fp:
+            with BundleWriter(fp) as writer:
+                for index in range(count):
+                    writer.add_sighting(Sighting(**{
+                        **sighting_data(),
+                        'observables': [Observable(
+                            type='domain', value=f'{index}.example.com',
+                        )],
+                    }))
+
+            size = fp.tell()
+
+            for name, function in [('json.load', json_load),
+                                   ('iter_load', iter_load)]:
+                fp.seek(0)
+                tracemalloc.start()
+                start = time.perf_counter()
+                assert function(fp) == count
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                print(f'{count} sightings ({size / 2 ** 20:.2f} MiB): '
+                      f'{name:<9} {peak / 2 ** 20:>8.2f} MiB peak '
+                      f'{elapsed:>8.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Memory used per entity (including its JSON) by observables, judgements and
+sightings, along with the memory used by the entity objects alone, i.e. with
+the slots of the entities vs with an instance dict holding the same
+attributes (the old layout).
+
+Usage: python -m benchmarks.memory
+"""
+
+import tracemalloc
+
+from bundlebuilder.models import (
+    Judgement,
+    Observable,
+    Sighting,
+)
+from benchmarks.utils import (
+    judgement_data,
+    sighting_data,
+)
+
+COUNT = 10000
+
+
+class DictLayout:
+    """Entity object keeping its attributes in an instance dict."""
+
+
+def measure(build):
+    """Return the memory (in bytes) used per object built."""
+
+    tracemalloc.start()
+    objects = [build(index) for index in range(COUNT)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size / COUNT, objects
+
+
+def build_dict_layout(entity):
+    # Set the same attributes the entity has set in its slots.
+    obj = DictLayout()
+    for cls in type(entity).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            value = getattr(entity, name, None)
+            if value is not None:
+                setattr(obj, name, value)
+    return obj
+
+
+def build_resolved(build, index):
+    entity = build(index)
+    # Resolve the XIDs of primary entities.
+    entity.json
+    return entity
+
+
+def main():
+    for name, build in [
+        ('Observable', lambda index: Observable(
+            type='domain', value=f'{index}.example.com',
+        )),
+        ('Judgement', lambda index: Judgement(**{
+            **judgement_data(),
+            'observable': Observable(type='domain',
+                                     value=f'{index}.example.com'),
+        })),
+        ('Sighting', lambda index: Sighting(**{
+            **sighting_data(),
+            'observables': [Observable(type='domain',
+                                       value=f'{index}.example.com')],
+        })),
+    ]:
+        size, entities = measure(lambda index: build_resolved(build, index))
+        slots_size, _ = measure(lambda index: type(entities[index]).__new__(
+            type(entities[index])
+        ))
+        dict_size, _ = measure(
+            lambda index: build_dict_layout(entities[index])
+        )
+
+        print(f'{name:<12} {size:>8.0f} bytes per entity (total) '
+              f'{slots_size:>6.0f} bytes (slots) vs '
+              f'{dict_size:>6.0f} bytes (dict)')
+
+
+if __name__ == '__main__':
+    main()
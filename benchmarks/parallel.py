@@ -0,0 +1,58 @@
+"""
+Time of building a bundle of judgements sequentially (the old approach) vs in
+parallel by different numbers of worker processes.
+
+Usage: python -m benchmarks.parallel
+"""
+
+import os
+import time
+
+from bundlebuilder.models import (
+    Bundle,
+    Judgement,
+    Observable,
+)
+from bundlebuilder.models.entity import set_validation_engine
+from bundlebuilder.parallel import build
+from benchmarks.utils import judgement_data
+
+
+def make_judgement(index):
+    return Judgement(**{
+        **judgement_data(),
+        'observable': Observable(type='domain', value=f'{index}.example.com'),
+    })
+
+
+def build_sequentially(records):
+    bundle = Bundle()
+    for record in records:
+        bundle.add_judgement(make_judgement(record))
+    return bundle
+
+
+def main():
+    set_validation_engine('compiled')
+
+    count = 20000
+    records = range(count)
+
+    runs = [('sequential', lambda: build_sequentially(records))] + [
+        (f'{workers} workers',
+         lambda workers=workers: build(records, make_judgement, workers))
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1})
+    ]
+
+    for name, function in runs:
+        start = time.perf_counter()
+        bundle = function()
+        elapsed = time.perf_counter() - start
+
+        assert len(bundle.json['judgements']) == count
+        print(f'{count} judgements: {name:<12} '
+              f'{count / elapsed:>10.0f} entities/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Scaling of partitioning bundles by the locality of relationships, i.e. the time
+per entity should stay roughly the same no matter how many entities there are.
+
+Usage: python -m benchmarks.partitioner
+"""
+
+import time
+
+from bundlebuilder.models import (
+    Judgement,
+    Observable,
+    Relationship,
+    Sighting,
+)
+from bundlebuilder.partitioner import BundlePartitioner
+from bundlebuilder.splitter import BundleSplitter
+from benchmarks.utils import (
+    judgement_data,
+    sighting_data,
+)
+
+
+def make_entities(groups_count):
+    entities = []
+    for index in range(groups_count):
+        observable = Observable(type='domain', value=f'{index}.example.com')
+        sighting = Sighting(
+            **{**sighting_data(), 'observables': [observable]}
+        )
+        judgement = Judgement(**{**judgement_data(), 'observable': observable})
+        relationship = Relationship(
+            relationship_type='based-on',
+            source_ref=sighting,
+            target_ref=judgement,
+        )
+        entities.extend([sighting, relationship])
+        # Put the judgements far away from their relationships.
+        entities.insert(0, judgement)
+    return entities
+
+
+def main():
+    for groups_count in [1000, 4000, 16000]:
+        entities = make_entities(groups_count)
+
+        for name, cls in [('split', BundleSplitter),
+                          ('partition', BundlePartitioner)]:
+            start = time.perf_counter()
+            builder = cls(max_entities=1000)
+            builder.add_many(entities)
+            bundles = builder.close()
+            elapsed = time.perf_counter() - start
+
+            print(f'{len(entities)} entities: {name:<9} '
+                  f'{len(bundles):>4} bundles '
+                  f'{elapsed / len(entities) * 1e6:>8.2f} us per entity')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Round-trip cost of pickling and copying large sightings by shipping just their
+validated JSON vs rebuilding them from their fields (i.e. validating them all
+over again).
+
+Usage: python -m benchmarks.pickling
+"""
+
+import copy
+import pickle
+
+from bundlebuilder.models import Sighting
+from benchmarks.utils import (
+    measure,
+    report,
+    sighting_data,
+)
+
+
+def main():
+    for observables_count in [10, 100, 1000]:
+        data = sighting_data(observables_count=observables_count)
+        sighting = Sighting(**data)
+        name = f'{observables_count} observables'
+
+        report(f'{name}: rebuild', measure(lambda: Sighting(**data), 100))
+        report(
+            f'{name}: pickle',
+            measure(lambda: pickle.loads(pickle.dumps(sighting)), 100),
+        )
+        report(f'{name}: copy', measure(lambda: copy.copy(sighting), 100))
+        report(
+            f'{name}: deepcopy', measure(lambda: copy.deepcopy(sighting), 100),
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Blocking of the event loop of an asyncio app while building a bundle of
+judgements right in the event loop (the old approach) vs offloading building
+to the default executor (i.e. threads) or to a pool of worker processes.
+
+The lag is how late a ticker sleeping for 1 ms at a time wakes up, i.e. how
+long any other tasks (e.g. serving requests) would have to wait.
+
+Usage: python -m benchmarks.pipeline
+"""
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bundlebuilder.models import Bundle
+from bundlebuilder.pipeline import build_async
+from benchmarks.parallel import make_judgement
+
+TICK = 0.001
+
+
+async def aiter_records(count):
+    for index in range(count):
+        if index % 100 == 0:
+            # Pretend that the records are fetched from somewhere.
+            await asyncio.sleep(0)
+        yield index
+
+
+async def build_in_loop(records):
+    bundle = Bundle()
+    async for record in records:
+        bundle.add_judgement(make_judgement(record))
+    return bundle
+
+
+async def measure_lag(coroutine):
+    lags = []
+    done = False
+
+    async def tick():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    ticker = asyncio.ensure_future(tick())
+    start = time.perf_counter()
+    bundle = await coroutine
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticker
+
+    return bundle, elapsed, lags
+
+
+def main():
+    count = 5000
+
+    with ProcessPoolExecutor() as executor:
+        runs = [
+            ('in loop', lambda: build_in_loop(aiter_records(count))),
+            ('threads', lambda: build_async(
+                aiter_records(count), make_judgement, batch_size=100,
+            )),
+            ('processes', lambda: build_async(
+                aiter_records(count), make_judgement, executor=executor,
+                batch_size=100,
+            )),
+        ]
+
+        for name, function in runs:
+            loop = asyncio.new_event_loop()
+            try:
+                bundle, elapsed, lags = loop.run_until_complete(
+                    measure_lag(function())
+                )
+            finally:
+                loop.close()
+
+            assert len(bundle.json['judgements']) == count
+            print(f'{count} judgements: {name:<10} '
+                  f'{elapsed:>6.2f} s total '
+                  f'{max(lags) * 1e3:>8.2f} ms max lag '
+                  f'{sum(lags) / len(lags) * 1e3:>6.2f} ms mean lag')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+First-request latency and memory of forked worker processes (like the workers
+of a pre-fork server) without preloading (the old behavior) vs with preloading
+in the parent process before forking.
+
+The models are imported by the parent process in both cases (like by an app
+importing them at the top level). The memory is the private (i.e. not shared
+with the parent process) memory of each worker after handling its first
+request (Linux only).
+
+Usage: python -m benchmarks.preload
+"""
+
+import os
+import sys
+import time
+
+from bundlebuilder.models import (
+    Bundle,
+    Judgement,
+    Observable,
+    Sighting,
+)
+from bundlebuilder.models.entity import set_validation_engine
+from benchmarks.utils import (
+    judgement_data,
+    sighting_data,
+)
+
+WORKERS = 4
+
+
+def handle_request():
+    bundle = Bundle()
+    bundle.add_judgement(Judgement(**{
+        **judgement_data(),
+        'observable': Observable(type='domain', value='example.com'),
+    }))
+    bundle.add_sighting(Sighting(**sighting_data()))
+    return bundle.to_bytes()
+
+
+def get_private_memory():
+    total = 0
+    with open('/proc/self/smaps_rollup') as fp:
+        for line in fp:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1])
+    return total  # KiB
+
+
+def run_worker(fd):
+    start = time.perf_counter()
+    handle_request()
+    elapsed = time.perf_counter() - start
+    os.write(fd, f'{elapsed} {get_private_memory()}\n'.encode())
+
+
+def main(preload):
+    set_validation_engine('compiled')
+
+    if preload:
+        import bundlebuilder
+        bundlebuilder.preload()
+
+    read_fd, write_fd = os.pipe()
+
+    for _ in range(WORKERS):
+        if os.fork() == 0:
+            os.close(read_fd)
+            run_worker(write_fd)
+            os._exit(0)
+
+    os.close(write_fd)
+    for _ in range(WORKERS):
+        os.wait()
+
+    with os.fdopen(read_fd) as fp:
+        results = [tuple(map(float, line.split())) for line in fp]
+
+    latency = sum(elapsed for elapsed, _ in results) / len(results)
+    memory = sum(private for _, private in results) / len(results)
+
+    name = 'preload' if preload else 'no preload'
+    print(f'{WORKERS} workers: {name:<12} '
+          f'{latency * 1e3:>8.2f} ms first request '
+          f'{memory / 1024:>8.2f} MiB private per worker')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(preload=sys.argv[1] == 'preload')
+    else:
+        # Run each case in a fresh interpreter, so that nothing is preloaded
+        # by the previous one.
+        for argument in ['no-preload', 'preload']:
+            os.spawnv(os.P_WAIT, sys.executable, [
+                sys.executable, '-m', 'benchmarks.preload', argument,
+            ])
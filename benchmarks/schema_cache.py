@@ -0,0 +1,38 @@
+"""
+Per-entity cost of validation with a fresh schema instance per entity (the
+old behavior) vs a single cached schema instance per entity class.
+
+Usage: python -m benchmarks.schema_cache
+"""
+
+from bundlebuilder.models import (
+    Judgement,
+    Observable,
+    Sighting,
+    ValidTime,
+)
+from benchmarks.utils import (
+    judgement_data,
+    sighting_data,
+    measure,
+    report,
+)
+
+
+def main():
+    for cls, data in [
+        (Judgement, judgement_data()),
+        (Sighting, sighting_data()),
+        (Observable, {'type': 'ip', 'value': '187.75.16.75'}),
+        (ValidTime, {'start_time': '2019-03-01T22:26:29.229Z'}),
+    ]:
+        fresh = measure(lambda: cls.schema().load(data))
+        cached = measure(lambda: cls._schema.load(data))
+
+        report(f'{cls.__name__}: fresh schema per entity', fresh)
+        report(f'{cls.__name__}: cached schema per class', cached)
+        print(f'{"":<48} {fresh / cached:>10.2f} x')
+
+
+if __name__ == '__main__':
+    main()
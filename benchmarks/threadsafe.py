@@ -0,0 +1,56 @@
+"""
+Time of adding judgements to a single bundle from multiple threads by wrapping
+each addition in a lock (the old approach) vs buffering the additions per
+thread with a thread-safe bundle.
+
+Usage: python -m benchmarks.threadsafe
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from bundlebuilder.models import Bundle
+from bundlebuilder.threadsafe import ThreadSafeBundle
+from benchmarks.parallel import make_judgement
+
+
+def add_with_lock(judgements):
+    bundle = Bundle()
+    lock = Lock()
+
+    def add(judgement):
+        with lock:
+            bundle.add_judgement(judgement)
+
+    return bundle, add
+
+
+def add_thread_safe(judgements):
+    bundle = ThreadSafeBundle()
+    return bundle, bundle.add_judgement
+
+
+def main():
+    count = 20000
+    judgements = [make_judgement(index) for index in range(count)]
+
+    for threads in [1, 4, 16]:
+        for name, setup in [('lock', add_with_lock),
+                            ('thread-safe', add_thread_safe)]:
+            bundle, add = setup(judgements)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(threads) as executor:
+                chunks = [judgements[index::threads]
+                          for index in range(threads)]
+                list(executor.map(lambda chunk: list(map(add, chunk)), chunks))
+            assert len(bundle.json['judgements']) == count
+            elapsed = time.perf_counter() - start
+
+            print(f'{count} judgements: {threads:>2} threads {name:<12} '
+                  f'{count / elapsed:>10.0f} entities/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Cost of generating transient IDs with random UUIDs (the old approach) vs
+a random per-process prefix followed by a counter (the new default one).
+
+Usage: python -m benchmarks.transient_ids
+"""
+
+from bundlebuilder.session import Session
+from bundlebuilder.transient_ids import (
+    CounterTransientIdGenerator,
+    DeterministicTransientIdGenerator,
+    RandomTransientIdGenerator,
+)
+from benchmarks.utils import (
+    judgement_data,
+    make_judgement,
+    measure,
+    report,
+)
+
+
+def main():
+    for name, generator in [
+        ('random', RandomTransientIdGenerator()),
+        ('counter', CounterTransientIdGenerator()),
+        ('deterministic', DeterministicTransientIdGenerator()),
+    ]:
+        report(f'{name}: generate', measure(generator.generate, 100000))
+
+        session = Session(
+            external_id_prefix='benchmark',
+            source='Benchmark',
+            source_uri='https://example.com/benchmark',
+            transient_id_generator=generator,
+        )
+        judgement = make_judgement()
+        data = {key: judgement[key] for key in judgement_data()}
+
+        with session.set():
+            report(
+                f'{name}: build judgement (trusted)',
+                measure(lambda: judgement.from_trusted(data)),
+            )
+
+
+if __name__ == '__main__':
+    main()
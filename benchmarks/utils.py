@@ -0,0 +1,60 @@
+import timeit
+from typing import Callable
+
+from bundlebuilder.models import (
+    Judgement,
+    Observable,
+    ObservedTime,
+    Sighting,
+    ValidTime,
+)
+
+
+def judgement_data() -> dict:
+    return {
+        'confidence': 'High',
+        'disposition': 2,
+        'disposition_name': 'Malicious',
+        'observable': Observable(type='ip', value='187.75.16.75'),
+        'priority': 95,
+        'severity': 'High',
+        'valid_time': ValidTime(
+            start_time='2019-03-01T22:26:29.229Z',
+            end_time='2019-03-31T22:26:29.229Z',
+        ),
+        'timestamp': '2019-03-01T22:26:29.229Z',
+        'tlp': 'green',
+    }
+
+
+def sighting_data(observables_count: int = 1) -> dict:
+    return {
+        'confidence': 'High',
+        'count': 1,
+        'observed_time': ObservedTime(start_time='2019-03-01T22:26:29.229Z'),
+        'observables': [
+            Observable(type='ip', value=f'10.0.{index // 256}.{index % 256}')
+            for index in range(observables_count)
+        ],
+        'severity': 'High',
+        'timestamp': '2019-03-01T22:26:29.229Z',
+        'title': 'Seen on the network',
+        'tlp': 'green',
+    }
+
+
+def make_judgement() -> Judgement:
+    return Judgement(**judgement_data())
+
+
+def make_sighting() -> Sighting:
+    return Sighting(**sighting_data())
+
+
+def measure(function: Callable[[], object], number: int = 1000) -> float:
+    """Return the best average time (in seconds) per call of `function`."""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def report(name: str, seconds: float) -> None:
+    print(f'{name:<48} {seconds * 1e6:>10.2f} us')
@@ -0,0 +1,46 @@
+"""
+Per-entity build time with the marshmallow vs compiled validation engines.
+
+Usage: python -m benchmarks.validation_engines
+"""
+
+from bundlebuilder.constants import VALIDATION_ENGINE_CHOICES
+from bundlebuilder.models import (
+    Judgement,
+    Observable,
+    Sighting,
+)
+from bundlebuilder.models.entity import set_validation_engine
+from benchmarks.utils import (
+    judgement_data,
+    sighting_data,
+    measure,
+    report,
+)
+
+
+def main():
+    for cls, data in [
+        (Judgement, judgement_data()),
+        (Sighting, sighting_data()),
+        (Sighting, sighting_data(observables_count=100)),
+        (Observable, {'type': 'ip', 'value': '187.75.16.75'}),
+    ]:
+        timings = {}
+
+        for engine in VALIDATION_ENGINE_CHOICES:
+            set_validation_engine(engine)
+            # Validation only.
+            load = cls._get_load()
+            timings[engine] = measure(lambda: load(data))
+            report(f'{cls.__name__}: {engine} (validation)', timings[engine])
+            # Validation plus all the automatically generated fields.
+            report(f'{cls.__name__}: {engine} (build)',
+                   measure(lambda: cls(**data)))
+
+        print(f'{"":<48} {timings["marshmallow"] / timings["compiled"]:>10.2f}'
+              ' x')
+
+
+if __name__ == '__main__':
+    main()
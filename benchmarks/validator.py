@@ -0,0 +1,49 @@
+"""
+Throughput of validating a bundle file of sightings entity by entity with
+different numbers of worker processes.
+
+Usage: python -m benchmarks.validator
+"""
+
+import os
+import tempfile
+import time
+
+from bundlebuilder.models import (
+    Observable,
+    Sighting,
+)
+from bundlebuilder.models.entity import set_validation_engine
+from bundlebuilder.validator import BundleValidator
+from bundlebuilder.writer import BundleWriter
+from benchmarks.utils import sighting_data
+
+
+def main():
+    set_validation_engine('compiled')
+
+    count = 20000
+
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as fp:
+        with BundleWriter(fp) as writer:
+            for index in range(count):
+                writer.add_sighting(Sighting(**{
+                    **sighting_data(),
+                    'observables': [Observable(
+                        type='domain', value=f'{index}.example.com',
+                    )],
+                }))
+
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            fp.seek(0)
+            validator = BundleValidator(workers=workers)
+            start = time.perf_counter()
+            assert not list(validator.iter_errors(fp))
+            elapsed = time.perf_counter() - start
+
+            print(f'{count} sightings: {workers:>2} workers '
+                  f'{validator.count / elapsed:>10.0f} entities/s')
+
+
+if __name__ == '__main__':
+    main()
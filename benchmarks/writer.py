@@ -0,0 +1,49 @@
+"""
+Peak memory of serializing bundles with lots of sightings by building whole
+bundles and dumping their JSON (the old approach) vs streaming them with
+a writer. The sightings are built on the fly in both cases.
+
+Usage: python -m benchmarks.writer
+"""
+
+import json
+import os
+import time
+import tracemalloc
+
+from bundlebuilder.models import Bundle
+from bundlebuilder.writer import BundleWriter
+from benchmarks.utils import make_sighting
+
+
+def dump_bundle(count, fp):
+    bundle = Bundle()
+    for _ in range(count):
+        bundle.add_sighting(make_sighting())
+    fp.write(json.dumps(bundle.json))
+
+
+def stream_bundle(count, fp):
+    with BundleWriter(fp) as writer:
+        for _ in range(count):
+            writer.add_sighting(make_sighting())
+
+
+def main():
+    for count in [1000, 10000]:
+        for name, function in [('dump', dump_bundle),
+                               ('stream', stream_bundle)]:
+            with open(os.devnull, 'w') as fp:
+                tracemalloc.start()
+                start = time.perf_counter()
+                function(count, fp)
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            print(f'{count} sightings: {name:<6} '
+                  f'{peak / 2 ** 20:>10.2f} MiB peak {elapsed:>8.2f} s')
+
+
+if __name__ == '__main__':
+    main()
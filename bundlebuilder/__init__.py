@@ -1,2 +1,60 @@
 # Load the current version meta-attribute into the package.
 from .version import __version__
+
+
+def preload(freeze: bool = True) -> None:
+    """
+    Pay all the first-use costs of building bundles up front, e.g. in the
+    master process of a pre-fork server before forking any workers.
+
+    All the entity classes get imported, their schemas get compiled for each
+    validation level, and the caches of bundles and XID generators (for the
+    current session) get populated. Then (if `freeze`) all the objects
+    tracked by the garbage collector so far are moved to a permanent
+    generation (see `gc.freeze`, available since Python 3.7), so that the
+    garbage collector of forked processes never touches them, i.e. the pages
+    they are on keep being shared with the parent process copy-on-write.
+    """
+
+    import gc
+
+    # Use dynamic imports to keep importing the package itself cheap.
+    from .constants import VALIDATION_LEVEL_CHOICES
+    from .models import Bundle
+    from .models.entity import (
+        BaseEntity,
+        PrimaryEntity,
+    )
+    from .models.external_ids import get_external_id_generator
+    from .session import (
+        _validate_session,
+        get_session,
+    )
+
+    session = _validate_session(*get_session())
+
+    for cls in _iter_subclasses(BaseEntity):
+        if cls._schema is None:
+            continue
+
+        for level in VALIDATION_LEVEL_CHOICES:
+            cls._get_compiled_load(level)
+
+        if issubclass(cls, PrimaryEntity):
+            get_external_id_generator(session.external_id_prefix, cls.type)
+
+    for type_ in set(Bundle._types.values()):
+        for ref in (False, True):
+            Bundle._get_field(type_, ref)
+
+    if freeze:
+        gc.collect()
+        # Not available until Python 3.7.
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+
+def _iter_subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _iter_subclasses(subclass)
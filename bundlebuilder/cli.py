@@ -0,0 +1,339 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import (
+    List,
+    Optional,
+)
+
+from .constants import (
+    DEFAULT_SESSION_EXTERNAL_ID_PREFIX,
+    DEFAULT_SESSION_SOURCE,
+    DEFAULT_SESSION_SOURCE_URI,
+    FEED_FORMAT_CHOICES,
+    VALIDATION_ENGINE_CHOICES,
+    VALIDATION_LEVEL_CHOICES,
+)
+from .feeds import (
+    EntityMapping,
+    iter_feed_entities,
+    read_records,
+)
+from .models import Bundle
+from .models.entity import use_validation_engine
+from .parallel import DEFAULT_BATCH_SIZE
+from .session import (
+    Session,
+    get_session,
+)
+from .splitter import BundleSplitter
+from .validator import (
+    BundleValidator,
+    format_path,
+)
+
+# The minimum number of seconds between progress reports.
+PROGRESS_INTERVAL = 1.0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='bundlebuilder',
+        description='SecureX Threat Response CTIM Bundle Builder',
+    )
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    validate_parser = commands.add_parser(
+        'validate',
+        help='validate CTIM bundle files',
+        description=(
+            'Validate CTIM bundle files entity by entity (without loading '
+            'the whole files into memory) and report any errors found along '
+            'with the JSON paths to the invalid values.'
+        ),
+    )
+    validate_parser.add_argument(
+        'files', nargs='+', metavar='FILE',
+        help="a CTIM bundle file (or '-' for the standard input)",
+    )
+    add_worker_arguments(validate_parser)
+    validate_parser.add_argument(
+        '--validation-level', choices=VALIDATION_LEVEL_CHOICES,
+        default='full',
+        help='the validation level of entities (default: %(default)s)',
+    )
+    validate_parser.set_defaults(function=validate)
+
+    build_parser = commands.add_parser(
+        'build',
+        help='build CTIM bundles out of feeds of observables',
+        description=(
+            'Build CTIM bundles out of a feed of observables (a CSV file '
+            'with a header or a newline-delimited JSON file) according to a '
+            'mapping of records to CTIM entities (see '
+            '`bundlebuilder.feeds.EntityMapping` for the format).'
+        ),
+    )
+    build_parser.add_argument(
+        'input', metavar='INPUT',
+        help="a feed file (or '-' for the standard input)",
+    )
+    build_parser.add_argument(
+        '-m', '--mapping', required=True,
+        help='a JSON file with the mapping of records to CTIM entities',
+    )
+    build_parser.add_argument(
+        '-o', '--output', required=True,
+        help=(
+            "a bundle file (or '-' for the standard output, one bundle per "
+            "line), may contain '{index}' to be replaced with the index of "
+            'each bundle when splitting'
+        ),
+    )
+    build_parser.add_argument(
+        '-f', '--format', choices=FEED_FORMAT_CHOICES,
+        help='the format of the feed (default: by the file extension)',
+    )
+    build_parser.add_argument(
+        '--max-entities', type=positive_integer,
+        help='split bundles by the number of entities',
+    )
+    build_parser.add_argument(
+        '--max-bytes', type=positive_integer,
+        help='split bundles by the size of their JSON',
+    )
+    add_worker_arguments(build_parser)
+    build_parser.add_argument(
+        '--validation-level', choices=VALIDATION_LEVEL_CHOICES,
+        default='full',
+        help='the validation level of entities (default: %(default)s)',
+    )
+    build_parser.add_argument(
+        '--external-id-prefix', default=DEFAULT_SESSION_EXTERNAL_ID_PREFIX,
+        help='the prefix of XIDs (default: %(default)s)',
+    )
+    build_parser.add_argument(
+        '--source', default=DEFAULT_SESSION_SOURCE,
+        help='the source of entities (default: %(default)s)',
+    )
+    build_parser.add_argument(
+        '--source-uri', default=DEFAULT_SESSION_SOURCE_URI,
+        help='the source URI of entities (default: %(default)s)',
+    )
+    build_parser.set_defaults(function=build)
+
+    args = parser.parse_args(argv)
+
+    # Don't change the global validation engine of the caller.
+    with use_validation_engine(args.engine):
+        return args.function(args)
+
+
+def add_worker_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '-w', '--workers', type=positive_integer, default=os.cpu_count() or 1,
+        help='the number of worker processes (default: the number of CPUs)',
+    )
+    parser.add_argument(
+        '--batch-size', type=positive_integer, default=DEFAULT_BATCH_SIZE,
+        help='the number of entities per batch (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--engine', choices=VALIDATION_ENGINE_CHOICES, default='compiled',
+        help='the validation engine (default: %(default)s)',
+    )
+
+
+def positive_integer(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        raise argparse.ArgumentTypeError(
+            f'invalid positive integer value: {value!r}'
+        )
+    return number
+
+
+def validate(args: argparse.Namespace) -> int:
+    validator = BundleValidator(
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
+
+    errors_count = 0
+    start = time.perf_counter()
+
+    session = get_session()._replace(validation_level=args.validation_level)
+
+    with session.set():
+        for name in args.files:
+            try:
+                with open_file(name) as fp:
+                    for path, message in validator.iter_errors(fp):
+                        errors_count += 1
+                        print(f'{name}: {format_path(path)}: {message}')
+            except (OSError, ValueError) as error:
+                errors_count += 1
+                print(f'{name}: {error}')
+
+    elapsed = time.perf_counter() - start
+
+    print(
+        f'Validated {validator.count} entities in {elapsed:.2f} s '
+        f'({validator.count / max(elapsed, 1e-9):.0f} entities/s), '
+        f'found {errors_count} errors.',
+        file=sys.stderr,
+    )
+
+    return 1 if errors_count else 0
+
+
+def build(args: argparse.Namespace) -> int:
+    feed_format = args.format or guess_feed_format(args.input)
+    if feed_format is None:
+        print(f'{args.input}: unknown feed format, specify it with --format',
+              file=sys.stderr)
+        return 2
+
+    try:
+        with open(args.mapping) as fp:
+            mapping = EntityMapping(json.load(fp))
+        session = Session(
+            args.external_id_prefix,
+            args.source,
+            args.source_uri,
+            args.validation_level,
+        )
+        # Make sure that the session is valid before reading anything.
+        with session.set():
+            pass
+    except (OSError, ValueError) as error:
+        print(f'{args.mapping}: {error}', file=sys.stderr)
+        return 2
+
+    split = args.max_entities is not None or args.max_bytes is not None
+    output = BundleOutput(args.output, split)
+
+    progress = Progress()
+
+    with session.set():
+        splitter = BundleSplitter(
+            max_entities=args.max_entities,
+            max_bytes=args.max_bytes,
+            on_bundle=output.write,
+        )
+
+        try:
+            with open_file(args.input, 'r') as fp:
+                for index, items, error in iter_feed_entities(
+                    read_records(fp, feed_format),
+                    mapping,
+                    workers=args.workers,
+                    batch_size=args.batch_size,
+                ):
+                    if error is not None:
+                        progress.failures += 1
+                        print(f'{args.input}: record {index + 1}: {error}',
+                              file=sys.stderr)
+                    splitter.insert_items(items)
+                    progress.records += 1
+                    progress.entities += len(items)
+                    progress.report()
+
+            splitter.close()
+        except BundleOutputError as error:
+            print(f'{error.name}: {error.error}', file=sys.stderr)
+            return 2
+        except (OSError, ValueError) as error:
+            print(f'{args.input}: {error}', file=sys.stderr)
+            return 2
+
+    progress.report(final=True)
+    print(f'Wrote {output.count} bundles.', file=sys.stderr)
+
+    return 1 if progress.failures else 0
+
+
+def guess_feed_format(name: str) -> Optional[str]:
+    extension = os.path.splitext(name)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    return None
+
+
+class BundleOutputError(Exception):
+    """Error writing a bundle (reported separately from input errors)."""
+
+    def __init__(self, name: str, error: OSError):
+        super().__init__(name, error)
+        self.name = name
+        self.error = error
+
+
+class BundleOutput:
+    """Writer of bundles to either separate files or the standard output."""
+
+    def __init__(self, name: str, split: bool):
+        if split and name != '-' and '{index}' not in name:
+            root, extension = os.path.splitext(name)
+            name = f'{root}-{{index}}{extension}'
+
+        self.name = name
+        self.count = 0
+
+    def write(self, bundle: Bundle) -> None:
+        self.count += 1
+
+        name = self.name.replace('{index}', str(self.count))
+        try:
+            if name == '-':
+                sys.stdout.buffer.write(bundle.to_bytes() + b'\n')
+                sys.stdout.buffer.flush()
+                return
+
+            with open(name, 'wb') as fp:
+                fp.write(bundle.to_bytes())
+        except OSError as error:
+            raise BundleOutputError(name, error) from error
+
+
+class Progress:
+    """Reporter of the progress of building bundles to the standard error."""
+
+    def __init__(self):
+        self.records = 0
+        self.entities = 0
+        self.failures = 0
+        self.start = self.last = time.perf_counter()
+
+    def report(self, final: bool = False) -> None:
+        now = time.perf_counter()
+        if not final and now - self.last < PROGRESS_INTERVAL:
+            return
+        self.last = now
+
+        elapsed = now - self.start
+        print(
+            f'{"Built" if final else "Building"}: {self.records} records '
+            f'({self.failures} invalid), {self.entities} entities '
+            f'in {elapsed:.2f} s '
+            f'({self.records / max(elapsed, 1e-9):.0f} records/s, '
+            f'{self.entities / max(elapsed, 1e-9):.0f} entities/s)',
+            file=sys.stderr,
+        )
+
+
+def open_file(name: str, mode: str = 'rb'):
+    if name == '-':
+        # Don't close the standard input.
+        return os.fdopen(sys.stdin.fileno(), mode, closefd=False)
+    if mode == 'r':
+        return open(name, mode, encoding='utf-8', newline='')
+    return open(name, mode)
@@ -10,6 +10,50 @@ DEFAULT_SESSION_SOURCE_URI = (
     'https://github.com/CiscoSecurity/tr-05-ctim-bundle-builder'
 )
 
+DEFAULT_SESSION_VALIDATION_LEVEL = 'full'
+
+# Validation engines and levels available for loading CTIM entities.
+
+VALIDATION_ENGINE_CHOICES = (
+    'compiled',
+    'marshmallow',
+)
+
+DEFAULT_VALIDATION_ENGINE = 'marshmallow'
+
+VALIDATION_LEVEL_CHOICES = (
+    'full',
+    'off',
+    'structural',
+)
+
+# Policies available for handling duplicate entities (i.e. ones with the same
+# IDs or XIDs) added to bundles.
+
+DUPLICATE_POLICY_CHOICES = (
+    'keep_first',
+    'keep_last',
+    'merge',
+)
+
+DEFAULT_DUPLICATE_POLICY = 'keep_first'
+
+# Encoders available for encoding the JSON of CTIM entities into bytes.
+
+JSON_ENCODER_CHOICES = (
+    'json',
+    'orjson',
+)
+
+DEFAULT_JSON_ENCODER = 'json'
+
+# Formats of feeds of records available for building CTIM entities.
+
+FEED_FORMAT_CHOICES = (
+    'csv',
+    'ndjson',
+)
+
 # Restrictions on fields of CTIM entities.
 
 BOOLEAN_OPERATOR_CHOICES = (
@@ -0,0 +1,166 @@
+import codecs
+import json
+import re
+from itertools import count
+from typing import (
+    Any,
+    BinaryIO,
+    Collection,
+    Iterator,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+DEFAULT_CHUNK_SIZE = 2 ** 16
+
+
+def iter_object(
+    fp: Union[TextIO, BinaryIO],
+    expand: Collection[str] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[Tuple[Any, ...], Any]]:
+    """
+    Incrementally decode a JSON object from a text or binary (i.e. UTF-8)
+    file without reading the whole file into memory.
+
+    Yield the fields of the object as `(key,), value` pairs in the order of
+    the file, except for the lists of the fields from `expand`, which are
+    yielded element by element as `(key, index), element` pairs instead (so
+    only a single element has to be kept in memory at a time). Empty lists
+    of the fields from `expand` are yielded as is.
+
+    Raise `ValueError` on invalid JSON (possibly after yielding some fields).
+    """
+
+    if not (isinstance(chunk_size, int) and chunk_size > 0):
+        raise ValueError("'chunk_size' must be a positive integer.")
+
+    reader = _Reader(fp, chunk_size)
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.advance()
+        reader.expect_end()
+        return
+
+    while True:
+        key = reader.decode()
+        if not isinstance(key, str):
+            raise reader.error('Expecting property name')
+
+        reader.expect(':')
+
+        if key in expand and reader.peek() == '[':
+            reader.advance()
+            if reader.peek() == ']':
+                reader.advance()
+                yield (key,), []
+            else:
+                for index in count():
+                    yield (key, index), reader.decode()
+                    if reader.peek() != ',':
+                        break
+                    reader.advance()
+                reader.expect(']')
+        else:
+            yield (key,), reader.decode()
+
+        if reader.peek() != ',':
+            break
+        reader.advance()
+
+    reader.expect('}')
+    reader.expect_end()
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _Reader:
+    """Buffered reader of JSON values from a file."""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        # The number of characters already discarded from the buffer.
+        self.offset = 0
+        self.eof = False
+        self.decoder = None
+        self.json_decoder = json.JSONDecoder()
+
+    def read(self, size):
+        # Read at least `size` characters (unless the file is exhausted),
+        # dropping everything already consumed from the buffer.
+        if self.eof:
+            return False
+
+        chunk = self.fp.read(size)
+        # Only an empty read means the end of the file, since a short read
+        # ending within a multibyte character may decode to nothing.
+        if not chunk:
+            self.eof = True
+
+        if isinstance(chunk, bytes):
+            if self.decoder is None:
+                self.decoder = codecs.getincrementaldecoder('utf-8')()
+            chunk = self.decoder.decode(chunk, final=self.eof)
+
+        self.offset += self.position
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+        return not self.eof
+
+    def peek(self):
+        while True:
+            self.position = _WHITESPACE.match(
+                self.buffer, self.position,
+            ).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read(self.chunk_size):
+                return ''
+
+    def advance(self):
+        self.position += 1
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f'Expecting {char!r}')
+        self.advance()
+
+    def expect_end(self):
+        if self.peek():
+            raise self.error('Extra data')
+
+    def decode(self):
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(
+                    self.buffer, self.position,
+                )
+            except json.JSONDecodeError as error:
+                if self.eof:
+                    raise self.error(error.msg, error.pos) from None
+            else:
+                # A value ending right at the end of the buffer (e.g. a
+                # number) may actually continue in the rest of the file.
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+
+            # Read more (at least as much as already buffered, so that large
+            # values don't get decoded from scratch too many times).
+            self.read(max(self.chunk_size, len(self.buffer)))
+
+    def error(self, message, position=None):
+        if position is None:
+            position = self.position
+        return ValueError(
+            f'{message}: char {self.offset + position} of the JSON file.'
+        )
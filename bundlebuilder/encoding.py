@@ -0,0 +1,69 @@
+import json
+from typing import (
+    Any,
+    Callable,
+)
+
+from .constants import (
+    JSON_ENCODER_CHOICES,
+    DEFAULT_JSON_ENCODER,
+)
+
+
+def get_json_encoder() -> str:
+    return _JSON_ENCODER
+
+
+def set_json_encoder(encoder: str) -> None:
+    if encoder not in JSON_ENCODER_CHOICES:
+        raise ValueError(
+            f"'encoder' must be one of: "
+            f'{", ".join(map(repr, JSON_ENCODER_CHOICES))}.'
+        )
+
+    encode = _load_encode(encoder)
+
+    global _JSON_ENCODER, _ENCODE
+    _JSON_ENCODER, _ENCODE = encoder, encode
+
+
+def encode(data: Any) -> bytes:
+    """
+    Encode JSON into compact UTF-8 bytes (i.e. without any whitespace between
+    tokens and without escaping non-ASCII characters).
+
+    All the encoders produce exactly the same output for the same JSON except
+    for floats in exponent notation (e.g. orjson encodes 1e16 as `1e16`
+    rather than `1e+16` and 1e-7 as `1e-7` rather than `1e-07`), which still
+    decode to the same values.
+    """
+
+    return _ENCODE(data)
+
+
+def _load_encode(encoder: str) -> Callable[[Any], bytes]:
+    if encoder == 'orjson':
+        try:
+            import orjson
+        except ImportError:
+            raise ValueError(
+                "The 'orjson' encoder requires the orjson package, "
+                'install it with: pip install orjson'
+            ) from None
+
+        return orjson.dumps
+
+    json_encode = json.JSONEncoder(
+        ensure_ascii=False,
+        check_circular=False,
+        separators=(',', ':'),
+    ).encode
+
+    def encode(data):
+        return json_encode(data).encode('utf-8')
+
+    return encode
+
+
+_JSON_ENCODER = DEFAULT_JSON_ENCODER
+_ENCODE = _load_encode(DEFAULT_JSON_ENCODER)
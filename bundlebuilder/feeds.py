@@ -0,0 +1,265 @@
+import csv
+import json
+from functools import partial
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Type,
+)
+
+from .constants import FEED_FORMAT_CHOICES
+from .exceptions import ValidationError as BundleBuilderValidationError
+from .models import (
+    Judgement,
+    Observable,
+    Sighting,
+    Verdict,
+)
+from .models.entity import (
+    BaseEntity,
+    PrimaryEntity,
+    _iter_error_messages,
+)
+from .models.fields import (
+    EntityField,
+    ListField,
+)
+from .parallel import (
+    DEFAULT_BATCH_SIZE,
+    iter_batches,
+    map_batches,
+)
+
+
+def read_records(fp: TextIO, format: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read records from a feed file, i.e. rows of a CSV file with a header or
+    lines of a newline-delimited JSON file (one JSON object per line).
+    """
+
+    if format not in FEED_FORMAT_CHOICES:
+        raise ValueError(
+            "'format' must be one of: "
+            f'{", ".join(map(repr, FEED_FORMAT_CHOICES))}.'
+        )
+
+    if format == 'csv':
+        yield from csv.DictReader(fp)
+        return
+
+    for number, line in enumerate(fp, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            raise ValueError(f'Line {number}: {error}.') from None
+
+        if not isinstance(record, dict):
+            raise ValueError(f'Line {number}: Not a JSON object.')
+
+        yield record
+
+
+class EntityMapping:
+    """
+    Mapping of records of a feed (e.g. rows of a CSV file) to CTIM entities.
+
+    The mapping is a JSON object with the following fields:
+    - `observable` (required): the fields of an observable;
+    - `judgement` (optional): the fields of a judgement of the observable;
+    - `sighting` (optional): the fields of a sighting of the observable;
+    - `verdict` (optional): whether to add a verdict of the judgement.
+
+    Any strings starting with '$' in the fields are replaced with the values
+    of the corresponding fields of records (e.g. '$ip' is replaced with the
+    value of the 'ip' column of a CSV file), a leading '$$' stands for a
+    literal '$'. Fields missing from records (or empty) are left out. Any
+    nested entities are specified as JSON objects too, e.g.:
+
+        {
+            "observable": {"type": "ip", "value": "$ip"},
+            "judgement": {
+                "confidence": "High",
+                "disposition": 2,
+                "disposition_name": "Malicious",
+                "priority": 95,
+                "severity": "High",
+                "valid_time": {"start_time": "$timestamp"}
+            },
+            "verdict": true
+        }
+    """
+
+    def __init__(self, mapping: Dict[str, Any]):
+        if not isinstance(mapping, dict):
+            raise ValueError('The mapping must be a JSON object.')
+
+        unknown_keys = set(mapping) - {
+            'observable', 'judgement', 'sighting', 'verdict',
+        }
+        if unknown_keys:
+            raise ValueError(
+                'Unknown mapping fields: '
+                f'{", ".join(map(repr, sorted(unknown_keys)))}.'
+            )
+
+        for key in ('observable', 'judgement', 'sighting'):
+            if key in mapping and not isinstance(mapping[key], dict):
+                raise ValueError(f'{key!r} must be a JSON object.')
+
+        if 'observable' not in mapping:
+            raise ValueError("'observable' is required.")
+
+        if not isinstance(mapping.get('verdict', False), bool):
+            raise ValueError("'verdict' must be a boolean.")
+
+        if mapping.get('verdict') and 'judgement' not in mapping:
+            raise ValueError("'verdict' requires 'judgement'.")
+
+        self.mapping = mapping
+
+    def build(self, record: Dict[str, Any]) -> List[PrimaryEntity]:
+        """Build the entities of a record."""
+
+        entities = []
+
+        observable = self._build('observable', Observable, record)
+
+        if 'judgement' in self.mapping:
+            judgement = self._build(
+                'judgement', Judgement, record, observable=observable,
+            )
+            entities.append(judgement)
+
+            if self.mapping.get('verdict'):
+                entities.append(Verdict.from_judgement(judgement))
+
+        if 'sighting' in self.mapping:
+            entities.append(self._build(
+                'sighting', Sighting, record, observables=[observable],
+            ))
+
+        return entities
+
+    def _build(self, key, type_, record, **defaults):
+        try:
+            return _build(
+                type_, _substitute(self.mapping[key], record), **defaults
+            )
+        except BundleBuilderValidationError as error:
+            # Make the errors refer to the entities of the mapping.
+            raise BundleBuilderValidationError({key: error.args[0]}) from None
+
+
+_MISSING = object()
+
+
+def _substitute(template, record):
+    if isinstance(template, dict):
+        data = {}
+        for key, value in template.items():
+            value = _substitute(value, record)
+            if value is not _MISSING:
+                data[key] = value
+        return data
+
+    if isinstance(template, list):
+        return [
+            value for value in (_substitute(item, record) for item in template)
+            if value is not _MISSING
+        ]
+
+    if isinstance(template, str) and template.startswith('$'):
+        if template.startswith('$$'):
+            return template[1:]
+
+        value = record.get(template[1:])
+        return _MISSING if value is None or value == '' else value
+
+    return template
+
+
+def _build(type_: Type[BaseEntity], data: Dict[str, Any], **defaults):
+    # Build any nested entities specified as JSON objects first.
+    for field_name, field in type_._schema.declared_fields.items():
+        value = data.get(field_name)
+
+        if isinstance(field, EntityField) and isinstance(value, dict):
+            data[field_name] = _build_nested(field_name, field.type, value)
+        elif (
+            isinstance(field, ListField) and
+            isinstance(field.inner, EntityField) and
+            isinstance(value, list)
+        ):
+            data[field_name] = [
+                _build_nested(field_name, field.inner.type, item, index)
+                if isinstance(item, dict) else item
+                for index, item in enumerate(value)
+            ]
+
+    return type_(**{**defaults, **data})
+
+
+def _build_nested(field_name, type_, data, index=None):
+    try:
+        return _build(type_, data)
+    except BundleBuilderValidationError as error:
+        # Make the errors refer to the field of the parent entity.
+        messages = error.args[0]
+        if index is not None:
+            messages = {index: messages}
+        raise BundleBuilderValidationError({field_name: messages}) from None
+
+
+def iter_feed_entities(
+    records: Iterable[Dict[str, Any]],
+    mapping: EntityMapping,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[Tuple[int, List[Tuple[str, Dict[str, Any]]], Optional[str]]]:
+    """
+    Build the entities of records in parallel (see `parallel.map_batches`).
+
+    Yield the results in the order of the records as tuples of the index of
+    each record, the bundle keys and the JSON of the entities of the record,
+    and the error message (if the record is invalid).
+    """
+
+    for results in map_batches(
+        partial(_build_batch, mapping=mapping),
+        iter_batches(enumerate(records), batch_size),
+        workers,
+    ):
+        yield from results
+
+
+def _build_batch(batch, mapping):
+    results = []
+
+    for index, record in batch:
+        try:
+            entities = mapping.build(record)
+        except BundleBuilderValidationError as error:
+            message = '; '.join(
+                f'{".".join(map(str, path))}: {message}'
+                for path, message in _iter_error_messages(error.args[0])
+            )
+            results.append((index, [], message))
+        else:
+            # Send back just the JSON (including the XIDs computed right here)
+            # rather than the entities themselves.
+            results.append((
+                index,
+                [(entity.type + 's', entity.json) for entity in entities],
+                None,
+            ))
+
+    return results
@@ -1,28 +1,39 @@
-# Make the classes below importable from the `.models` sub-package directly.
-from .primary import (
-    Bundle,
-    Indicator,
-    Judgement,
-    Relationship,
-    Sighting,
-    Verdict,
-)
-from .secondary import (
-    ColumnDefinition,
-    CompositeIndicatorExpression,
-    ExternalReference,
-    IdentitySpecification,
-    JudgementSpecification,
-    KillChainPhase,
-    Observable,
-    ObservedRelation,
-    ObservedTime,
-    OpenIOCSpecification,
-    RelatedJudgement,
-    SensorCoordinates,
-    SightingDataTable,
-    SIOCSpecification,
-    SnortSpecification,
-    ThreatBrainSpecification,
-    ValidTime,
-)
+from .lazy import export_lazily
+
+# Make the classes below importable from the `.models` sub-package directly
+# (their modules are imported only on first access though).
+export_lazily(globals(), {
+    **dict.fromkeys(
+        [
+            'Bundle',
+            'Indicator',
+            'Judgement',
+            'Relationship',
+            'Sighting',
+            'Verdict',
+        ],
+        '.primary',
+    ),
+    **dict.fromkeys(
+        [
+            'ColumnDefinition',
+            'CompositeIndicatorExpression',
+            'ExternalReference',
+            'IdentitySpecification',
+            'JudgementSpecification',
+            'KillChainPhase',
+            'Observable',
+            'ObservedRelation',
+            'ObservedTime',
+            'OpenIOCSpecification',
+            'RelatedJudgement',
+            'SensorCoordinates',
+            'SightingDataTable',
+            'SIOCSpecification',
+            'SnortSpecification',
+            'ThreatBrainSpecification',
+            'ValidTime',
+        ],
+        '.secondary',
+    ),
+})
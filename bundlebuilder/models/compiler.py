@@ -0,0 +1,576 @@
+"""
+Compiled validation engine.
+
+Reads the declared fields of an entity schema once and generates a flat,
+type-specialized function validating and normalizing raw entity data. The
+common cases (strings, integers, booleans, datetimes, entities and lists of
+those along with the validators from `.validators`) are inlined, while
+everything else is delegated to the corresponding marshmallow field. Thus the
+generated function behaves exactly like `Schema.load` (same output, same
+errors), but much faster.
+
+Less strict functions can be generated for the lower validation levels:
+- structural: only the types and the structure of values are checked (i.e.
+unknown and missing fields, types of values, nested entities), while any
+validators (lengths, choices, ranges, consistency, etc.) are skipped;
+- off: nothing is checked at all, nested entities are just replaced with their
+JSON (or IDs) and datetimes are converted to strings.
+"""
+
+from functools import partial
+from itertools import count
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from marshmallow import fields as f
+from marshmallow.decorators import (
+    PRE_LOAD,
+    POST_LOAD,
+    VALIDATES,
+    VALIDATES_SCHEMA,
+)
+from marshmallow.error_store import merge_errors
+from marshmallow.exceptions import (
+    SCHEMA,
+    ValidationError,
+)
+from marshmallow.schema import Schema
+from marshmallow.utils import (
+    RAISE,
+    missing,
+)
+
+from .fields import (
+    BooleanField,
+    DateTimeField,
+    EntityField,
+    IntegerField,
+    ListField,
+    RawField,
+    StringField,
+    UnionField,
+    _normalize_datetime,
+)
+from .validators import (
+    validate_integer,
+    validate_string,
+)
+
+
+Loader = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def compile_schema(schema: Schema, level: str = 'full') -> Optional[Loader]:
+    """
+    Generate a function equivalent to `schema.load` for a single object
+    (up to the specified validation level).
+
+    Return `None` if the schema relies on any marshmallow features not
+    supported by the engine (e.g. pre-processors), so the caller can
+    fall back to `schema.load` itself.
+    """
+
+    if not _is_supported(schema):
+        return None
+
+    compiler = _SchemaCompiler(schema, level)
+
+    if level == 'off':
+        return compiler.compile_unchecked()
+
+    return compiler.compile()
+
+
+def _iter_hooks(schema: Schema) -> Iterator[Tuple[str, str, bool, dict]]:
+    # The format of hook configs differs among marshmallow versions:
+    # {(tag, many): kwargs} in older ones, {tag: [(many, kwargs)]} in newer.
+    # Iterate in the same (alphabetical) order as marshmallow itself does.
+    for attr_name in dir(type(schema)):
+        attr = getattr(type(schema), attr_name, None)
+        hook_config = getattr(attr, '__marshmallow_hook__', None)
+        if not hook_config:
+            continue
+
+        for key, config in hook_config.items():
+            if isinstance(key, tuple):
+                tag, many = key
+                yield attr_name, tag, many, config
+            else:
+                for many, kwargs in config:
+                    yield attr_name, key, many, kwargs
+
+
+def _is_supported(schema: Schema) -> bool:
+    if schema.many or schema.partial or schema.unknown != RAISE:
+        return False
+
+    if type(schema).handle_error is not Schema.handle_error:
+        return False
+
+    for _, tag, many, kwargs in _iter_hooks(schema):
+        if tag in (PRE_LOAD, VALIDATES):
+            return False
+
+        if tag == POST_LOAD and kwargs.get('pass_original'):
+            return False
+
+        if tag == VALIDATES_SCHEMA and (
+            many or
+            kwargs.get('pass_original') or
+            not kwargs.get('skip_on_field_errors', True)
+        ):
+            return False
+
+    for field in schema.load_fields.values():
+        # The `missing` attribute was renamed to `load_default` in 3.13.
+        load_default = (
+            field.load_default if hasattr(field, 'load_default') else
+            field.missing
+        )
+        if not (
+            field.data_key is None and
+            field.attribute is None and
+            load_default is missing
+        ):
+            return False
+
+    return True
+
+
+def _store_schema_error(errors: dict, error: ValidationError) -> dict:
+    # Mimic `marshmallow.error_store.ErrorStore.store_error`.
+    messages = error.messages
+    if error.field_name != SCHEMA or not isinstance(messages, dict):
+        messages = {error.field_name: messages}
+    return merge_errors(errors, messages)
+
+
+def _coerce_datetime(value: Any) -> Any:
+    # Convert any supported representation of a datetime (e.g. `datetime`
+    # objects or epoch timestamps) to a string, but keep any invalid values
+    # as is, since nothing is checked at the lowest validation level.
+    try:
+        datetime = _normalize_datetime(value)
+    except TypeError:
+        # Not hashable.
+        datetime = None
+    return value if datetime is None else datetime
+
+
+class _SchemaCompiler:
+
+    def __init__(self, schema: Schema, level: str):
+        self.schema = schema
+        self.level = level
+        self.namespace = {
+            'ValidationError': ValidationError,
+            'missing': missing,
+            'store_schema_error': _store_schema_error,
+        }
+        self.lines: List[str] = []
+        self.constants = count()
+
+    def compile(self) -> Loader:
+        schema = self.schema
+
+        self.emit(0, 'def load(data):')
+        self.emit(1, 'if data.__class__ is not dict:')
+        self.emit(2, f'return {self.constant(schema.load)}(data)')
+        self.emit(1, 'errors = {}')
+        self.emit(1, f'result = {self.constant(schema.dict_class)}()')
+        self.emit(1, 'found = 0')
+
+        for field_name, field in schema.load_fields.items():
+            name = repr(field_name)
+            self.emit(1, f'value = data.get({name}, missing)')
+            self.emit(1, 'if value is missing:')
+            if field.required:
+                message = self.constant(field.error_messages['required'])
+                self.emit(2, f'errors[{name}] = [{message}]')
+            else:
+                self.emit(2, 'pass')
+            self.emit(1, 'else:')
+            self.emit(2, 'found += 1')
+            self.emit_field(
+                field,
+                'value',
+                lambda value, name=name: f'result[{name}] = {value}',
+                lambda messages, name=name: f'errors[{name}] = {messages}',
+                level=2,
+                depth=0,
+                attr=name,
+                data='data',
+            )
+
+        field_names = self.constant(frozenset(schema.load_fields))
+        unknown = self.constant(schema.error_messages['unknown'])
+        self.emit(1, 'if found != len(data):')
+        self.emit(2, 'for key in data:')
+        self.emit(3, f'if key not in {field_names}:')
+        self.emit(4, f'errors[key] = [{unknown}]')
+
+        validators = [
+            getattr(schema, attr_name)
+            for attr_name, tag, _, _ in _iter_hooks(schema)
+            if tag == VALIDATES_SCHEMA and self.level == 'full'
+        ]
+        if validators:
+            self.emit(1, 'if not errors:')
+            for validator in validators:
+                validator = self.constant(validator)
+                partial_ = self.constant(schema.partial)
+                self.emit(2, 'try:')
+                self.emit(3, f'{validator}(result, partial={partial_}, '
+                             'many=False)')
+                self.emit(2, 'except ValidationError as error:')
+                self.emit(3, 'errors = store_schema_error(errors, error)')
+
+        # Just like marshmallow, run the pass_many processors first.
+        processors = sorted(
+            (
+                (not many, getattr(schema, attr_name))
+                for attr_name, tag, many, _ in _iter_hooks(schema)
+                if tag == POST_LOAD
+            ),
+            key=lambda processor: processor[0],
+        )
+        if processors:
+            self.emit(1, 'if not errors:')
+            self.emit(2, 'try:')
+            for _, processor in processors:
+                processor = self.constant(processor)
+                partial_ = self.constant(schema.partial)
+                self.emit(3, f'result = {processor}(result, many=False, '
+                             f'partial={partial_})')
+            self.emit(2, 'except ValidationError as error:')
+            self.emit(3, 'errors = error.normalized_messages()')
+
+        self.emit(1, 'if errors:')
+        self.emit(2, 'raise ValidationError(errors, data=data, '
+                     'valid_data=result)')
+        self.emit(1, 'return result')
+
+        return self.build()
+
+    def compile_unchecked(self) -> Loader:
+        schema = self.schema
+
+        self.emit(0, 'def load(data):')
+        self.emit(1, f'result = {self.constant(schema.dict_class)}()')
+        self.emit(1, 'found = 0')
+
+        for field_name, field in schema.load_fields.items():
+            name = repr(field_name)
+            self.emit(1, f'value = data.get({name}, missing)')
+            self.emit(1, 'if value is not missing:')
+            self.emit(2, 'found += 1')
+            self.emit(2, f'result[{name}] = {self.unwrap(field, "value")}')
+
+        field_names = self.constant(frozenset(schema.load_fields))
+        self.emit(1, 'if found != len(data):')
+        self.emit(2, 'for key, value in data.items():')
+        self.emit(3, f'if key not in {field_names}:')
+        self.emit(4, 'result[key] = value')
+        self.emit(1, 'return result')
+
+        return self.build()
+
+    def build(self) -> Loader:
+        source = '\n'.join(self.lines)
+        code = compile(
+            source,
+            f'<compiled {type(self.schema).__name__} ({self.level})>',
+            'exec',
+        )
+        exec(code, self.namespace)
+
+        load = self.namespace['load']
+        load.__source__ = source
+        return load
+
+    def emit(self, level: int, line: str) -> None:
+        self.lines.append('    ' * level + line)
+
+    def constant(self, value: Any) -> str:
+        name = f'_{next(self.constants)}'
+        self.namespace[name] = value
+        return name
+
+    def unwrap(self, field: f.Field, value: str) -> str:
+        """Make an expression converting any entities or datetimes."""
+
+        field_class = type(field)
+
+        if field_class is DateTimeField:
+            return f'{self.constant(_coerce_datetime)}({value})'
+
+        if field_class is EntityField:
+            return (
+                f'{value}.{field.attr_name} '
+                f'if isinstance({value}, {self.constant(field.type)}) '
+                f'else {value}'
+            )
+
+        if field_class is UnionField:
+            candidates = field.candidates
+            if candidates and all(
+                type(candidate) is EntityField and
+                candidate.attr_name == candidates[0].attr_name
+                for candidate in candidates
+            ):
+                types = tuple(candidate.type for candidate in candidates)
+                return (
+                    f'{value}.{candidates[0].attr_name} '
+                    f'if isinstance({value}, {self.constant(types)}) '
+                    f'else {value}'
+                )
+
+        if field_class is ListField:
+            item = f'item{value}'
+            unwrapped = self.unwrap(field.inner, item)
+            if unwrapped != item:
+                return (
+                    f'[{unwrapped} for {item} in {value}] '
+                    f'if {value}.__class__ is list '
+                    f'else {value}'
+                )
+
+        return value
+
+    def emit_field(
+        self,
+        field: f.Field,
+        value: str,
+        store: Callable[[str], str],
+        fail: Callable[[str], str],
+        *,
+        level: int,
+        depth: int,
+        attr: str = 'None',
+        data: str = 'None',
+    ) -> None:
+        """
+        Emit the code deserializing and validating `value` as `field`.
+
+        The `store` and `fail` callbacks make the lines saving a successfully
+        deserialized value or a list/dict of error messages, respectively.
+        """
+
+        field_class = type(field)
+
+        if field_class is StringField:
+            condition = f'{value}.__class__ is str'
+        elif field_class is IntegerField:
+            condition = f'{value}.__class__ is int'
+        elif field_class is BooleanField:
+            condition = f'{value} is True or {value} is False'
+        elif field_class is RawField:
+            condition = f'{value} is not None'
+        elif field_class is EntityField:
+            condition = f'isinstance({value}, {self.constant(field.type)})'
+        elif field_class is ListField:
+            condition = f'{value}.__class__ is list'
+        elif field_class is DateTimeField:
+            condition = f'{value}.__class__ is str'
+        else:
+            self.emit_slow_path(
+                field, value, store, fail,
+                level=level, depth=depth, attr=attr, data=data,
+            )
+            return
+
+        self.emit(level, f'if {condition}:')
+
+        if field_class is EntityField:
+            entity = f'entity{depth}'
+            message = self.constant(
+                field.make_error('attr', attr_name=field.attr_name).messages
+            )
+            self.emit(level + 1, f'{entity} = {value}.{field.attr_name}')
+            self.emit(level + 1, f'if {entity} is None:')
+            self.emit(level + 2, fail(f'list({message})'))
+            self.emit(level + 1, 'else:')
+            self.emit_validators(
+                field, entity, store, fail, level=level + 2,
+            )
+
+        elif field_class is DateTimeField:
+            datetime = f'datetime{depth}'
+            normalize = self.constant(_normalize_datetime)
+            self.emit(level + 1, f'{datetime} = {normalize}({value})')
+            self.emit(level + 1, f'if {datetime} is None:')
+            self.emit_slow_path(
+                field, value, store, fail,
+                level=level + 2, depth=depth, attr=attr, data=data,
+            )
+            self.emit(level + 1, 'else:')
+            self.emit_validators(
+                field, datetime, store, fail, level=level + 2,
+            )
+
+        elif field_class is ListField:
+            items, errors, index, item = (
+                f'items{depth}', f'errors{depth}',
+                f'index{depth}', f'item{depth}',
+            )
+            self.emit(level + 1, f'{items} = []')
+            self.emit(level + 1, f'{errors} = {{}}')
+            self.emit(level + 1,
+                      f'for {index}, {item} in enumerate({value}):')
+            self.emit_field(
+                field.inner,
+                item,
+                lambda value: f'{items}.append({value})',
+                lambda messages: f'{errors}[{index}] = {messages}',
+                level=level + 2,
+                depth=depth + 1,
+            )
+            self.emit(level + 1, f'if {errors}:')
+            self.emit(level + 2, fail(errors))
+            self.emit(level + 1, 'else:')
+            self.emit_validators(
+                field, items, store, fail, level=level + 2,
+            )
+
+        else:
+            self.emit_validators(
+                field, value, store, fail, level=level + 1,
+            )
+
+        self.emit(level, 'else:')
+        self.emit_slow_path(
+            field, value, store, fail,
+            level=level + 1, depth=depth, attr=attr, data=data,
+        )
+
+    def emit_slow_path(
+        self,
+        field: f.Field,
+        value: str,
+        store: Callable[[str], str],
+        fail: Callable[[str], str],
+        *,
+        level: int,
+        depth: int,
+        attr: str,
+        data: str,
+    ) -> None:
+        field = self.constant(field)
+        output = f'output{depth}'
+        self.emit(level, 'try:')
+        self.emit(level + 1,
+                  f'{output} = {field}.deserialize({value}, {attr}, {data})')
+        self.emit(level, 'except ValidationError as error:')
+        self.emit(level + 1, fail('error.messages'))
+        self.emit(level, 'else:')
+        self.emit(level + 1, store(output))
+
+    def emit_validators(
+        self,
+        field: f.Field,
+        value: str,
+        store: Callable[[str], str],
+        fail: Callable[[str], str],
+        *,
+        level: int,
+    ) -> None:
+        validators = field.validators
+
+        if not validators or self.level == 'structural':
+            self.emit(level, store(value))
+            return
+
+        checks = None
+        if len(validators) == 1:
+            checks = self.inline_checks(type(field), validators[0], value)
+
+        if checks is None:
+            self.emit(level, 'try:')
+            self.emit(level + 1, f'{self.constant(field)}._validate({value})')
+            self.emit(level, 'except ValidationError as error:')
+            self.emit(level + 1, fail('error.messages'))
+            self.emit(level, 'else:')
+            self.emit(level + 1, store(value))
+            return
+
+        keyword = 'if'
+        for condition, message in checks:
+            self.emit(level, f'{keyword} {condition}:')
+            self.emit(level + 1, fail(f'[{self.constant(message)}]'))
+            keyword = 'elif'
+        self.emit(level, 'else:')
+        self.emit(level + 1, store(value))
+
+    def inline_checks(
+        self,
+        field_class: type,
+        validator: Callable,
+        value: str,
+    ) -> Optional[List[Tuple[str, str]]]:
+        """
+        Translate a validator into a list of (failure condition, message)
+        pairs to be checked in order, or return `None` if not possible.
+        """
+
+        if isinstance(validator, partial):
+            if validator.args:
+                return None
+            function, kwargs = validator.func, dict(validator.keywords)
+        else:
+            function, kwargs = validator, {}
+
+        # Only values of the exact types are passed here by the fast paths,
+        # so it's safe to look the choices up in a set.
+
+        if function is validate_string and field_class is StringField:
+            checks = [(f"{value} == ''", 'Field may not be blank.')]
+
+            max_length = kwargs.pop('max_length', None)
+            if max_length is not None:
+                checks.append((
+                    f'len({value}) > {max_length!r}',
+                    f'Must be at most {max_length} characters long.',
+                ))
+
+        elif function is validate_integer and field_class is IntegerField:
+            checks = []
+
+            min_value = kwargs.pop('min_value', None)
+            if min_value is not None:
+                checks.append((
+                    f'{value} < {self.constant(min_value)}',
+                    f'Must be greater than or equal to {min_value}.',
+                ))
+
+            max_value = kwargs.pop('max_value', None)
+            if max_value is not None:
+                checks.append((
+                    f'{value} > {self.constant(max_value)}',
+                    f'Must be less than or equal to {max_value}.',
+                ))
+
+        else:
+            return None
+
+        choices = kwargs.pop('choices', None)
+        if choices is not None:
+            try:
+                lookup = frozenset(choices)
+            except TypeError:
+                return None
+            checks.append((
+                f'{value} not in {self.constant(lookup)}',
+                f'Must be one of: {", ".join(map(repr, choices))}.',
+            ))
+
+        if kwargs:
+            return None
+
+        return checks
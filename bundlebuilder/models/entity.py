@@ -2,32 +2,127 @@ from abc import (
     ABCMeta,
     abstractmethod,
 )
-from hashlib import sha256
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+from functools import partial
 from inspect import (
     Signature,
     Parameter,
 )
-from itertools import chain
 from typing import (
     Optional,
     Any,
+    Callable,
+    Dict,
+    Iterable,
     List,
     Iterator,
     Tuple,
 )
-from uuid import uuid4
 
 from inflection import underscore
 from marshmallow.exceptions import (
+    SCHEMA,
     ValidationError as MarshmallowValidationError
 )
 from marshmallow.schema import Schema
 
-from ..constants import SCHEMA_VERSION
+from ..constants import (
+    SCHEMA_VERSION,
+    VALIDATION_ENGINE_CHOICES,
+    DEFAULT_VALIDATION_ENGINE,
+)
 from ..exceptions import (
     SchemaError,
     ValidationError as BundleBuilderValidationError,
 )
+from ..encoding import (
+    encode,
+    get_json_encoder,
+)
+from .external_ids import get_external_id_generator
+from ..session import (
+    Session,
+    get_session,
+)
+from ..transient_ids import (
+    TransientIdGenerator,
+    get_default_transient_id_generator,
+)
+
+
+def get_validation_engine() -> str:
+    return _LOCAL_VALIDATION_ENGINE.get() or _VALIDATION_ENGINE
+
+
+def set_validation_engine(engine: str) -> None:
+    _validate_engine(engine)
+
+    global _VALIDATION_ENGINE
+    _VALIDATION_ENGINE = engine
+
+
+@contextmanager
+def use_validation_engine(engine: str):
+    """
+    Use the validation engine only within the current context (e.g. only by
+    the current thread or asyncio task) instead of the global one.
+    """
+
+    _validate_engine(engine)
+
+    token = _LOCAL_VALIDATION_ENGINE.set(engine)
+    try:
+        yield
+    finally:
+        _LOCAL_VALIDATION_ENGINE.reset(token)
+
+
+def _validate_engine(engine: str) -> None:
+    if engine not in VALIDATION_ENGINE_CHOICES:
+        raise ValueError(
+            f"'engine' must be one of: "
+            f'{", ".join(map(repr, VALIDATION_ENGINE_CHOICES))}.'
+        )
+
+
+_VALIDATION_ENGINE = DEFAULT_VALIDATION_ENGINE
+
+_LOCAL_VALIDATION_ENGINE = ContextVar('validation_engine', default=None)
+
+
+# A single validation error of a row (i.e. one of `.build_many` failures).
+BuildFailure = namedtuple('BuildFailure', ('index', 'path', 'message'))
+
+
+def _iter_error_messages(messages, path=()):
+    # Flatten nested marshmallow error messages into (path, message) pairs.
+    if isinstance(messages, dict):
+        for key, value in messages.items():
+            yield from _iter_error_messages(
+                value,
+                path if key == SCHEMA else path + (key,),
+            )
+    elif isinstance(messages, list):
+        for message in messages:
+            yield from _iter_error_messages(message, path)
+    else:
+        yield path, messages
+
+
+def _rebuild(
+    cls: type,
+    json: Dict[str, Any],
+    state: Optional[Dict[str, Any]] = None,
+) -> 'BaseEntity':
+    # Unpickle or copy an entity.
+    entity = cls._from_json(json)
+    if state:
+        for name, value in state.items():
+            setattr(entity, name, value)
+    return entity
 
 
 class EntitySchema(Schema):
@@ -62,6 +157,8 @@ class EntityMeta(ABCMeta):
                     '__module__': cls.__module__,
                 },
             )
+            cls._schema = None
+            cls._compiled_loads = {}
 
             super().__init__(cls_name, cls_bases, cls_dict)
             return
@@ -74,36 +171,239 @@ class EntityMeta(ABCMeta):
                 f'{cls}.schema must be a subclass of {EntitySchema}.'
             )
 
-        cls.__signature__ = Signature([
-            Parameter(field_name, Parameter.KEYWORD_ONLY, annotation=field)
-            for field_name, field in cls_schema().declared_fields.items()
-        ])
+        # Instantiating a schema is expensive (all the declared fields get
+        # deep-copied and bound to the new instance), so do it only once per
+        # class and only on demand (i.e. not just on importing the class).
+        # Loading data doesn't mutate the schema, i.e. all the per-call state
+        # lives in local variables, hence the instance can be safely shared
+        # among all the entities of the class (even across threads).
+        cls._schema = _CachedClassAttribute('_schema', cls_schema)
+
+        # Compile the schema only on demand (see `BaseEntity._get_load`).
+        cls._compiled_loads = {}
+
+        cls.__signature__ = _CachedClassAttribute(
+            '__signature__', partial(_get_signature, cls),
+        )
 
         super().__init__(cls_name, cls_bases, cls_dict)
 
 
+class _CachedClassAttribute:
+    """
+    Attribute of a class computed on first access and then stored in the
+    class itself (instead of the attribute), i.e. with no overhead later on.
+    """
+
+    def __init__(self, name: str, compute: Callable[[], Any]):
+        self.name = name
+        self.compute = compute
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        # Computing the value is idempotent, so there is no need to guard it
+        # with a lock, the worst case is just computing it more than once.
+        value = self.compute()
+        setattr(owner, self.name, value)
+        return value
+
+
+def _get_signature(cls: EntityMeta) -> Signature:
+    return Signature([
+        Parameter(field_name, Parameter.KEYWORD_ONLY, annotation=field)
+        for field_name, field in cls._schema.declared_fields.items()
+    ])
+
+
 class BaseEntity(metaclass=EntityMeta):
     """Abstract base class for arbitrary CTIM entities."""
 
+    # The JSON of the entity and the encoded JSON along with the encoder and
+    # the JSON used (unset until the entity is encoded for the first time).
+    __slots__ = ('json', '_bytes')
+
     def __init__(self, **data):
         try:
-            self.json = self.schema().load(data)
+            self.json = self._get_load()(data)
         except MarshmallowValidationError as error:
             raise BundleBuilderValidationError(*error.args) from error
 
         self._initialize_missing_fields()
 
     def __getattr__(self, field: str) -> Optional[Any]:
-        return self.json.get(field)
+        if field.startswith('_') or field == 'json':
+            # Never look up any private or special attributes (e.g. the ones
+            # looked up by `pickle` or `copy` before the JSON is even set) in
+            # the JSON, otherwise looking up the JSON itself would recurse.
+            raise AttributeError(
+                f'{self.__class__.__name__!r} object has no attribute '
+                f'{field!r}'
+            )
+        return self._get_json(field).get(field)
 
     def __getitem__(self, field: str) -> Any:
-        return self.json[field]
+        return self._get_json(field)[field]
 
     def __str__(self):
         return self.__class__.__name__
 
+    # Entities are pickled and copied along with their JSON only, i.e. they
+    # are neither validated nor initialized again when unpickled or copied.
+
+    def __reduce__(self):
+        return _rebuild, (self.__class__, self.json, self._get_state())
+
+    def __copy__(self) -> 'BaseEntity':
+        return _rebuild(self.__class__, dict(self.json), self._get_state())
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'BaseEntity':
+        return _rebuild(
+            self.__class__,
+            deepcopy(self.json, memo),
+            deepcopy(self._get_state(), memo),
+        )
+
     def get(self, field: str, default: Any = None) -> Any:
-        return self.json.get(field, default)
+        return self._get_json(field).get(field, default)
+
+    def to_bytes(self) -> bytes:
+        """
+        Encode the JSON of the entity with the current JSON encoder.
+
+        The result is cached until either the encoder or the JSON of the
+        entity is replaced. Notice that changes made to the JSON in place
+        can't be detected, so reassign `json` after making any.
+        """
+
+        json = self.json
+        encoder = get_json_encoder()
+
+        try:
+            cache = self._bytes
+        except AttributeError:
+            pass
+        else:
+            if cache[0] == encoder and cache[1] is json:
+                return cache[2]
+
+        data = encode(json)
+        self._bytes = (encoder, json, data)
+        return data
+
+    @classmethod
+    def from_trusted(cls, json: Dict[str, Any]) -> 'BaseEntity':
+        """
+        Build an entity out of CTIM JSON which is known to be valid, i.e. skip
+        any validation but still populate all the missing fields.
+        """
+
+        if cls._schema is None:
+            # Let the dummy schema of an abstract class raise a proper error.
+            cls.schema()
+
+        entity = cls.__new__(cls)
+        entity.json = dict(json)
+        entity._initialize_missing_fields()
+        return entity
+
+    def _get_json(self, field: str) -> Dict[str, Any]:
+        return self.json
+
+    def _get_state(self) -> Optional[Dict[str, Any]]:
+        # Any attributes (besides the JSON) to keep when pickling or copying.
+        return None
+
+    @classmethod
+    def _from_json(cls, json: Dict[str, Any]) -> 'BaseEntity':
+        # Wrap CTIM JSON into an entity as is, i.e. without validating it or
+        # populating any missing fields (e.g. when loading existing bundles).
+        entity = cls.__new__(cls)
+        entity.json = json
+        return entity
+
+    @classmethod
+    def build_many(
+        cls,
+        rows: Iterable[Dict[str, Any]],
+    ) -> Tuple[List['BaseEntity'], List[BuildFailure]]:
+        """
+        Build entities out of rows of data in one batch.
+
+        Instead of raising on the very first invalid row, return all the valid
+        entities along with all the failures of the invalid rows.
+        """
+
+        return cls._build_many(rows)
+
+    @classmethod
+    def _build_many(cls, rows, **kwargs):
+        entities = []
+        failures = []
+
+        if cls.__init__ is not BaseEntity.__init__:
+            # There is some custom initialization going on, so don't bypass it.
+            for index, row in enumerate(rows):
+                try:
+                    entities.append(cls(**row))
+                except BundleBuilderValidationError as error:
+                    messages = error.args[0]
+                    failures.extend(
+                        BuildFailure(index, path, message)
+                        for path, message in _iter_error_messages(messages)
+                    )
+            return entities, failures
+
+        # Resolve the validation function only once for the whole batch.
+        load = cls._get_load()
+
+        for index, row in enumerate(rows):
+            try:
+                json = load(row)
+            except MarshmallowValidationError as error:
+                failures.extend(
+                    BuildFailure(index, path, message)
+                    for path, message in _iter_error_messages(error.messages)
+                )
+                continue
+
+            entity = cls.__new__(cls)
+            entity.json = json
+            entity._initialize_missing_fields(**kwargs)
+            entities.append(entity)
+
+        return entities, failures
+
+    @classmethod
+    def _get_load(cls) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        schema = cls._schema
+        if schema is None:
+            # Let the dummy schema of an abstract class raise a proper error.
+            schema = cls.schema()
+
+        level = get_session().validation_level
+
+        if level == 'full' and get_validation_engine() == 'marshmallow':
+            return schema.load
+
+        # The lower validation levels are supported by the compiled engine.
+        return cls._get_compiled_load(level)
+
+    @classmethod
+    def _get_compiled_load(
+        cls,
+        level: str,
+    ) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        load = cls._compiled_loads.get(level)
+        if load is None:
+            # Use a dynamic import to break the circular dependency.
+            from .compiler import compile_schema
+
+            # Compilation is idempotent, so there is no need to guard it with
+            # a lock, the worst case is just compiling more than once.
+            # Fall back to marshmallow if the schema can't be compiled.
+            load = cls._compiled_loads[level] = (
+                compile_schema(cls._schema, level) or cls._schema.load
+            )
+        return load
 
     @abstractmethod
     def _initialize_missing_fields(self) -> None:
@@ -113,15 +413,53 @@ class BaseEntity(metaclass=EntityMeta):
 class PrimaryEntity(BaseEntity):
     """Abstract base class for top-level CTIM entities."""
 
-    def _initialize_missing_fields(self) -> None:
+    # Computing XIDs is relatively expensive (especially for entities with lots
+    # of seeds like sightings with lots of observables), so it is deferred
+    # until the XIDs are actually needed, i.e. until `json` or `external_ids`
+    # is accessed for the first time. Other fields are available right away.
+    __slots__ = ('_pending_external_ids',)
+
+    # The raw JSON (i.e. possibly without the XIDs yet) is stored in the slot
+    # of `BaseEntity.json` (which is overridden by the property below).
+    _json = BaseEntity.json
+
+    @property
+    def json(self) -> Dict[str, Any]:
+        # Read the pending XIDs only once, since another thread may resolve
+        # (and reset) them at any moment.
+        pending = self._pending_external_ids
+        if pending is not None:
+            self._resolve_external_ids(pending)
+        return self._json
+
+    @json.setter
+    def json(self, json: Dict[str, Any]) -> None:
+        self._json = json
+        self._pending_external_ids = None
+
+    def _get_json(self, field: str) -> Dict[str, Any]:
+        return self.json if field == 'external_ids' else self._json
+
+    @classmethod
+    def build_many(
+        cls,
+        rows: Iterable[Dict[str, Any]],
+    ) -> Tuple[List['PrimaryEntity'], List[BuildFailure]]:
+        # Resolve the current session only once for the whole batch.
+        return cls._build_many(rows, session=get_session())
+
+    build_many.__doc__ = BaseEntity.build_many.__doc__
+
+    def _initialize_missing_fields(
+        self,
+        session: Optional[Session] = None,
+    ) -> None:
         self.json['type'] = self.type
 
         self.json['schema_version'] = SCHEMA_VERSION
 
-        # Use a dynamic import to break the circular dependency.
-        from ..session import get_session
-
-        session = get_session()
+        if session is None:
+            session = get_session()
 
         external_id_prefix = session.external_id_prefix
 
@@ -135,13 +473,18 @@ class PrimaryEntity(BaseEntity):
 
         # Generate and set a transient ID and a list of XIDs only after all the
         # other attributes are already set properly.
-        self.json['id'] = self._generate_transient_id(external_id_prefix)
-        self.json['external_ids'] = (
-            self._generate_external_ids(
-                external_id_prefix,
-                external_id_salt_values,
-            ) + self.json.get('external_ids', [])
+        self.json['id'] = self._generate_transient_id(
+            external_id_prefix,
+            session.transient_id_generator,
         )
+        # Collect the seed values right away though, since the attributes may
+        # change later on, but the XIDs must still reflect the initial state.
+        external_id_seed_values_list = list(
+            self._generate_external_id_seed_values()
+        )
+        # Keep any XIDs specified by the user for now, the generated ones will
+        # be prepended on demand.
+        self.json.setdefault('external_ids', [])
 
         # Make the automatically populated fields be listed before the ones
         # manually specified by the user.
@@ -155,61 +498,74 @@ class PrimaryEntity(BaseEntity):
             **self.json
         }
 
-    def _generate_transient_id(self, external_id_prefix: str) -> str:
-        return 'transient:{prefix}-{type}-{uuid}'.format(
-            prefix=external_id_prefix,
-            type=self.type,
-            uuid=uuid4().hex,
+        self._pending_external_ids = (
+            external_id_prefix,
+            external_id_seed_values_list,
+            external_id_salt_values,
         )
 
-    def _generate_external_ids(
+    def _resolve_external_ids(
         self,
-        external_id_prefix: str,
-        external_id_salt_values: List[str],
-    ) -> List[str]:
-        return [
-            '{prefix}-{type}-{sha256}'.format(
-                prefix=external_id_prefix,
-                type=self.type,
-                sha256=sha256(
-                    bytes(external_id_deterministic_value, 'utf-8')
-                ).hexdigest(),
-            )
-            for external_id_deterministic_value
-            in self._generate_external_id_deterministic_values(
-                external_id_prefix,
-                external_id_salt_values,
-            )
-        ]
+        pending: Optional[Tuple[str, List[Tuple[str, ...]], List[str]]],
+    ) -> None:
+        if pending is None:
+            return
+
+        (
+            external_id_prefix,
+            external_id_seed_values_list,
+            external_id_salt_values,
+        ) = pending
 
-    def _generate_external_id_deterministic_values(
+        generator = get_external_id_generator(external_id_prefix, self.type)
+        external_ids = generator.generate(
+            external_id_seed_values_list,
+            external_id_salt_values,
+        )
+        # Skip the XIDs already generated before and prepended to the list
+        # (e.g. when building an entity from its own JSON), but keep the XIDs
+        # specified by the user as is.
+        existing = self._json['external_ids']
+        generated = set(external_ids)
+        start = 0
+        while start < len(existing) and existing[start] in generated:
+            start += 1
+        external_ids.extend(existing[start:])
+        self._json['external_ids'] = external_ids
+
+        # Resolve the XIDs only once, although resolving them concurrently
+        # (e.g. from several threads) is safe, since the result is the same.
+        self._pending_external_ids = None
+
+    def _generate_transient_id(
         self,
         external_id_prefix: str,
-        external_id_salt_values: List[str],
-    ) -> Iterator[str]:
-        for external_id_seed_values in (
-            self._generate_external_id_seed_values()
-        ):
-            # Chain together all the values available.
-            # Filter out any empty values.
-            # Join up all the values left.
-            yield '|'.join(
-                filter(
-                    bool,
-                    chain(
-                        (external_id_prefix,) + external_id_seed_values,
-                        external_id_salt_values,
-                    )
-                )
-            )
+        transient_id_generator: Optional[TransientIdGenerator] = None,
+    ) -> str:
+        if transient_id_generator is None:
+            transient_id_generator = get_default_transient_id_generator()
+
+        return 'transient:{prefix}-{type}-{id}'.format(
+            prefix=external_id_prefix,
+            type=self.type,
+            id=transient_id_generator.generate(),
+        )
 
     @abstractmethod
     def _generate_external_id_seed_values(self) -> Iterator[Tuple[str]]:
         pass
 
 
+def _json_field(field: str) -> property:
+    # Fast accessor of a field of a primary entity (bypassing `__getattr__`),
+    # e.g. for the fields read while generating the XID seed values.
+    return property(lambda self: self._json.get(field))
+
+
 class SecondaryEntity(BaseEntity):
     """Abstract base class for in-line CTIM entities."""
 
+    __slots__ = ()
+
     def _initialize_missing_fields(self) -> None:
         pass
@@ -0,0 +1,75 @@
+from functools import lru_cache
+from hashlib import sha256
+from typing import (
+    Iterable,
+    List,
+    Tuple,
+)
+
+
+# Each XID is made up of an XID prefix, an entity type and a SHA-256 digest of
+# the XID prefix, the seed values and the salt values of an entity joined up
+# with '|' (any empty values are skipped), e.g. 'ctim-judgement-5f3e...'.
+
+# The number of the most recently used generators (i.e. pairs of XID prefixes
+# and entity types) to keep.
+_GENERATOR_CACHE_SIZE = 256
+
+# The number of the most recently generated XIDs to keep per each generator.
+_EXTERNAL_ID_CACHE_SIZE = 4096
+
+
+class ExternalIdGenerator:
+    """Generator of XIDs for a particular XID prefix and entity type."""
+
+    def __init__(self, external_id_prefix: str, type: str):
+        self.external_id_prefix = external_id_prefix
+        self.type = type
+
+        # Everything related to the XID prefix and the entity type is computed
+        # only once, i.e. only the seed and salt values are hashed per XID.
+        self._head = f'{external_id_prefix}-{type}-'
+        self._hash = sha256(bytes(external_id_prefix, 'utf-8'))
+        self._separator = '|' if external_id_prefix else ''
+
+        self._generate_cached = lru_cache(maxsize=_EXTERNAL_ID_CACHE_SIZE)(
+            self._generate_uncached
+        )
+
+    def generate(
+        self,
+        external_id_seed_values_list: Iterable[Tuple[str, ...]],
+        external_id_salt_values: Iterable[str],
+    ) -> List[str]:
+        external_id_salt_values = tuple(external_id_salt_values)
+        generate_one = self.generate_one
+        return [
+            generate_one(external_id_seed_values + external_id_salt_values)
+            for external_id_seed_values in external_id_seed_values_list
+        ]
+
+    def generate_one(self, values: Tuple[str, ...]) -> str:
+        try:
+            return self._generate_cached(values)
+        except TypeError:
+            # Some of the values are unhashable, so they can't be cached.
+            return self._generate_uncached(values)
+
+    def _generate_uncached(self, values: Tuple[str, ...]) -> str:
+        hash = self._hash.copy()
+
+        # Filter out any empty values.
+        # Join up all the values left.
+        tail = '|'.join(filter(bool, values))
+        if tail:
+            hash.update(bytes(self._separator + tail, 'utf-8'))
+
+        return self._head + hash.hexdigest()
+
+
+@lru_cache(maxsize=_GENERATOR_CACHE_SIZE)
+def get_external_id_generator(
+    external_id_prefix: str,
+    type: str,
+) -> ExternalIdGenerator:
+    return ExternalIdGenerator(external_id_prefix, type)
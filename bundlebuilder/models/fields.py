@@ -1,5 +1,7 @@
 import datetime as dt
+import re
 import typing as t
+from functools import lru_cache
 
 from marshmallow import fields as f
 from marshmallow.exceptions import ValidationError
@@ -91,8 +93,77 @@ class EntityField(f.Field):
         return entity
 
 
+# The most common shape of timestamps, e.g. '2019-03-01T22:26:29.229Z'.
+_ISO8601_UTC_DATETIME_RE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?Z'
+)
+
+# Epoch timestamps greater than this (in absolute value) are considered to be
+# in milliseconds rather than in seconds (otherwise they would be from later
+# than the year 5000).
+_EPOCH_MILLISECONDS_THRESHOLD = 10 ** 11
+
+_EPOCH = dt.datetime(1970, 1, 1)
+
+_DATETIME_CACHE_SIZE = 4096
+
+
+def _format_datetime(datetime: dt.datetime) -> str:
+    if datetime.utcoffset() is not None:
+        datetime = datetime.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return datetime.isoformat(timespec='milliseconds') + 'Z'
+
+
+@lru_cache(maxsize=_DATETIME_CACHE_SIZE)
+def _normalize_datetime(value: t.Any) -> t.Optional[str]:
+    # Return `None` for any values which can't be normalized.
+    # Only hashable values can be passed here.
+
+    if isinstance(value, str):
+        match = _ISO8601_UTC_DATETIME_RE.fullmatch(value)
+        if match is not None:
+            *parts, fraction = match.groups()
+            try:
+                datetime = dt.datetime(
+                    *map(int, parts),
+                    int(fraction.ljust(6, '0')) if fraction else 0,
+                )
+            except ValueError:
+                return None
+            return _format_datetime(datetime)
+
+        # Let marshmallow parse any other (less common) ISO 8601 shapes.
+        try:
+            datetime = _ISO8601_PARSER.deserialize(value)
+        except ValidationError:
+            return None
+        return _format_datetime(datetime)
+
+    if isinstance(value, dt.datetime):
+        return _format_datetime(value)
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = (
+            value / 1000
+            if abs(value) > _EPOCH_MILLISECONDS_THRESHOLD else
+            value
+        )
+        try:
+            datetime = _EPOCH + dt.timedelta(seconds=seconds)
+        except (OverflowError, ValueError):
+            return None
+        return _format_datetime(datetime)
+
+    return None
+
+
 class DateTimeField(f.NaiveDateTime):
-    """A UTC datetime string with the Z suffix."""
+    """
+    A UTC datetime string with the Z suffix.
+
+    Also accepts `datetime` objects (either naive in UTC or aware) and epoch
+    timestamps (either in seconds or milliseconds).
+    """
 
     def __init__(self, **kwargs):
         kwargs['format'] = 'iso8601'
@@ -109,20 +180,43 @@ class DateTimeField(f.NaiveDateTime):
         data: t.Optional[t.Mapping[str, t.Any]],
         **kwargs
     ):
-        if isinstance(value, dt.datetime):
-            value = value.isoformat()
+        # Validate as a proper ISO-formatted string (or any other supported
+        # representation of a datetime), but don't convert to a DateTime
+        # object. Most of the values tend to repeat, so cache the results.
+        try:
+            datetime = _normalize_datetime(value)
+        except TypeError:
+            # Not hashable.
+            datetime = None
+
+        if datetime is None:
+            raise self.make_error(
+                'invalid', input=value, obj_type=self.OBJ_TYPE,
+            )
 
-        # Validate as a proper ISO-formatted string,
-        # but don't convert to a DateTime object.
-        datetime = super()._deserialize(value, attr, data, **kwargs)
+        return datetime
 
-        return datetime.isoformat(timespec='milliseconds') + 'Z'
+
+# Parse ISO-formatted strings exactly the same way as before.
+_ISO8601_PARSER = f.NaiveDateTime(format='iso8601', timezone=dt.timezone.utc)
 
 
 class UnionField(f.Field):
 
     def __init__(self, candidates: t.List[f.Field], **kwargs):
         self.candidates = candidates
+
+        # If all the candidates are entities, then a value can be matched
+        # against the right candidate just by the class of the value instead
+        # of trying each candidate in turn. The candidate for each class is
+        # resolved only once and then cached.
+        self.dispatch: t.Optional[t.Dict[type, t.Optional[EntityField]]] = (
+            {}
+            if all(isinstance(candidate, EntityField)
+                   for candidate in candidates) else
+            None
+        )
+
         super().__init__(**kwargs)
 
     def __repr__(self):
@@ -135,6 +229,29 @@ class UnionField(f.Field):
         data: t.Optional[t.Mapping[str, t.Any]],
         **kwargs
     ):
+        if self.dispatch is not None:
+            cls = type(value)
+
+            try:
+                candidate = self.dispatch[cls]
+            except KeyError:
+                # Pick the very first candidate accepting values of the class
+                # (i.e. exactly the one which would match when trying each).
+                candidate = self.dispatch[cls] = next(
+                    (
+                        candidate for candidate in self.candidates
+                        if issubclass(cls, candidate.type)
+                    ),
+                    None,
+                )
+
+            if candidate is not None:
+                try:
+                    return candidate.deserialize(value, attr, data, **kwargs)
+                except ValidationError:
+                    # Let the fallback below collect all the error messages.
+                    pass
+
         messages = []
 
         for candidate in self.candidates:
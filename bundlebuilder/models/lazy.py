@@ -0,0 +1,40 @@
+import sys
+from importlib import import_module
+
+# Don't import `typing` here (for the sake of annotations only), since it's
+# relatively expensive to import.
+
+
+def export_lazily(namespace: dict, exports: dict) -> None:
+    """
+    Make the attributes from `exports` (mapped to the relative names of their
+    modules) importable from a package (given its `globals()`) directly, but
+    import the modules only on first access of the attributes (PEP 562), so
+    that importing the package itself stays cheap.
+    """
+
+    package = namespace['__name__']
+
+    def __getattr__(name: str) -> object:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(
+                f'module {package!r} has no attribute {name!r}'
+            )
+
+        value = getattr(import_module(module, package), name)
+        # Bypass `__getattr__` from now on.
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(exports))
+
+    namespace['__all__'] = list(exports)
+    namespace['__getattr__'] = __getattr__
+    namespace['__dir__'] = __dir__
+
+    if sys.version_info < (3, 7):
+        # Module-level `__getattr__` isn't supported until Python 3.7.
+        for name in exports:
+            __getattr__(name)
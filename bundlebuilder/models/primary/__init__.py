@@ -1,7 +1,12 @@
-# Make the classes below importable from the `.primary` sub-package directly.
-from .bundle import Bundle
-from .indicator import Indicator
-from .judgement import Judgement
-from .relationship import Relationship
-from .sighting import Sighting
-from .verdict import Verdict
+from ..lazy import export_lazily
+
+# Make the classes below importable from the `.primary` sub-package directly
+# (their modules are imported only on first access though).
+export_lazily(globals(), {
+    'Bundle': '.bundle',
+    'Indicator': '.indicator',
+    'Judgement': '.judgement',
+    'Relationship': '.relationship',
+    'Sighting': '.sighting',
+    'Verdict': '.verdict',
+})
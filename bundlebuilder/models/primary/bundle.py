@@ -1,13 +1,31 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
 from functools import partial
+from itertools import count
 from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
     Iterator,
+    Optional,
+    TextIO,
     Tuple,
+    Type,
+    Union,
 )
 
 from marshmallow.exceptions import (
     ValidationError as MarshmallowValidationError
 )
 
+from ...decoding import iter_object
+from ...encoding import (
+    encode,
+    get_json_encoder,
+)
 from ..entity import (
     EntitySchema,
     PrimaryEntity,
@@ -31,6 +49,8 @@ from ..validators import (
     validate_integer,
 )
 from ...constants import (
+    DEFAULT_DUPLICATE_POLICY,
+    DUPLICATE_POLICY_CHOICES,
     SOURCE_MAX_LENGTH,
     DESCRIPTION_MAX_LENGTH,
     LANGUAGE_MAX_LENGTH,
@@ -120,8 +140,12 @@ class BundleSchema(EntitySchema):
     )
 
 
-class Bundle(PrimaryEntity):
-    schema = BundleSchema
+class AddEntitiesMixin(ABC):
+    """
+    Methods for adding primary CTIM entities shared by bundles and any other
+    bundle builders. Subclasses must implement `_add` and `_add_many`, which
+    get `None` as `type_` for entities of any types supported by bundles.
+    """
 
     def add_indicator(self, indicator: Indicator, ref: bool = False) -> None:
         self._add(indicator, Indicator, ref)
@@ -138,17 +162,575 @@ class Bundle(PrimaryEntity):
     def add_verdict(self, verdict: Verdict, ref: bool = False) -> None:
         self._add(verdict, Verdict, ref)
 
+    def add(self, entity: PrimaryEntity, ref: bool = False) -> None:
+        """Add an entity of any type supported by bundles."""
+        self._add(entity, None, ref)
+
+    # Bulk versions of the methods above. All the entities are validated in
+    # one pass before adding any of them, i.e. either all of them are added
+    # or none of them (if any entity is invalid).
+
+    def add_indicators(self, indicators: Iterable[Indicator], ref: bool = False) -> None:  # noqa: E501
+        self._add_many(indicators, Indicator, ref)
+
+    def add_judgements(self, judgements: Iterable[Judgement], ref: bool = False) -> None:  # noqa: E501
+        self._add_many(judgements, Judgement, ref)
+
+    def add_relationships(self, relationships: Iterable[Relationship], ref: bool = False) -> None:  # noqa: E501
+        self._add_many(relationships, Relationship, ref)
+
+    def add_sightings(self, sightings: Iterable[Sighting], ref: bool = False) -> None:  # noqa: E501
+        self._add_many(sightings, Sighting, ref)
+
+    def add_verdicts(self, verdicts: Iterable[Verdict], ref: bool = False) -> None:  # noqa: E501
+        self._add_many(verdicts, Verdict, ref)
+
+    def add_many(
+        self,
+        entities: Iterable[PrimaryEntity],
+        ref: bool = False,
+    ) -> None:
+        """Add entities of any types supported by bundles."""
+        self._add_many(entities, None, ref)
+
+    @abstractmethod
+    def _add(
+        self,
+        entity: PrimaryEntity,
+        type_: Optional[Type[PrimaryEntity]],
+        ref: bool,
+    ) -> None:
+        """Add the entity (or its ref) of the type (if known)."""
+
+    @abstractmethod
+    def _add_many(
+        self,
+        entities: Iterable[PrimaryEntity],
+        type_: Optional[Type[PrimaryEntity]],
+        ref: bool,
+    ) -> None:
+        """Add all the entities (or their refs) at once."""
+
+
+class Bundle(AddEntitiesMixin, PrimaryEntity):
+    """
+    Bundle of primary CTIM entities.
+
+    Entities are indexed by their IDs and XIDs, so looking them up, replacing
+    or removing them doesn't require scanning the whole bundle. Adding an
+    entity which is already in the bundle (i.e. with the same ID or exactly
+    the same set of XIDs) is handled according to `duplicate_policy`:
+    - `keep_first` (default): the new entity is discarded;
+    - `keep_last`: the new entity replaces the old one (in place);
+    - `merge`: any fields missing from the old entity are taken from the new
+    one, lists (e.g. observables or XIDs) are merged without duplicates.
+    """
+
+    schema = BundleSchema
+
+    # Bundles are few and have lots of state, so keep it in a regular dict.
+    __slots__ = ('__dict__',)
+
+    duplicate_policy = DEFAULT_DUPLICATE_POLICY
+
+    _types = {
+        type_.type + suffix: type_
+        for type_ in (Indicator, Judgement, Relationship, Sighting, Verdict)
+        for suffix in ('s', '_refs')
+    }
+    _fields = {}
+
+    # The lists of entities in `json` are rebuilt only on demand, while the
+    # index (which maps each key, e.g. 'judgements' or 'judgement_refs', to
+    # the entries of the key in insertion order and to their IDs and XIDs)
+    # is the source of truth, unless `json` is replaced as a whole.
+    _entries = None
+    _index = None
+    _aliases = None
+    _slots = None
+    _dirty = None
+
+    # The encoded entries of the bundle (by their slots) along with the
+    # encoder used, i.e. only the entries added or replaced since the last
+    # encoding of the bundle have to be encoded again.
+    _fragments = None
+    _fragments_encoder = None
+
+    def __init__(self, duplicate_policy=DEFAULT_DUPLICATE_POLICY, **data):
+        if duplicate_policy not in DUPLICATE_POLICY_CHOICES:
+            raise ValueError(
+                "'duplicate_policy' must be one of: "
+                f'{", ".join(map(repr, DUPLICATE_POLICY_CHOICES))}.'
+            )
+
+        super().__init__(**data)
+        self.duplicate_policy = duplicate_policy
+
+    @property
+    def json(self) -> Dict[str, Any]:
+        if self._dirty:
+            self._flush()
+        return PrimaryEntity.json.fget(self)
+
+    @json.setter
+    def json(self, json: Dict[str, Any]) -> None:
+        PrimaryEntity.json.fset(self, json)
+        # Rebuild the index from scratch on demand.
+        self._entries = None
+        self._dirty = None
+
+    @classmethod
+    def iter_load(
+        cls,
+        fp: Union[TextIO, BinaryIO],
+    ) -> Iterator[PrimaryEntity]:
+        """
+        Incrementally load the entities (but not refs) of a bundle from its
+        CTIM JSON file (either text or binary) one by one in the order of the
+        file, i.e. without loading the whole file into memory.
+
+        The JSON of the entities is trusted, i.e. it isn't validated and the
+        entities keep their IDs and XIDs (nothing is regenerated).
+        """
+
+        for (key, *index), value in iter_object(fp, expand=cls._types):
+            if index and not key.endswith('_refs'):
+                yield cls._load_entity(key, value)
+
+    @classmethod
+    def load(
+        cls,
+        fp: Union[TextIO, BinaryIO],
+        duplicate_policy: str = DEFAULT_DUPLICATE_POLICY,
+    ) -> 'Bundle':
+        """
+        Load a whole bundle from its CTIM JSON file (either text or binary).
+
+        Like with `iter_load`, the JSON is trusted, so the bundle and all of
+        its entities keep their IDs and XIDs. Any duplicate entities within
+        the file are handled according to `duplicate_policy`.
+        """
+
+        if duplicate_policy not in DUPLICATE_POLICY_CHOICES:
+            raise ValueError(
+                "'duplicate_policy' must be one of: "
+                f'{", ".join(map(repr, DUPLICATE_POLICY_CHOICES))}.'
+            )
+
+        bundle = cls.__new__(cls)
+        bundle.duplicate_policy = duplicate_policy
+        bundle.json = {}
+        bundle._ensure_index()
+
+        for (key, *index), value in iter_object(fp, expand=cls._types):
+            if not index:
+                bundle._json[key] = value
+            elif key.endswith('_refs'):
+                bundle._insert(key, value)
+            else:
+                bundle._insert(key, cls._load_entity(key, value).json)
+
+        return bundle
+
+    @classmethod
+    def _load_entity(cls, key, json):
+        if not isinstance(json, dict):
+            raise ValueError(
+                f'Not a valid CTIM {cls._types[key].__name__}: {json!r}.'
+            )
+
+        return cls._types[key]._from_json(json)
+
+    def to_bytes(self) -> bytes:
+        # The payload is assembled out of the cached entries, so in-place
+        # changes of the JSON of the entries can't be detected here either.
+        json = self.json
+        self._ensure_index()
+
+        encoder = get_json_encoder()
+        if self._fragments_encoder != encoder:
+            self._fragments = {}
+            self._fragments_encoder = encoder
+        fragments = self._fragments
+
+        parts = []
+        for key, value in json.items():
+            entries = self._entries.get(key)
+            if entries is None:
+                # Encode the field along with its key as a single fragment.
+                parts.append(encode({key: value})[1:-1])
+                continue
+
+            values = []
+            for slot, data in entries.items():
+                fragment = fragments.get(slot)
+                if fragment is None:
+                    fragment = fragments[slot] = encode(data)
+                values.append(fragment)
+
+            parts.append(encode(key) + b':[' + b','.join(values) + b']')
+
+        return b'{' + b','.join(parts) + b'}'
+
+    to_bytes.__doc__ = PrimaryEntity.to_bytes.__doc__
+
+    def insert_items(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """
+        Insert entities (or refs) already built and validated elsewhere, i.e.
+        pairs of the bundle keys and the JSON of the entities (e.g. the ones
+        yielded by `parallel.iter_build`), handling any duplicates the same
+        way as when adding entities.
+        """
+
+        self._ensure_index()
+        for key, data in items:
+            self._insert(key, data)
+
+    def get_entity(
+        self,
+        entity: Union[PrimaryEntity, str],
+        default: Any = None,
+    ) -> Any:
+        """
+        Look up the JSON of an entity (not a ref) in the bundle by the entity
+        itself or by any of its IDs or XIDs (including the ones of any
+        duplicates discarded or merged into it).
+        """
+
+        location = self._find(self._identifiers(entity))
+        if location is None:
+            return default
+
+        key, slot = location
+        return self._entries[key][slot]
+
+    def remove(self, entity: Union[PrimaryEntity, str]) -> None:
+        """
+        Remove an entity along with any refs to it from the bundle by the
+        entity itself or by any of its IDs or XIDs.
+        """
+
+        identifiers = self._identifiers(entity)
+        removed = False
+
+        location = self._find(identifiers)
+        if location is not None:
+            key, slot = location
+            # Remove the refs to the entity by any of its aliases too.
+            identifiers = identifiers + self._aliases[slot]
+            self._discard(key, slot)
+            removed = True
+
+        while True:
+            location = self._find(identifiers, ref=True)
+            if location is None:
+                break
+            self._discard(*location)
+            removed = True
+
+        if not removed:
+            raise KeyError(entity)
+
+    def replace(
+        self,
+        entity: Union[PrimaryEntity, str],
+        new_entity: PrimaryEntity,
+    ) -> None:
+        """
+        Replace an entity (not a ref) in the bundle with a new entity of the
+        same type while keeping its position.
+        """
+
+        location = self._find(self._identifiers(entity))
+        if location is None:
+            raise KeyError(entity)
+
+        key, slot = location
+        data = self._deserialize(new_entity, self._types[key], False)
+
+        identifiers = self._identifiers(data)
+        for identifier in self._duplicate_keys(data):
+            if self._index[key].get(identifier, slot) != slot:
+                raise ValueError(
+                    f'{new_entity} is a duplicate of another entity in the '
+                    f'bundle: {identifier!r}.'
+                )
+
+        self._unindex(key, slot)
+        self._entries[key][slot] = data
+        self._fragments.pop(slot, None)
+        self._index_entry(key, slot, identifiers)
+        self._dirty.add(key)
+
     def _add(self, entity, type_, ref):
+        if type_ is None:
+            type_ = self._get_type(entity)
+
+        data = self._deserialize(entity, type_, ref)
+
+        self._ensure_index()
+        self._insert(type_.type + ('_refs' if ref else 's'), data)
+
+    def _add_many(self, entities, type_, ref):
+        self.insert_items(self._deserialize_many(entities, type_, ref))
+
+    @classmethod
+    def _deserialize_many(cls, entities, type_, ref):
+        attr_name = 'id' if ref else 'json'
+        suffix = '_refs' if ref else 's'
+
+        items = []
+        errors = {}
+
+        for index, entity in enumerate(entities):
+            if type_ is None:
+                try:
+                    entity_type = cls._get_type(entity)
+                except BundleBuilderValidationError as error:
+                    errors[index] = error.args[0]
+                    continue
+            else:
+                entity_type = type_
+
+            # Inline the most common case of `EntityField._deserialize`.
+            if isinstance(entity, entity_type):
+                data = getattr(entity, attr_name)
+                if data is not None:
+                    items.append((entity_type.type + suffix, data))
+                    continue
+
+            try:
+                data = cls._get_field(entity_type, ref).deserialize(entity)
+            except MarshmallowValidationError as error:
+                errors[index] = error.messages
+            else:
+                items.append((entity_type.type + suffix, data))
+
+        if errors:
+            raise BundleBuilderValidationError(errors)
+
+        return items
+
+    def _insert(self, key, data):
+        identifiers = self._identifiers(data)
+
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = {}
+            self._entries[key] = {}
+            # Keep the same order of keys as if the entities were appended to
+            # the lists in `json` right away.
+            self._json.setdefault(key, [])
+
+        slot = self._find_duplicate(key, data)
+        if slot is not None:
+            self._add_duplicate(key, slot, data, identifiers)
+            return
+
+        slot = next(self._slots)
+        self._entries[key][slot] = data
+        self._index_entry(key, slot, identifiers)
+        self._dirty.add(key)
+
+    def _find_duplicate(self, key, data):
+        index = self._index.get(key)
+        if not index:
+            return None
+
+        for identifier in self._duplicate_keys(data):
+            slot = index.get(identifier)
+            if slot is not None:
+                return slot
+
+        return None
+
+    def _resolve_duplicate(self, key, slot, data):
+        # The entry to keep in the slot according to the duplicate policy.
+        old = self._entries[key][slot]
+
+        if self.duplicate_policy == 'keep_last':
+            return data
+        if self.duplicate_policy == 'merge' and isinstance(data, dict):
+            return _merge(old, data)
+        return old
+
+    def _add_duplicate(self, key, slot, data, identifiers):
+        entries = self._entries[key]
+
+        resolved = self._resolve_duplicate(key, slot, data)
+        if resolved is not entries[slot]:
+            entries[slot] = resolved
+            self._fragments.pop(slot, None)
+            identifiers = self._identifiers(resolved)
+
+        # Keep the IDs and XIDs of the duplicate resolvable anyway.
+        self._index_entry(key, slot, identifiers)
+        self._dirty.add(key)
+
+    @classmethod
+    def _deserialize(cls, entity, type_, ref):
         try:
-            field = EntityField(type=type_, ref=ref)
-            data = field.deserialize(entity)
+            return cls._get_field(type_, ref).deserialize(entity)
         except MarshmallowValidationError as error:
             raise BundleBuilderValidationError(*error.args) from error
-        else:
-            key = type_.type + ('_refs' if ref else 's')
-            self.json.setdefault(key, []).append(data)
+
+    @classmethod
+    def _get_field(cls, type_, ref):
+        # Fields are stateless, so there is no need to create them per call.
+        field = cls._fields.get((type_, ref))
+        if field is None:
+            field = cls._fields[(type_, ref)] = EntityField(
+                type=type_,
+                ref=ref,
+            )
+        return field
+
+    @classmethod
+    def _get_type(cls, entity):
+        for type_ in cls._types.values():
+            if isinstance(entity, type_):
+                return type_
+
+        raise BundleBuilderValidationError([
+            'Not a valid CTIM Indicator, Judgement, Relationship, Sighting or '
+            'Verdict.'
+        ])
+
+    @staticmethod
+    def _identifiers(entity):
+        if isinstance(entity, str):
+            # Either an ID or an XID, or a ref (i.e. an ID too).
+            return [entity]
+
+        if isinstance(entity, PrimaryEntity):
+            entity = entity.json
+
+        # Verdicts have neither IDs nor XIDs.
+        identifiers = [entity['id']] if entity.get('id') else []
+
+        # The XIDs of relationships are generated before their refs are set,
+        # so all the relationships of the same type share the same XIDs, i.e.
+        # the XIDs don't really identify relationships.
+        if entity.get('type') != Relationship.type:
+            external_ids = entity.get('external_ids')
+            if external_ids:
+                identifiers.extend(external_ids)
+                # Index the whole set of XIDs too for detecting duplicates.
+                identifiers.append(frozenset(external_ids))
+
+        return identifiers
+
+    @staticmethod
+    def _duplicate_keys(entity):
+        # Distinct entities may share some of their XIDs (e.g. sightings of
+        # the same observable get the same XID for it), so only the same ID
+        # or exactly the same set of XIDs make entities duplicates.
+        if isinstance(entity, str):
+            return [entity]
+
+        keys = [entity['id']] if entity.get('id') else []
+
+        if entity.get('type') != Relationship.type:
+            external_ids = entity.get('external_ids')
+            if external_ids:
+                keys.append(frozenset(external_ids))
+
+        return keys
+
+    def _find(self, identifiers, ref=False):
+        self._ensure_index()
+
+        suffix = '_refs' if ref else 's'
+
+        for key, index in self._index.items():
+            if not key.endswith(suffix):
+                continue
+            for identifier in identifiers:
+                slot = index.get(identifier)
+                if slot is not None:
+                    return key, slot
+
+        return None
+
+    def _index_entry(self, key, slot, identifiers):
+        index = self._index[key]
+        aliases = self._aliases.setdefault(slot, [])
+        for identifier in identifiers:
+            if identifier not in index:
+                index[identifier] = slot
+                aliases.append(identifier)
+
+    def _unindex(self, key, slot):
+        index = self._index[key]
+        for identifier in self._aliases.pop(slot, []):
+            del index[identifier]
+
+    def _discard(self, key, slot):
+        self._unindex(key, slot)
+        del self._entries[key][slot]
+        self._fragments.pop(slot, None)
+        self._dirty.add(key)
+
+    def _ensure_index(self):
+        if self._entries is not None:
+            return
+
+        # Resolve any pending XIDs of the bundle itself first.
+        json = PrimaryEntity.json.fget(self)
+
+        self._entries = {}
+        self._index = {}
+        self._aliases = {}
+        self._slots = count()
+        self._dirty = set()
+        self._fragments = {}
+
+        for key in self._types:
+            values = json.get(key)
+            if values is None:
+                continue
+
+            entries = self._entries[key] = {}
+            self._index[key] = {}
+            for data in values:
+                slot = next(self._slots)
+                entries[slot] = data
+                self._index_entry(key, slot, self._identifiers(data))
+
+    def _flush(self):
+        json = self._json
+        for key in self._dirty:
+            values = list(self._entries[key].values())
+            if values:
+                json[key] = values
+            else:
+                json.pop(key, None)
+        self._dirty.clear()
+
+    def _get_json(self, field: str) -> Dict[str, Any]:
+        if self._dirty:
+            self._flush()
+        return super()._get_json(field)
+
+    def _get_state(self) -> Optional[Dict[str, Any]]:
+        return {'duplicate_policy': self.duplicate_policy}
 
     def _generate_external_id_seed_values(self) -> Iterator[Tuple[str]]:
         yield (
             self.type,
         )
+
+
+def _merge(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    # Don't change the JSON of the original entity in place.
+    merged = dict(old)
+
+    for field, value in new.items():
+        if field not in merged:
+            merged[field] = value
+        elif isinstance(merged[field], list) and isinstance(value, list):
+            merged[field] = merged[field] + [
+                item for item in value if item not in merged[field]
+            ]
+
+    return merged
@@ -7,6 +7,7 @@ from typing import (
 from ..entity import (
     EntitySchema,
     PrimaryEntity,
+    _json_field,
 )
 from ..fields import (
     StringField,
@@ -147,6 +148,12 @@ class IndicatorSchema(EntitySchema):
 class Indicator(PrimaryEntity):
     schema = IndicatorSchema
 
+    __slots__ = ()
+
+    # The fields read while generating the XID seed values.
+    producer = _json_field('producer')
+    title = _json_field('title')
+
     def _generate_external_id_seed_values(self) -> Iterator[Tuple[str]]:
         yield (
             self.type,
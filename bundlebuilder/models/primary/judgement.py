@@ -10,6 +10,7 @@ from marshmallow.exceptions import ValidationError
 from ..entity import (
     EntitySchema,
     PrimaryEntity,
+    _json_field,
 )
 from ..fields import (
     StringField,
@@ -127,6 +128,14 @@ class JudgementSchema(EntitySchema):
 class Judgement(PrimaryEntity):
     schema = JudgementSchema
 
+    __slots__ = ()
+
+    # The fields read while generating the XID seed values.
+    disposition = _json_field('disposition')
+    observable = _json_field('observable')
+    source = _json_field('source')
+    timestamp = _json_field('timestamp')
+
     def _generate_external_id_seed_values(self) -> Iterator[Tuple[str]]:
         yield (
             self.type,
@@ -1,12 +1,16 @@
 from functools import partial
 from typing import (
+    Any,
+    Dict,
     Iterator,
+    Optional,
     Tuple,
 )
 
 from ..entity import (
     EntitySchema,
     PrimaryEntity,
+    _json_field,
 )
 from ..fields import (
     StringField,
@@ -95,6 +99,11 @@ class RelationshipSchema(EntitySchema):
 class Relationship(PrimaryEntity):
     schema = RelationshipSchema
 
+    __slots__ = ('source_ref_external_ids', 'target_ref_external_ids')
+
+    # The fields read while generating the XID seed values.
+    relationship_type = _json_field('relationship_type')
+
     def __init__(self, **data):
         super().__init__(**data)
         self.source_ref_external_ids = data.get('source_ref',
@@ -102,6 +111,13 @@ class Relationship(PrimaryEntity):
         self.target_ref_external_ids = data.get('target_ref',
                                                 {}).get('external_ids')
 
+    def _get_state(self) -> Optional[Dict[str, Any]]:
+        # The XIDs of the refs are needed for generating the XIDs of copies.
+        return {
+            'source_ref_external_ids': self.source_ref_external_ids,
+            'target_ref_external_ids': self.target_ref_external_ids,
+        }
+
     def _generate_external_id_seed_values(self) -> Iterator[Tuple[str]]:
         yield (
             self.type,
@@ -7,6 +7,7 @@ from typing import (
 from ..entity import (
     EntitySchema,
     PrimaryEntity,
+    _json_field,
 )
 from ..fields import (
     StringField,
@@ -124,6 +125,13 @@ class SightingSchema(EntitySchema):
 class Sighting(PrimaryEntity):
     schema = SightingSchema
 
+    __slots__ = ()
+
+    # The fields read while generating the XID seed values.
+    observables = _json_field('observables')
+    timestamp = _json_field('timestamp')
+    title = _json_field('title')
+
     def _generate_external_id_seed_values(self) -> Iterator[Tuple[str]]:
         observables = self.observables or []
 
@@ -69,6 +69,8 @@ class VerdictSchema(EntitySchema):
 class Verdict(PrimaryEntity):
     schema = VerdictSchema
 
+    __slots__ = ()
+
     @classmethod
     def from_judgement(cls, judgement: Judgement) -> 'Verdict':
         try:
@@ -91,7 +93,7 @@ class Verdict(PrimaryEntity):
     # Unlike the other primary CTIM entities, the Verdict entity has neither an
     # ID nor any XIDs, so its implementation can be pretty much simplified.
 
-    def _initialize_missing_fields(self) -> None:
+    def _initialize_missing_fields(self, session=None) -> None:
         self.json = {
             'type': self.type,
             **self.json
@@ -1,18 +1,23 @@
-# Make the classes below importable from the `.secondary` sub-package directly.
-from .column_definition import ColumnDefinition
-from .composite_indicator_expression import CompositeIndicatorExpression
-from .external_reference import ExternalReference
-from .identity_specification import IdentitySpecification
-from .judgement_specification import JudgementSpecification
-from .kill_chain_phase import KillChainPhase
-from .observable import Observable
-from .observed_relation import ObservedRelation
-from .observed_time import ObservedTime
-from .open_ioc_specification import OpenIOCSpecification
-from .related_judgement import RelatedJudgement
-from .sensor_coordinates import SensorCoordinates
-from .sighting_data_table import SightingDataTable
-from .sioc_specification import SIOCSpecification
-from .snort_specification import SnortSpecification
-from .threat_brain_specification import ThreatBrainSpecification
-from .valid_time import ValidTime
+from ..lazy import export_lazily
+
+# Make the classes below importable from the `.secondary` sub-package directly
+# (their modules are imported only on first access though).
+export_lazily(globals(), {
+    'ColumnDefinition': '.column_definition',
+    'CompositeIndicatorExpression': '.composite_indicator_expression',
+    'ExternalReference': '.external_reference',
+    'IdentitySpecification': '.identity_specification',
+    'JudgementSpecification': '.judgement_specification',
+    'KillChainPhase': '.kill_chain_phase',
+    'Observable': '.observable',
+    'ObservedRelation': '.observed_relation',
+    'ObservedTime': '.observed_time',
+    'OpenIOCSpecification': '.open_ioc_specification',
+    'RelatedJudgement': '.related_judgement',
+    'SensorCoordinates': '.sensor_coordinates',
+    'SightingDataTable': '.sighting_data_table',
+    'SIOCSpecification': '.sioc_specification',
+    'SnortSpecification': '.snort_specification',
+    'ThreatBrainSpecification': '.threat_brain_specification',
+    'ValidTime': '.valid_time',
+})
@@ -40,3 +40,5 @@ class ColumnDefinitionSchema(EntitySchema):
 
 class ColumnDefinition(SecondaryEntity):
     schema = ColumnDefinitionSchema
+
+    __slots__ = ()
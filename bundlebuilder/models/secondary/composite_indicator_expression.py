@@ -29,3 +29,5 @@ class CompositeIndicatorExpressionSchema(EntitySchema):
 
 class CompositeIndicatorExpression(SecondaryEntity):
     schema = CompositeIndicatorExpressionSchema
+
+    __slots__ = ()
@@ -45,3 +45,5 @@ class ExternalReferenceSchema(EntitySchema):
 
 class ExternalReference(SecondaryEntity):
     schema = ExternalReferenceSchema
+
+    __slots__ = ()
@@ -36,3 +36,5 @@ class IdentitySpecificationSchema(EntitySchema):
 
 class IdentitySpecification(SecondaryEntity):
     schema = IdentitySpecificationSchema
+
+    __slots__ = ()
@@ -29,6 +29,8 @@ class JudgementSpecificationSchema(EntitySchema):
 class JudgementSpecification(SecondaryEntity):
     schema = JudgementSpecificationSchema
 
+    __slots__ = ()
+
     def _initialize_missing_fields(self) -> None:
         super()._initialize_missing_fields()
 
@@ -34,3 +34,5 @@ class KillChainPhaseSchema(EntitySchema):
 
 class KillChainPhase(SecondaryEntity):
     schema = KillChainPhaseSchema
+
+    __slots__ = ()
@@ -28,3 +28,5 @@ class ObservableSchema(EntitySchema):
 
 class Observable(SecondaryEntity):
     schema = ObservableSchema
+
+    __slots__ = ()
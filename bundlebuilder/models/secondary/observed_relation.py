@@ -44,3 +44,5 @@ class ObservedRelationSchema(EntitySchema):
 
 class ObservedRelation(SecondaryEntity):
     schema = ObservedRelationSchema
+
+    __slots__ = ()
@@ -30,3 +30,5 @@ class ObservedTimeSchema(EntitySchema):
 
 class ObservedTime(SecondaryEntity):
     schema = ObservedTimeSchema
+
+    __slots__ = ()
@@ -20,6 +20,8 @@ class OpenIOCSpecificationSchema(EntitySchema):
 class OpenIOCSpecification(SecondaryEntity):
     schema = OpenIOCSpecificationSchema
 
+    __slots__ = ()
+
     def _initialize_missing_fields(self) -> None:
         super()._initialize_missing_fields()
 
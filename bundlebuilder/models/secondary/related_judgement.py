@@ -31,3 +31,5 @@ class RelatedJudgementSchema(EntitySchema):
 
 class RelatedJudgement(SecondaryEntity):
     schema = RelatedJudgementSchema
+
+    __slots__ = ()
@@ -31,3 +31,5 @@ class SensorCoordinatesSchema(EntitySchema):
 
 class SensorCoordinates(SecondaryEntity):
     schema = SensorCoordinatesSchema
+
+    __slots__ = ()
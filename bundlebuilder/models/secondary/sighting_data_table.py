@@ -35,3 +35,5 @@ class SightingDataTableSchema(EntitySchema):
 
 class SightingDataTable(SecondaryEntity):
     schema = SightingDataTableSchema
+
+    __slots__ = ()
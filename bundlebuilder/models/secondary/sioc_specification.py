@@ -20,6 +20,8 @@ class SIOCSpecificationSchema(EntitySchema):
 class SIOCSpecification(SecondaryEntity):
     schema = SIOCSpecificationSchema
 
+    __slots__ = ()
+
     def _initialize_missing_fields(self) -> None:
         super()._initialize_missing_fields()
 
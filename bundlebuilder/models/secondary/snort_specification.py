@@ -20,6 +20,8 @@ class SnortSpecificationSchema(EntitySchema):
 class SnortSpecification(SecondaryEntity):
     schema = SnortSpecificationSchema
 
+    __slots__ = ()
+
     def _initialize_missing_fields(self) -> None:
         super()._initialize_missing_fields()
 
@@ -26,6 +26,8 @@ class ThreatBrainSpecificationSchema(EntitySchema):
 class ThreatBrainSpecification(SecondaryEntity):
     schema = ThreatBrainSpecificationSchema
 
+    __slots__ = ()
+
     def _initialize_missing_fields(self) -> None:
         super()._initialize_missing_fields()
 
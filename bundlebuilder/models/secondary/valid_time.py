@@ -29,3 +29,5 @@ class ValidTimeSchema(EntitySchema):
 
 class ValidTime(SecondaryEntity):
     schema = ValidTimeSchema
+
+    __slots__ = ()
@@ -0,0 +1,52 @@
+from functools import partial
+
+from marshmallow.schema import Schema
+
+from .fields import (
+    RawField,
+    StringField,
+)
+from .validators import validate_string
+from ..constants import (
+    SOURCE_MAX_LENGTH,
+    VALIDATION_LEVEL_CHOICES,
+)
+from ..transient_ids import TransientIdGenerator
+
+
+class TransientIdGeneratorField(RawField):
+    default_error_messages = {
+        'type': 'Not a valid transient ID generator.',
+    }
+
+    def __repr__(self):
+        return 'TransientIdGenerator'
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if not isinstance(value, TransientIdGenerator):
+            raise self.make_error('type')
+
+        return value
+
+
+class SessionSchema(Schema):
+    external_id_prefix = StringField(
+        validate=validate_string,
+        required=True,
+    )
+    source = StringField(
+        validate=partial(validate_string, max_length=SOURCE_MAX_LENGTH),
+        required=True,
+    )
+    source_uri = StringField(
+        validate=validate_string,
+        required=True,
+    )
+    validation_level = StringField(
+        validate=partial(validate_string, choices=VALIDATION_LEVEL_CHOICES),
+        required=True,
+    )
+    transient_id_generator = TransientIdGeneratorField(
+        allow_none=True,
+        required=True,
+    )
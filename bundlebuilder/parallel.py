@@ -0,0 +1,200 @@
+import os
+from collections import deque
+from multiprocessing import Pool
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .models import Bundle
+from .models.entity import (
+    BaseEntity,
+    PrimaryEntity,
+    get_validation_engine,
+    set_validation_engine,
+)
+from .session import (
+    Session,
+    get_session,
+    set_session,
+)
+from .transient_ids import get_default_transient_id_generator
+
+DEFAULT_BATCH_SIZE = 1000
+
+T = TypeVar('T')
+
+Factory = Callable[[Any], Union[PrimaryEntity, Iterable[PrimaryEntity]]]
+
+
+def build(
+    records: Iterable[Any],
+    factory: Factory,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    bundle: Optional[Bundle] = None,
+) -> Bundle:
+    """
+    Build entities out of records with `factory` in parallel by a pool of
+    worker processes (one per CPU by default) and add them to a bundle (a new
+    one by default) in the order of the records.
+
+    The factory gets a record and returns either an entity or an iterable of
+    entities. Both the factory and the records must be picklable (e.g. the
+    factory must be a module-level function rather than a lambda). Entities
+    are built within the current session and with the current validation
+    engine, each batch of records gets its own transient ID generator derived
+    from the one of the session (see `TransientIdGenerator.spawn`), so the
+    transient IDs don't clash across the processes. Any errors raised by the
+    factory are re-raised as is.
+    """
+
+    if bundle is None:
+        bundle = Bundle()
+
+    for items in iter_build(records, factory, workers, batch_size):
+        bundle.insert_items(items)
+
+    return bundle
+
+
+def iter_build(
+    records: Iterable[Any],
+    factory: Factory,
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+    """
+    Same as `build`, but yield batches of the bundle keys and the JSON of the
+    entities built (e.g. 'judgements' and the JSON of a judgement) instead.
+    """
+
+    yield from map_batches(
+        _BuildBatch(factory),
+        iter_batches(records, batch_size),
+        workers,
+    )
+
+
+def build_batch(
+    factory: Factory,
+    records: List[Any],
+    index: int = 0,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Build one batch of records with `factory` within the current session
+    and return the bundle keys and the JSON of the entities built, i.e. do
+    what `iter_build` does for each batch, so that the batches can be run by
+    other means too (e.g. by executors). The transient ID generator of the
+    session is spawned for the batch by its `index` (which must be unique
+    among all the batches of the same bundle).
+    """
+
+    return _call(_BuildBatch(factory), index, records)
+
+
+def iter_batches(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    if not (isinstance(batch_size, int) and batch_size > 0):
+        raise ValueError("'batch_size' must be a positive integer.")
+
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def map_batches(
+    function: Callable[[List[Any]], T],
+    batches: Iterable[List[Any]],
+    workers: Optional[int] = None,
+) -> Iterator[T]:
+    """
+    Apply a (picklable) function to batches either in the current process or
+    by a pool of `workers` processes (if more than one) and yield the results
+    in the order of the batches.
+
+    Each batch is processed within the current session (with a transient ID
+    generator of its own) and with the current validation engine. Only a few
+    batches are processed at a time, so the memory used doesn't depend on the
+    number of batches.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if not (isinstance(workers, int) and workers > 0):
+        raise ValueError("'workers' must be a positive integer.")
+
+    if workers == 1:
+        for index, batch in enumerate(batches):
+            yield _call(function, index, batch)
+        return
+
+    pool = Pool(
+        workers,
+        initializer=_initialize_worker,
+        initargs=(get_validation_engine(), get_session()),
+    )
+    try:
+        pending = deque()
+        for index, batch in enumerate(batches):
+            pending.append(pool.apply_async(_call, (function, index, batch)))
+            if len(pending) > 2 * workers:
+                yield pending.popleft().get()
+
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _initialize_worker(engine: str, session: Session) -> None:
+    set_validation_engine(engine)
+    set_session(*session)
+
+
+def _call(function, index, batch):
+    session = get_session()
+
+    transient_id_generator = (
+        session.transient_id_generator or
+        get_default_transient_id_generator()
+    )
+
+    with session._replace(
+        transient_id_generator=transient_id_generator.spawn(index),
+    ).set():
+        return function(batch)
+
+
+class _BuildBatch:
+    """Picklable function building a batch of records with a factory."""
+
+    def __init__(self, factory: Factory):
+        self.factory = factory
+
+    def __call__(self, records):
+        entities = []
+        for record in records:
+            result = self.factory(record)
+            if isinstance(result, BaseEntity):
+                entities.append(result)
+            else:
+                entities.extend(result)
+
+        # Send back just the JSON (including the XIDs computed right here)
+        # rather than the entities themselves.
+        return Bundle._deserialize_many(entities, None, False)
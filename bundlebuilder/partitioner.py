@@ -0,0 +1,218 @@
+import json
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+
+from .models import (
+    Bundle,
+    Relationship,
+    Verdict,
+)
+from .splitter import BundleSplitter
+
+
+# The fields of entities referring to other entities by their IDs.
+_REF_FIELDS = {
+    Relationship.type + 's': ('source_ref', 'target_ref'),
+    Verdict.type + 's': ('judgement_id',),
+}
+
+
+class BundlePartitioner(BundleSplitter):
+    """
+    Builder of bundles split by the same limits as with `BundleSplitter`, but
+    keeping related entities (i.e. relationships along with their source and
+    target entities, verdicts along with their judgements, refs along with
+    the entities referred) in the same bundles whenever possible.
+
+    All the entities are collected into a bundle first (hence any duplicates
+    are detected across all the entities added) and partitioned only when the
+    partitioner is closed. Groups of related entities are packed into bundles
+    in the order of their first entities. Any group not fitting into a bundle
+    on its own is split, in which case any references to entities from other
+    bundles are replaced with the XIDs of the entities.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Collect entities into a separate bundle (which is never emitted).
+        self._collected = self._bundle
+        self._index = 0
+        self._start()
+
+    def close(self) -> List[Bundle]:
+        if self._collected is not None:
+            collected, self._collected = self._collected, None
+            self._partition(collected)
+
+        return super().close()
+
+    def _insert(self, key, data):
+        if self._collected is None:
+            raise ValueError('Adding to a closed splitter.')
+
+        self._collected._insert(key, data)
+
+    def _partition(self, collected: Bundle) -> None:
+        items: List[Tuple[str, Any]] = []
+        positions: Dict[str, int] = {}
+
+        for key, entries in collected._entries.items():
+            slots = {}
+            for slot, data in entries.items():
+                slots[slot] = len(items)
+                items.append((key, data))
+
+            if not key.endswith('_refs'):
+                # Resolve the IDs and XIDs of any discarded duplicates too.
+                for identifier, slot in collected._index[key].items():
+                    positions[identifier] = slots[slot]
+
+        components = _Components(len(items))
+
+        for position, (key, data) in enumerate(items):
+            if key.endswith('_refs'):
+                target = positions.get(data)
+                if target is not None:
+                    data = items[target][1]['id']
+                    components.union(position, target)
+            else:
+                for field in _REF_FIELDS.get(key, ()):
+                    target = positions.get(data.get(field))
+                    if target is None:
+                        continue
+                    identifier = items[target][1].get('id')
+                    if identifier and data[field] != identifier:
+                        # Refer to the entity actually kept in the bundle.
+                        data = {**data, field: identifier}
+                    components.union(position, target)
+            items[position] = (key, data)
+
+        for members in components.groups():
+            self._pack(items, members, positions)
+
+    def _pack(self, items, members, positions):
+        fragments = [
+            (key, data, len(json.dumps(data)))
+            for key, data in (items[member] for member in members)
+        ]
+
+        if not self._fits(len(members), self._get_group_size(fragments)):
+            if self._count:
+                self._finish()
+                self._start()
+
+        if self._fits(len(members), self._get_group_size(fragments)):
+            for key, data, fragment_size in fragments:
+                size = self._get_entry_size(key, fragment_size)
+                self._append(key, data, size)
+            return
+
+        # The group is too large, so split it. Place the entities referring
+        # to other entities last, so that most of the entities referred are
+        # already placed by then.
+        members = sorted(
+            members,
+            key=lambda member: _is_referring(items[member][0]),
+        )
+
+        placed: Dict[int, int] = {}
+
+        for member in members:
+            key, data = items[member]
+
+            if _is_referring(key):
+                data = self._localize(key, data, items, positions, placed)
+
+            fragment_size = len(json.dumps(data))
+            size = self._get_entry_size(key, fragment_size)
+
+            if self._count and not self._fits(1, size):
+                self._finish()
+                self._start()
+
+                if _is_referring(key):
+                    data = self._localize(
+                        key, items[member][1], items, positions, placed,
+                    )
+                    fragment_size = len(json.dumps(data))
+
+                size = self._get_entry_size(key, fragment_size)
+
+            self._append(key, data, size)
+            placed[member] = self._index
+
+    def _get_group_size(self, fragments):
+        size = 0
+        keys = set()
+        for key, data, fragment_size in fragments:
+            if key in keys or self._bundle._entries.get(key):
+                size += fragment_size + len(', ')
+            else:
+                size += fragment_size + len(f', {json.dumps(key)}: []')
+                keys.add(key)
+        return size
+
+    def _localize(self, key, data, items, positions, placed):
+        # Replace any references to entities not in the current bundle with
+        # the XIDs of the entities.
+
+        def localize(identifier):
+            target = positions.get(identifier)
+            if target is None or placed.get(target) == self._index:
+                return identifier
+
+            external_ids = items[target][1].get('external_ids')
+            return external_ids[0] if external_ids else identifier
+
+        if key.endswith('_refs'):
+            return localize(data)
+
+        localized = {
+            field: localize(data[field])
+            for field in _REF_FIELDS[key]
+            if field in data
+        }
+        return {**data, **localized}
+
+
+def _is_referring(key: str) -> bool:
+    return key.endswith('_refs') or key in _REF_FIELDS
+
+
+class _Components:
+    """Disjoint sets (i.e. union-find) of positions of related entities."""
+
+    def __init__(self, size: int):
+        self.parents = list(range(size))
+
+    def find(self, position: int) -> int:
+        parents = self.parents
+
+        root = position
+        while parents[root] != root:
+            root = parents[root]
+
+        # Compress the path, so that subsequent lookups take constant time.
+        while parents[position] != root:
+            parents[position], position = root, parents[position]
+
+        return root
+
+    def union(self, first: int, second: int) -> None:
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            # Keep the earliest position as the root of the joined set.
+            if second < first:
+                first, second = second, first
+            self.parents[second] = first
+
+    def groups(self) -> List[List[int]]:
+        groups: Dict[int, List[int]] = {}
+        for position in range(len(self.parents)):
+            groups.setdefault(self.find(position), []).append(position)
+        return list(groups.values())
@@ -0,0 +1,181 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .models import Bundle
+from .models.entity import (
+    get_validation_engine,
+    use_validation_engine,
+)
+from .parallel import (
+    DEFAULT_BATCH_SIZE,
+    Factory,
+    build_batch,
+)
+from .session import (
+    Session,
+    get_session,
+)
+from .splitter import BundleSplitter
+from .writer import BundleWriter
+
+DEFAULT_MAX_PENDING = 4
+
+Records = Union[AsyncIterable[Any], Iterable[Any]]
+
+Sink = Union[Bundle, BundleSplitter, BundleWriter]
+
+
+async def build_async(
+    records: Records,
+    factory: Factory,
+    executor: Optional[Executor] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    bundle: Optional[Sink] = None,
+) -> Sink:
+    """
+    Build entities out of records (e.g. fetched from upstream APIs) with
+    `factory` off the event loop and add them to a bundle (a new one by
+    default), a splitter or a writer in the order of the records.
+
+    See `iter_build_async` for more details.
+    """
+
+    if bundle is None:
+        bundle = Bundle()
+
+    loop = asyncio.get_event_loop()
+
+    async for items in iter_build_async(
+        records, factory, executor, batch_size, max_pending,
+    ):
+        if isinstance(bundle, BundleWriter):
+            # Don't block the event loop while writing to the file (in the
+            # default executor, since the writer can't be sent to processes).
+            await loop.run_in_executor(None, bundle.insert_items, items)
+        else:
+            bundle.insert_items(items)
+
+    return bundle
+
+
+async def iter_build_async(
+    records: Records,
+    factory: Factory,
+    executor: Optional[Executor] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> AsyncIterator[List[Tuple[str, Dict[str, Any]]]]:
+    """
+    Same as `parallel.iter_build`, but for asyncio apps, i.e. read records
+    from an async (or a regular) iterable and build them in batches by
+    `executor` (the default executor of the event loop by default), so that
+    building entities doesn't block the event loop.
+
+    Records keep being read and built concurrently with consuming the
+    results, but at most `max_pending` batches are waiting to be consumed
+    at a time, i.e. reading records is suspended until the consumer catches
+    up. Entities are built within the session current at the moment of
+    starting the pipeline (so pipelines run by different tasks may use
+    different sessions) and with the current validation engine. With process
+    pool executors, both the factory and the records must be picklable.
+    """
+
+    for name, value in [('batch_size', batch_size),
+                        ('max_pending', max_pending)]:
+        if not (isinstance(value, int) and value > 0):
+            raise ValueError(f'{name!r} must be a positive integer.')
+
+    loop = asyncio.get_event_loop()
+    session = get_session()
+    engine = get_validation_engine()
+
+    # The futures of the batches being built (or already built) in the order
+    # of the batches. The end of records is marked with `None`.
+    queue = asyncio.Queue(max_pending)
+
+    async def produce():
+        index = 0
+        async for batch in _aiter_batches(records, batch_size):
+            await queue.put(loop.run_in_executor(
+                executor,
+                _build_batch_within, session, engine, factory, batch, index,
+            ))
+            index += 1
+        await queue.put(None)
+
+    producer = asyncio.ensure_future(produce())
+    getter = None
+    try:
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            # Don't get stuck waiting for more batches if reading records
+            # fails (the producer puts `None` at the end otherwise).
+            await asyncio.wait(
+                [getter, producer], return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not getter.done() and queue.empty() and producer.done():
+                getter.cancel()
+                producer.result()
+
+            future = await getter
+            if future is None:
+                break
+            yield await future
+    finally:
+        tasks = [producer] if getter is None else [producer, getter]
+        for task in tasks:
+            task.cancel()
+        # Let the tasks actually finish before the event loop moves on.
+        await asyncio.wait(tasks)
+
+        while not queue.empty():
+            future = queue.get_nowait()
+            if future is not None:
+                future.cancel()
+
+
+async def _aiter_batches(
+    records: Records,
+    batch_size: int,
+) -> AsyncIterator[List[Any]]:
+    if not hasattr(records, '__aiter__'):
+        records = _aiter(records)
+
+    batch = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _aiter(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _build_batch_within(
+    session: Session,
+    engine: str,
+    factory: Factory,
+    records: List[Any],
+    index: int,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    # Executors don't propagate the current context (i.e. the session and the
+    # validation engine) of the task, so pass it explicitly.
+    with session.set(), use_validation_engine(engine):
+        return build_batch(factory, records, index)
@@ -1,88 +1,108 @@
 from collections import namedtuple
 from contextlib import contextmanager
-from functools import partial
+from contextvars import ContextVar
+from typing import Optional
 
 from marshmallow.exceptions import (
     ValidationError as MarshmallowValidationError
 )
-from marshmallow.schema import Schema
 
 from .constants import (
-    SOURCE_MAX_LENGTH,
     DEFAULT_SESSION_EXTERNAL_ID_PREFIX,
     DEFAULT_SESSION_SOURCE,
     DEFAULT_SESSION_SOURCE_URI,
+    DEFAULT_SESSION_VALIDATION_LEVEL,
 )
 from .exceptions import (
     ValidationError as BundleBuilderValidationError
 )
-from .models.fields import StringField
-from .models.validators import validate_string
-
-
-class SessionSchema(Schema):
-    external_id_prefix = StringField(
-        validate=validate_string,
-        required=True,
-    )
-    source = StringField(
-        validate=partial(validate_string, max_length=SOURCE_MAX_LENGTH),
-        required=True,
-    )
-    source_uri = StringField(
-        validate=validate_string,
-        required=True,
-    )
+from .transient_ids import TransientIdGenerator
+
+
+Session = namedtuple(
+    'Session',
+    (
+        'external_id_prefix',
+        'source',
+        'source_uri',
+        'validation_level',
+        'transient_id_generator',
+    ),
+)
+# Make the fields below optional (`namedtuple` doesn't support `defaults`
+# until Python 3.7). No transient ID generator means the default one.
+Session.__new__.__defaults__ = (DEFAULT_SESSION_VALIDATION_LEVEL, None)
 
 
-Session = namedtuple('Session', ('external_id_prefix', 'source', 'source_uri'))
+# The current session is set either for the whole process (`set_session`) or
+# temporarily by `Session.set`, which stores it in a context variable, so each
+# thread and each asyncio task can override the session of the process on its
+# own, i.e. without affecting any others. New threads start with the session
+# of the process, while new asyncio tasks inherit the current session of their
+# parent.
 
 
 def get_session() -> Session:
-    return _SESSION
+    session = _SESSION.get()
+    if session is None:
+        return _PROCESS_SESSION
+    return session
 
 
 def get_default_session() -> Session:
     return _DEFAULT_SESSION
 
 
-def set_session(external_id_prefix: str, source: str, source_uri: str) -> None:
-    data = {
-        'external_id_prefix': external_id_prefix,
-        'source': source,
-        'source_uri': source_uri,
-    }
+def set_session(
+    external_id_prefix: str,
+    source: str,
+    source_uri: str,
+    validation_level: str = DEFAULT_SESSION_VALIDATION_LEVEL,
+    transient_id_generator: Optional[TransientIdGenerator] = None,
+) -> None:
+    global _PROCESS_SESSION
+    _PROCESS_SESSION = _validate_session(
+        external_id_prefix,
+        source,
+        source_uri,
+        validation_level,
+        transient_id_generator,
+    )
+
+
+def set_default_session() -> None:
+    global _PROCESS_SESSION
+    _PROCESS_SESSION = _DEFAULT_SESSION
+
+
+def _validate_session(*args) -> Session:
+    # Use a dynamic import to break the circular dependency.
+    from .models.session import SessionSchema
+
+    data = dict(zip(Session._fields, args))
 
     try:
         data = SessionSchema().load(data)
     except MarshmallowValidationError as error:
         raise BundleBuilderValidationError(*error.args) from error
 
-    global _SESSION
-    _SESSION = Session(**data)
-
-
-def set_default_session() -> None:
-    global _SESSION
-    _SESSION = _DEFAULT_SESSION
+    return Session(**data)
 
 
 # Make each session a context manager being able to validate itself and set
-# globally on `__enter__` + automatically switch back to the previous session
+# as current on `__enter__` + automatically switch back to the previous session
 # on `__exit__` when used in `with` statements.
 
 
 @contextmanager
 def _set(session: Session):
-    previous_session = get_session()
+    # Validate the session before trying to set it as current.
+    token = _SESSION.set(_validate_session(*session))
     try:
-        # Validate the session before trying to set it globally.
-        set_session(*session)
         yield
     finally:
         # The previous session is guaranteed to be valid anyway.
-        global _SESSION
-        _SESSION = previous_session
+        _SESSION.reset(token)
 
 
 Session.set = lambda self: _set(self)
@@ -93,4 +113,7 @@ _DEFAULT_SESSION = Session(
     source=DEFAULT_SESSION_SOURCE,
     source_uri=DEFAULT_SESSION_SOURCE_URI,
 )
-_SESSION = _DEFAULT_SESSION
+_PROCESS_SESSION = _DEFAULT_SESSION
+
+# Overrides the session of the process (if set).
+_SESSION = ContextVar('session', default=None)
@@ -0,0 +1,189 @@
+import json
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .models import Bundle
+from .models.primary.bundle import AddEntitiesMixin
+from .session import get_session
+
+
+class BundleSplitter(AddEntitiesMixin):
+    """
+    Builder of bundles automatically split by the number of entries (i.e.
+    entities and refs) and the size of their encoded JSON.
+
+    Entities are added to the current bundle until adding one more would make
+    the bundle exceed any of the limits, in which case the current bundle is
+    finished and a new one is started. An entity exceeding `max_bytes` on its
+    own ends up in a separate bundle.
+
+    All the bundles are built within the session current at the moment of
+    creating the splitter. Each bundle gets its own XID, since the index of
+    the bundle is added to its XID salt values. Finished bundles are either
+    passed to `on_bundle` (if specified) or collected in `bundles`. Notice
+    that duplicate entities are detected only within each bundle, and the
+    ones replacing or merged into existing entries (depending on the duplicate
+    policy) count towards `max_bytes` by how much they grow the bundle.
+    """
+
+    def __init__(
+        self,
+        max_entities: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        on_bundle: Optional[Callable[[Bundle], Any]] = None,
+        **data
+    ):
+        for name, value in [('max_entities', max_entities),
+                            ('max_bytes', max_bytes)]:
+            if value is not None and not (
+                isinstance(value, int) and value > 0
+            ):
+                raise ValueError(f'{name!r} must be a positive integer.')
+
+        entity_keys = [key for key in data if key in Bundle._types]
+        if entity_keys:
+            raise ValueError(
+                'Entities must be added to the splitter one by one rather '
+                f'than passed to it: {", ".join(map(repr, entity_keys))}.'
+            )
+
+        self.max_entities = max_entities
+        self.max_bytes = max_bytes
+        self.on_bundle = on_bundle
+        self.bundles: List[Bundle] = []
+
+        self._session = get_session()
+        self._data = data
+        self._external_id_salt_values = list(
+            data.pop('external_id_salt_values', [])
+        )
+        self._index = 0
+
+        self._bundle = None
+        self._count = 0
+        self._size = 0
+
+        # Make sure that the data is valid right away.
+        self._start()
+
+    def __enter__(self) -> 'BundleSplitter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+
+    def close(self) -> List[Bundle]:
+        """Finish the current bundle (if not empty) and return all bundles."""
+
+        if self._bundle is not None and self._count:
+            self._finish()
+        self._bundle = None
+
+        return self.bundles
+
+    def insert_items(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """
+        Insert entities (or refs) already built and validated elsewhere, i.e.
+        pairs of the bundle keys and the JSON of the entities (e.g. the ones
+        yielded by `parallel.iter_build`).
+        """
+
+        for key, data in items:
+            self._insert(key, data)
+
+    def _add(self, entity, type_, ref):
+        if type_ is None:
+            type_ = Bundle._get_type(entity)
+
+        data = Bundle._deserialize(entity, type_, ref)
+        self._insert(type_.type + ('_refs' if ref else 's'), data)
+
+    def _add_many(self, entities, type_, ref):
+        self.insert_items(Bundle._deserialize_many(entities, type_, ref))
+
+    def _insert(self, key, data):
+        if self._bundle is None:
+            raise ValueError('Adding to a closed splitter.')
+
+        count, size = self._measure(key, data)
+
+        if self._count and not self._fits(count, size):
+            self._finish()
+            self._start()
+            count, size = self._measure(key, data)
+
+        self._append(key, data, size)
+
+    def _fits(self, count, size):
+        return (
+            (self.max_entities is None or
+             self._count + count <= self.max_entities) and
+            (self.max_bytes is None or
+             self._size + size <= self.max_bytes)
+        )
+
+    def _measure(self, key, data):
+        # The number of new entries and the growth of the bundle after
+        # inserting the entry.
+        bundle = self._bundle
+
+        slot = bundle._find_duplicate(key, data)
+        if slot is None:
+            return 1, self._get_entry_size(key, len(json.dumps(data)))
+
+        # Duplicates may replace or be merged into existing entries, so only
+        # the difference between the old and the resolved entry counts.
+        old = bundle._entries[key][slot]
+        new = bundle._resolve_duplicate(key, slot, data)
+        if new is old:
+            return 0, 0
+        return 0, len(json.dumps(new)) - len(json.dumps(old))
+
+    def _append(self, key, data, size):
+        entries = self._bundle._entries.get(key)
+        count = len(entries) if entries else 0
+
+        self._bundle._insert(key, data)
+
+        # Duplicates don't increase the number of entries.
+        if len(self._bundle._entries[key]) > count:
+            self._count += 1
+        self._size += size
+
+    def _get_entry_size(self, key, fragment_size):
+        # The exact size of an entry within the encoded JSON of the current
+        # bundle (including any separators and the key for the first entry).
+        if self._bundle._entries.get(key):
+            return fragment_size + len(', ')
+        return fragment_size + len(f', {json.dumps(key)}: []')
+
+    def _start(self):
+        self._index += 1
+
+        with self._session.set():
+            self._bundle = Bundle(
+                **self._data,
+                external_id_salt_values=(
+                    self._external_id_salt_values + [str(self._index)]
+                ),
+            )
+
+        # Make sure that the index is ready for inserting entries directly.
+        self._bundle._ensure_index()
+
+        self._count = 0
+        self._size = len(json.dumps(self._bundle.json))
+
+    def _finish(self):
+        bundle = self._bundle
+        if self.on_bundle is None:
+            self.bundles.append(bundle)
+        else:
+            self.on_bundle(bundle)
@@ -0,0 +1,121 @@
+from heapq import merge
+from itertools import count
+from operator import itemgetter
+from threading import (
+    Lock,
+    local,
+)
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+
+from .models import Bundle
+from .models.primary.bundle import BundleSchema
+
+
+class ThreadSafeBundle(Bundle):
+    """
+    Bundle which entities can be added to by multiple threads at once.
+
+    Entities (and refs) are validated and buffered by each thread on its own,
+    i.e. without any locking, and merged into the bundle only on `finalize`,
+    which happens automatically before the bundle is read in any way (e.g.
+    before `json` or `to_bytes`). The buffers are merged in the order in which
+    the entities were added across all the threads, so the bundle ends up
+    exactly the same as a regular bundle with the entities added in the same
+    order (including the handling of any duplicates according to
+    `duplicate_policy`), while the entities passed to the bulk methods (e.g.
+    `add_sightings`) are kept together.
+
+    Only adding entities is thread-safe, i.e. reading, replacing or removing
+    entities is supposed to happen once all the threads are done adding them.
+    """
+
+    type = Bundle.type
+
+    schema = BundleSchema
+
+    def __new__(cls, *args, **kwargs):
+        # Unpickled, copied or loaded bundles bypass `__init__`, so set up the
+        # buffers right here.
+        bundle = super().__new__(cls)
+        bundle._lock = Lock()
+        bundle._local = local()
+        bundle._buffers = []
+        bundle._sequence = count()
+        return bundle
+
+    @property
+    def json(self) -> Dict[str, Any]:
+        self.finalize()
+        return Bundle.json.fget(self)
+
+    @json.setter
+    def json(self, json: Dict[str, Any]) -> None:
+        # Replacing the JSON as a whole replaces any entities added so far.
+        with self._lock:
+            self._drain()
+        Bundle.json.fset(self, json)
+
+    def finalize(self) -> None:
+        """
+        Merge the entities added by all the threads so far into the bundle.
+        """
+
+        with self._lock:
+            buffers = self._drain()
+            if not any(buffers):
+                return
+
+            Bundle._ensure_index(self)
+            for _, items in merge(*buffers, key=itemgetter(0)):
+                for key, data in items:
+                    self._insert(key, data)
+
+    def _add(self, entity, type_, ref):
+        if type_ is None:
+            type_ = self._get_type(entity)
+
+        data = self._deserialize(entity, type_, ref)
+        key = type_.type + ('_refs' if ref else 's')
+
+        self._get_buffer().append((next(self._sequence), [(key, data)]))
+
+    def _add_many(self, entities, type_, ref):
+        self.insert_items(self._deserialize_many(entities, type_, ref))
+
+    def insert_items(self, items):
+        self._get_buffer().append((next(self._sequence), list(items)))
+
+    insert_items.__doc__ = Bundle.insert_items.__doc__
+
+    def _get_buffer(self) -> List[Tuple[int, List[Tuple[str, Any]]]]:
+        # Taking the next number of a counter is atomic (it's implemented in
+        # C), so each entry of each buffer gets a unique increasing number.
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = []
+            with self._lock:
+                self._buffers.append(buffer)
+        return buffer
+
+    def _drain(self) -> List[List[Tuple[int, List[Tuple[str, Any]]]]]:
+        # Take the entries buffered so far without blocking the threads still
+        # appending to the buffers (slicing and deleting slices are atomic).
+        buffers = []
+        for buffer in self._buffers:
+            entries = buffer[:]
+            del buffer[:len(entries)]
+            buffers.append(entries)
+        return buffers
+
+    def _ensure_index(self):
+        super()._ensure_index()
+        self.finalize()
+
+    def _get_json(self, field: str) -> Dict[str, Any]:
+        self.finalize()
+        return super()._get_json(field)
@@ -0,0 +1,125 @@
+import os
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from hashlib import sha256
+from itertools import count
+from typing import Union
+from uuid import uuid4
+from weakref import WeakSet
+
+
+# Each transient ID is made up of a session's XID prefix, an entity type and
+# a 32-character lowercase hex string produced by a transient ID generator,
+# e.g. 'transient:ctim-judgement-5f3e...'. Transient IDs only have to be unique
+# within one bundle, so there is no need to make them globally unique.
+
+
+class TransientIdGenerator(ABC):
+    """Abstract base class for generators of transient IDs."""
+
+    @abstractmethod
+    def generate(self) -> str:
+        """Return a new 32-character lowercase hex string."""
+
+    def spawn(self, key: int) -> 'TransientIdGenerator':
+        """
+        Return a generator for one of several parallel tasks (e.g. batches of
+        entities built by different processes), so that the IDs don't clash
+        across the tasks. Generators producing globally unique IDs (e.g.
+        random UUIDs) can be shared by all the tasks, hence the default.
+        """
+
+        return self
+
+
+class RandomTransientIdGenerator(TransientIdGenerator):
+    """
+    Generator of random UUIDs.
+
+    Stateless, but relatively slow since each ID requires reading from the OS
+    source of randomness.
+    """
+
+    def generate(self) -> str:
+        return uuid4().hex
+
+
+class CounterTransientIdGenerator(TransientIdGenerator):
+    """
+    Generator of random per-process prefixes followed by monotonic counters.
+
+    Each process gets its own random prefix, i.e. forked child processes (on
+    Python 3.7+) and unpickled copies of the generator get new prefixes too,
+    so the IDs don't clash across processes.
+    """
+
+    def __init__(self):
+        self._reset()
+        _COUNTER_TRANSIENT_ID_GENERATORS.add(self)
+
+    def generate(self) -> str:
+        # Getting the next value of a counter is atomic, i.e. thread-safe.
+        return f'{self._prefix}{next(self._counter):016x}'
+
+    def _reset(self) -> None:
+        self._prefix = os.urandom(8).hex()
+        self._counter = count()
+
+    def spawn(self, key: int) -> 'CounterTransientIdGenerator':
+        # Don't rely on resetting the prefix on forking only.
+        return self.__class__()
+
+    def __reduce__(self):
+        return self.__class__, ()
+
+
+class DeterministicTransientIdGenerator(TransientIdGenerator):
+    """
+    Generator of reproducible sequences of IDs for the same seeds.
+
+    Useful for benchmarks and golden-file tests. Notice that generators with
+    the same seeds in different processes produce the same IDs, so derive a
+    separate generator for each parallel task with `spawn`.
+    """
+
+    def __init__(self, seed: Union[int, str] = 0):
+        self.seed = seed
+        self._prefix = sha256(bytes(str(seed), 'utf-8')).hexdigest()[:16]
+        self._counter = count()
+
+    def generate(self) -> str:
+        return f'{self._prefix}{next(self._counter):016x}'
+
+    def reset(self) -> None:
+        """Start the sequence of IDs from the very beginning."""
+        self._counter = count()
+
+    def spawn(self, key: int) -> 'DeterministicTransientIdGenerator':
+        # Derive the seed from the key rather than from the process, so that
+        # the IDs are still reproducible no matter which process runs which
+        # task.
+        return self.__class__(seed=f'{self.seed}/{key}')
+
+    def __reduce__(self):
+        return self.__class__, (self.seed,)
+
+
+def get_default_transient_id_generator() -> TransientIdGenerator:
+    return _DEFAULT_TRANSIENT_ID_GENERATOR
+
+
+def _reset_counter_transient_id_generators() -> None:
+    for generator in _COUNTER_TRANSIENT_ID_GENERATORS:
+        generator._reset()
+
+
+_COUNTER_TRANSIENT_ID_GENERATORS = WeakSet()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(
+        after_in_child=_reset_counter_transient_id_generators,
+    )
+
+_DEFAULT_TRANSIENT_ID_GENERATOR = CounterTransientIdGenerator()
@@ -0,0 +1,220 @@
+from inspect import isabstract
+from typing import (
+    Any,
+    BinaryIO,
+    Iterator,
+    List,
+    Tuple,
+    Type,
+    Union,
+)
+
+from marshmallow.exceptions import (
+    ValidationError as MarshmallowValidationError
+)
+
+from .decoding import iter_object
+from .models import (
+    Bundle,
+    Verdict,
+)
+from .models.entity import (
+    BaseEntity,
+    PrimaryEntity,
+    _iter_error_messages,
+)
+from .models.fields import (
+    EntityField,
+    ListField,
+    UnionField,
+)
+from .parallel import (
+    DEFAULT_BATCH_SIZE,
+    iter_batches,
+    map_batches,
+)
+
+# A path to a value within a JSON document, e.g. ('sightings', 0, 'count').
+Path = Tuple[Union[str, int], ...]
+
+# The fields (besides `type`) of primary entities populated automatically.
+_DEFAULT_FIELDS = ('schema_version', 'id')
+_AUTOMATIC_FIELDS = {
+    Verdict: ('judgement_id',),
+}
+
+
+def format_path(path: Path) -> str:
+    """Format a path as a JSONPath, e.g. '$.sightings[0].count'."""
+
+    return '$' + ''.join(
+        f'[{key}]' if isinstance(key, int) else f'.{key}' for key in path
+    )
+
+
+def iter_entity_errors(
+    type_: Type[BaseEntity],
+    json: Any,
+    path: Path = (),
+) -> Iterator[Tuple[Path, str]]:
+    """
+    Validate CTIM JSON of an entity (including all the nested entities) and
+    yield the errors found (if any) along with the paths to the values.
+    """
+
+    if not isinstance(json, dict):
+        yield path, f'Not a valid CTIM {type_.__name__}.'
+        return
+
+    data = dict(json)
+
+    if issubclass(type_, PrimaryEntity):
+        # These fields are populated automatically, so they aren't a part of
+        # the schemas of entities.
+        if data.pop('type', type_.type) != type_.type:
+            yield path + ('type',), f'Must be equal to {type_.type!r}.'
+        for field_name in _AUTOMATIC_FIELDS.get(type_, _DEFAULT_FIELDS):
+            if not isinstance(data.pop(field_name, ''), str):
+                yield path + (field_name,), 'Not a valid string.'
+
+    # Nested entities are expected to be entities rather than JSON, so wrap
+    # them into entities (after validating them separately).
+    errors = []
+    for field_name, field in type_._schema.declared_fields.items():
+        if field_name in data:
+            data[field_name] = _wrap(
+                field, data[field_name], path + (field_name,), errors,
+            )
+    yield from errors
+
+    try:
+        type_._get_load()(data)
+    except MarshmallowValidationError as error:
+        for error_path, message in _iter_error_messages(error.messages):
+            yield path + error_path, message
+
+
+class _Ref(PrimaryEntity):
+    """Ref to an entity of any type (e.g. a relationship source)."""
+
+    __slots__ = ()
+
+    def _generate_external_id_seed_values(self):
+        yield from ()
+
+
+def _wrap(field, value, path, errors):
+    if isinstance(field, EntityField):
+        if field.attr_name == 'id':
+            # Refs to entities are just their IDs.
+            if isinstance(value, str):
+                type_ = _Ref if isabstract(field.type) else field.type
+                return type_._from_json({'id': value})
+            return value
+
+        if isinstance(value, dict):
+            errors.extend(iter_entity_errors(field.type, value, path))
+            return field.type._from_json(value)
+        return value
+
+    if isinstance(field, ListField) and isinstance(value, list):
+        return [
+            _wrap(field.inner, item, path + (index,), errors)
+            for index, item in enumerate(value)
+        ]
+
+    if (
+        isinstance(field, UnionField) and
+        field.dispatch is not None and
+        isinstance(value, dict)
+    ):
+        # Pick the very first candidate accepting the value, or report the
+        # errors of the one closest to accepting it.
+        best_type, best_errors = None, None
+        for candidate in field.candidates:
+            candidate_errors = list(
+                iter_entity_errors(candidate.type, value, path)
+            )
+            if not candidate_errors:
+                return candidate.type._from_json(value)
+            if best_errors is None or len(candidate_errors) < len(best_errors):
+                best_type, best_errors = candidate.type, candidate_errors
+        errors.extend(best_errors)
+        return best_type._from_json(value)
+
+    return value
+
+
+class BundleValidator:
+    """
+    Validator of CTIM bundle files streaming them, i.e. without loading the
+    whole files into memory.
+
+    Entities (and refs) are validated in batches of `batch_size` either in
+    the current process or by a pool of `workers` processes (if more than
+    one) within the current session and with the current validation engine.
+    Errors are reported in the order of the file though. The header of the
+    bundle (i.e. all the fields except the lists of entities) is validated
+    at the very end.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        for name, value in [('workers', workers),
+                            ('batch_size', batch_size)]:
+            if not (isinstance(value, int) and value > 0):
+                raise ValueError(f'{name!r} must be a positive integer.')
+
+        self.workers = workers
+        self.batch_size = batch_size
+
+        # The number of entities (and refs) validated so far.
+        self.count = 0
+
+    def iter_errors(self, fp: BinaryIO) -> Iterator[Tuple[Path, str]]:
+        """
+        Validate a bundle file (either text or binary) and yield the errors
+        found (if any) along with the paths to the values.
+
+        Raise `ValueError` on invalid JSON.
+        """
+
+        header = {}
+
+        def iter_items():
+            for path, value in iter_object(fp, expand=Bundle._types):
+                if len(path) == 1:
+                    header[path[0]] = value
+                else:
+                    self.count += 1
+                    yield path, value
+
+        for errors in map_batches(
+            _validate_batch,
+            iter_batches(iter_items(), self.batch_size),
+            self.workers,
+        ):
+            yield from errors
+
+        yield from iter_entity_errors(Bundle, header)
+
+
+def _validate_batch(
+    batch: List[Tuple[Path, Any]],
+) -> List[Tuple[Path, str]]:
+    errors = []
+
+    for path, value in batch:
+        key = path[0]
+        if key.endswith('_refs'):
+            if not isinstance(value, str):
+                errors.append((path, 'Not a valid string.'))
+        else:
+            errors.extend(
+                iter_entity_errors(Bundle._types[key], value, path)
+            )
+
+    return errors
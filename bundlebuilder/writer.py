@@ -0,0 +1,127 @@
+import json
+from shutil import copyfileobj
+from tempfile import TemporaryFile
+from typing import (
+    Any,
+    Iterable,
+    TextIO,
+    Tuple,
+)
+
+from .models import Bundle
+from .models.primary.bundle import AddEntitiesMixin
+
+
+class BundleWriter(AddEntitiesMixin):
+    """
+    Writer of bundles streaming their JSON straight to text files (or any
+    other file-like objects, e.g. sockets wrapped with `socket.makefile`).
+
+    The header of a bundle (i.e. all the fields except the lists of entities)
+    is written first, then the entities are written right away as they are
+    added, so the memory used doesn't depend on the number of entities. The
+    entities of the very first type added are written directly to the file,
+    while the entities of any other types are spooled to temporary files until
+    the writer is closed.
+
+    The output is exactly the same as `json.dumps(bundle.json)` of a bundle
+    with the same entities added in the same order. Notice that, unlike
+    bundles, writers don't detect any duplicate entities, since that would
+    require keeping all the IDs and XIDs added in memory.
+    """
+
+    def __init__(self, fp: TextIO, **data):
+        entity_keys = [key for key in data if key in Bundle._types]
+        if entity_keys:
+            raise ValueError(
+                'Entities must be added to the writer one by one rather than '
+                f'passed to it: {", ".join(map(repr, entity_keys))}.'
+            )
+
+        # Validate the header and populate any missing fields of the bundle.
+        self.bundle = Bundle(**data)
+
+        self._fp = fp
+        self._current_key = None
+        self._spools = {}
+        self._closed = False
+
+    def __enter__(self) -> 'BundleWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard_spools()
+
+    def close(self) -> None:
+        """Finish writing the bundle (doesn't close the underlying file)."""
+
+        if self._closed:
+            return
+
+        if self._current_key is None:
+            self._fp.write(json.dumps(self.bundle.json))
+        else:
+            self._fp.write(']')
+            for key, spool in self._spools.items():
+                self._fp.write(f', {json.dumps(key)}: [')
+                spool.seek(0)
+                copyfileobj(spool, self._fp)
+                self._fp.write(']')
+            self._fp.write('}')
+
+        self._discard_spools()
+        self._closed = True
+
+    def insert_items(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """
+        Write entities (or refs) already built and validated elsewhere, i.e.
+        pairs of the bundle keys and the JSON of the entities (e.g. the ones
+        yielded by `parallel.iter_build`).
+        """
+
+        for key, data in items:
+            self._write(key, data)
+
+    def _add(self, entity, type_, ref):
+        if type_ is None:
+            type_ = Bundle._get_type(entity)
+
+        data = Bundle._deserialize(entity, type_, ref)
+        self._write(type_.type + ('_refs' if ref else 's'), data)
+
+    def _add_many(self, entities, type_, ref):
+        self.insert_items(Bundle._deserialize_many(entities, type_, ref))
+
+    def _write(self, key: str, data: Any) -> None:
+        if self._closed:
+            raise ValueError('Writing to a closed writer.')
+
+        fragment = json.dumps(data)
+
+        if key == self._current_key:
+            self._fp.write(f', {fragment}')
+            return
+
+        if self._current_key is None:
+            header = json.dumps(self.bundle.json)
+            # Leave the header open (i.e. without the closing brace).
+            self._fp.write(f'{header[:-1]}, {json.dumps(key)}: [{fragment}')
+            self._current_key = key
+            return
+
+        spool = self._spools.get(key)
+        if spool is None:
+            spool = self._spools[key] = TemporaryFile(
+                'w+', encoding='utf-8',
+            )
+            spool.write(fragment)
+        else:
+            spool.write(f', {fragment}')
+
+    def _discard_spools(self) -> None:
+        for spool in self._spools.values():
+            spool.close()
+        self._spools.clear()
@@ -42,12 +42,20 @@ AUTHOR = 'Cisco Security'
 
 LICENSE = 'MIT'
 
-PACKAGES = setuptools.find_packages(exclude=['tests', 'tests.*'])
+PACKAGES = setuptools.find_packages(
+    exclude=['tests', 'tests.*', 'benchmarks', 'benchmarks.*'],
+)
 
 PYTHON_REQUIRES = '>=3.6'
 
 INSTALL_REQUIRES = read_requirements()
 
+ENTRY_POINTS = {
+    'console_scripts': [
+        'bundlebuilder = bundlebuilder.cli:main',
+    ],
+}
+
 KEYWORDS = [
     'cisco', 'security',
     'threat', 'response',
@@ -79,6 +87,7 @@ setuptools.setup(
     packages=PACKAGES,
     python_requires=PYTHON_REQUIRES,
     install_requires=INSTALL_REQUIRES,
+    entry_points=ENTRY_POINTS,
     keywords=KEYWORDS,
     classifiers=CLASSIFIERS,
 )
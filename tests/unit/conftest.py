@@ -0,0 +1,16 @@
+from pytest import fixture
+
+from bundlebuilder.constants import VALIDATION_ENGINE_CHOICES
+from bundlebuilder.models.entity import (
+    get_validation_engine,
+    set_validation_engine,
+)
+
+
+@fixture(autouse=True, params=VALIDATION_ENGINE_CHOICES)
+def validation_engine(request):
+    # Make sure that all the validation engines behave exactly the same way.
+    previous_engine = get_validation_engine()
+    set_validation_engine(request.param)
+    yield request.param
+    set_validation_engine(previous_engine)
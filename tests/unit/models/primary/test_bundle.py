@@ -1,3 +1,6 @@
+import io
+import json
+
 from pytest import raises as assert_raises
 
 from bundlebuilder.constants import (
@@ -18,9 +21,12 @@ from bundlebuilder.models import (
     Indicator,
     Relationship,
     Verdict,
+    ExternalReference,
 )
+from bundlebuilder.models.primary.bundle import AddEntitiesMixin
 from bundlebuilder.session import Session
 from tests.unit.utils import (
+    make_judgement,
     mock_transient_id,
     mock_external_id,
 )
@@ -204,3 +210,404 @@ def test_bundle_validation_succeeds():
         'external_ids': [mock_external_id(session.external_id_prefix, type_)],
         **bundle_data
     }
+
+
+def test_bundle_with_invalid_duplicate_policy_fails():
+    with assert_raises(ValueError):
+        Bundle(duplicate_policy='keep_all')
+
+
+def test_bundle_add_with_invalid_entity_fails():
+    bundle = Bundle()
+
+    with assert_raises(ValidationError) as exc_info:
+        bundle.add(Observable(type='ip', value='127.0.0.1'))
+
+    assert exc_info.value.args == ([
+        'Not a valid CTIM Indicator, Judgement, Relationship, Sighting or '
+        'Verdict.'
+    ],)
+
+
+def test_bundle_get_entity_and_remove_and_replace():
+    bundle = Bundle()
+
+    judgement = make_judgement()
+    other_judgement = make_judgement('127.0.0.2')
+    relationship = Relationship(
+        relationship_type='based-on',
+        source_ref=judgement,
+        target_ref=other_judgement,
+    )
+
+    bundle.add(judgement)
+    bundle.add(other_judgement)
+    bundle.add(judgement, ref=True)
+    bundle.add_relationship(relationship)
+
+    assert bundle.json['judgements'] == [judgement.json, other_judgement.json]
+    assert bundle.json['judgement_refs'] == [judgement.id]
+
+    assert bundle.get_entity(judgement) is judgement.json
+    assert bundle.get_entity(judgement.id) is judgement.json
+    assert bundle.get_entity(judgement.external_ids[0]) is judgement.json
+    assert bundle.get_entity('transient:unknown') is None
+    assert bundle.get_entity('transient:unknown', {}) == {}
+
+    # Refs to the entity are removed along with it.
+    bundle.remove(judgement.external_ids[0])
+
+    assert bundle.json['judgements'] == [other_judgement.json]
+    assert 'judgement_refs' not in bundle.json
+    assert bundle.judgements == [other_judgement.json]
+    assert bundle.get_entity(judgement) is None
+
+    with assert_raises(KeyError):
+        bundle.remove(judgement)
+
+    new_judgement = make_judgement('127.0.0.3')
+    bundle.add(judgement)
+    bundle.replace(other_judgement, new_judgement)
+
+    assert bundle.json['judgements'] == [new_judgement.json, judgement.json]
+    assert bundle.get_entity(other_judgement) is None
+    assert bundle.get_entity(new_judgement.id) is new_judgement.json
+
+    with assert_raises(ValueError):
+        bundle.replace(new_judgement, judgement)
+
+    with assert_raises(KeyError):
+        bundle.replace(other_judgement, new_judgement)
+
+    with assert_raises(ValidationError):
+        bundle.replace(new_judgement, relationship)
+
+    bundle.remove(relationship)
+    assert 'relationships' not in bundle.json
+
+
+def test_bundle_keeps_distinct_entities_sharing_some_external_ids():
+    def make_sighting(count, values):
+        return Sighting(
+            confidence='High',
+            count=count,
+            observed_time=ObservedTime(start_time='2019-03-01T22:26:29.229Z'),
+            observables=[Observable(type='ip', value=value)
+                         for value in values],
+            timestamp='2019-03-01T22:26:29.229Z',
+            title='Seen on the network',
+        )
+
+    sightings = [
+        make_sighting(1, ['1.1.1.1', '2.2.2.2']),
+        make_sighting(7, ['2.2.2.2', '3.3.3.3']),
+    ]
+
+    # The sightings share the XID of the common observable only.
+    assert len(
+        set(sightings[0].external_ids) & set(sightings[1].external_ids)
+    ) == 1
+
+    for duplicate_policy in ['keep_first', 'keep_last', 'merge']:
+        bundle = Bundle(duplicate_policy=duplicate_policy)
+        bundle.add_sighting(sightings[0])
+        bundle.add_sighting(sightings[1])
+
+        assert bundle.json['sightings'] == [
+            sighting.json for sighting in sightings
+        ]
+
+    bundle = Bundle()
+    bundle.add_sightings(sightings)
+    loaded_bundle = Bundle.load(io.StringIO(json.dumps(bundle.json)))
+
+    assert loaded_bundle.json['sightings'] == bundle.json['sightings']
+
+    # Entities with exactly the same XIDs are still duplicates though.
+    bundle.add_sighting(make_sighting(3, ['2.2.2.2', '1.1.1.1']))
+
+    assert len(bundle.json['sightings']) == 2
+
+
+def test_bundle_duplicate_policies():
+    judgement = make_judgement(
+        external_references=[
+            ExternalReference(source_name='first', url='https://first.com'),
+        ],
+    )
+    # Same XIDs, but a different transient ID.
+    duplicate = make_judgement(
+        reason='Duplicate',
+        external_references=[
+            ExternalReference(source_name='last', url='https://last.com'),
+        ],
+    )
+    other_judgement = make_judgement('127.0.0.2')
+
+    assert duplicate.external_ids == judgement.external_ids
+    assert duplicate.id != judgement.id
+
+    def build(duplicate_policy):
+        bundle = Bundle(duplicate_policy=duplicate_policy)
+        bundle.add_judgement(judgement)
+        bundle.add_judgement(other_judgement)
+        bundle.add_judgement(duplicate)
+        bundle.add_judgement(duplicate, ref=True)
+        bundle.add_judgement(judgement, ref=True)
+        return bundle
+
+    bundle = build('keep_first')
+    assert bundle.json['judgements'] == [judgement.json, other_judgement.json]
+    assert bundle.get_entity(duplicate.id) is judgement.json
+    assert bundle.json['judgement_refs'] == [duplicate.id, judgement.id]
+
+    bundle = build('keep_last')
+    assert bundle.json['judgements'] == [duplicate.json, other_judgement.json]
+    assert bundle.get_entity(judgement.id) is duplicate.json
+
+    bundle = build('merge')
+    merged = bundle.json['judgements'][0]
+    assert bundle.json['judgements'] == [merged, other_judgement.json]
+    assert merged == {
+        **judgement.json,
+        'reason': 'Duplicate',
+        'external_references': (
+            judgement.json['external_references'] +
+            duplicate.json['external_references']
+        ),
+    }
+    # The JSON of the original entity is left intact.
+    assert 'reason' not in judgement.json
+
+    # Both the refs are removed along with the merged entity.
+    bundle.remove(duplicate)
+    assert bundle.json['judgements'] == [other_judgement.json]
+    assert 'judgement_refs' not in bundle.json
+
+
+def test_bundle_index_is_built_from_initial_json():
+    judgement = make_judgement()
+
+    bundle = Bundle(judgements=[judgement])
+    bundle.add_judgement(make_judgement())
+
+    assert bundle.json['judgements'] == [judgement.json]
+
+    bundle = Bundle.from_trusted(bundle.json)
+    bundle.add_judgement(make_judgement('127.0.0.2'))
+
+    assert len(bundle.json['judgements']) == 2
+    assert bundle.get_entity(judgement) is judgement.json
+
+
+def test_bundle_add_many_with_invalid_entities_fails():
+    judgement = make_judgement()
+
+    bundle = Bundle()
+
+    with assert_raises(ValidationError) as exc_info:
+        bundle.add_judgements(
+            [judgement, None, Verdict.from_judgement(judgement)]
+        )
+
+    assert exc_info.value.args == ({
+        1: ['Field may not be null.'],
+        2: ['Not a valid CTIM Judgement.'],
+    },)
+
+    with assert_raises(ValidationError) as exc_info:
+        bundle.add_many(
+            [judgement, Observable(type='ip', value='127.0.0.1')],
+            ref=True,
+        )
+
+    assert exc_info.value.args == ({
+        1: [
+            'Not a valid CTIM Indicator, Judgement, Relationship, Sighting '
+            'or Verdict.'
+        ],
+    },)
+
+    # Nothing is added if any of the entities is invalid.
+    assert 'judgements' not in bundle.json
+    assert 'judgement_refs' not in bundle.json
+
+
+def test_bundle_add_many_is_equivalent_to_adding_one_by_one():
+    judgements = [
+        make_judgement(f'127.0.0.{index}') for index in range(1, 4)
+    ]
+    verdicts = [Verdict.from_judgement(judgement) for judgement in judgements]
+    relationship = Relationship(
+        relationship_type='based-on',
+        source_ref=judgements[0],
+        target_ref=judgements[1],
+    )
+
+    expected = Bundle()
+    for judgement in judgements + judgements[:1]:
+        expected.add_judgement(judgement)
+    for verdict in verdicts:
+        expected.add_verdict(verdict)
+    expected.add_relationship(relationship)
+    expected.add_relationship(relationship, ref=True)
+
+    bundle = Bundle()
+    bundle.add_judgements(judgements + judgements[:1])
+    bundle.add_verdicts(verdicts)
+    bundle.add_many([relationship])
+    bundle.add_relationships(iter([relationship]), ref=True)
+
+    assert bundle.json == {**expected.json, 'id': bundle.id}
+
+    bundle = Bundle()
+    bundle.add_many(judgements + verdicts + [relationship])
+    bundle.add_many([relationship], ref=True)
+
+    assert bundle.json == {**expected.json, 'id': bundle.id}
+
+
+def test_bundle_keeps_relationships_with_same_external_ids():
+    judgements = [
+        make_judgement(f'127.0.0.{index}') for index in range(1, 4)
+    ]
+    relationships = [
+        Relationship(
+            relationship_type='based-on',
+            source_ref=judgements[0],
+            target_ref=judgement,
+        )
+        for judgement in judgements[1:]
+    ]
+
+    # Relationships of the same type always share the same XIDs.
+    assert relationships[0].external_ids == relationships[1].external_ids
+
+    bundle = Bundle()
+    for relationship in relationships + relationships[:1]:
+        bundle.add_relationship(relationship)
+
+    assert bundle.json['relationships'] == [
+        relationship.json for relationship in relationships
+    ]
+
+
+def test_bundle_to_bytes_is_equivalent_to_encoding_json():
+    bundle = Bundle(
+        duplicate_policy='keep_last',
+        description='Démo',
+        judgements=[make_judgement('127.0.0.4')],
+    )
+
+    def assert_to_bytes_is_equivalent():
+        assert bundle.to_bytes() == json.dumps(
+            bundle.json, ensure_ascii=False, separators=(',', ':'),
+        ).encode('utf-8')
+
+    assert_to_bytes_is_equivalent()
+
+    judgement = make_judgement()
+    other_judgement = make_judgement('127.0.0.2')
+
+    bundle.add_judgements([judgement, other_judgement])
+    bundle.add(judgement, ref=True)
+    assert_to_bytes_is_equivalent()
+
+    # The entries already encoded are reused.
+    fragments = dict(bundle._fragments)
+    bundle.add(make_judgement('127.0.0.3'))
+    assert_to_bytes_is_equivalent()
+    assert all(
+        bundle._fragments[slot] is fragment
+        for slot, fragment in fragments.items()
+    )
+
+    # The entries replaced are encoded again.
+    bundle.add(make_judgement(priority=10))
+    assert_to_bytes_is_equivalent()
+    assert b'"priority":10' in bundle.to_bytes()
+
+    bundle.replace(other_judgement, make_judgement('127.0.0.5'))
+    assert_to_bytes_is_equivalent()
+
+    bundle.remove(judgement)
+    assert_to_bytes_is_equivalent()
+
+    bundle.json = {**bundle.json, 'judgements': []}
+    assert_to_bytes_is_equivalent()
+
+
+def test_bundle_load_and_iter_load_keep_ids_and_external_ids():
+    judgement = make_judgement()
+    other_judgement = make_judgement('127.0.0.2')
+    relationship = Relationship(
+        relationship_type='based-on',
+        source_ref=judgement,
+        target_ref=other_judgement,
+    )
+
+    bundle = Bundle(description='Démo', judgements=[judgement])
+    bundle.add_judgement(other_judgement)
+    bundle.add_judgement(judgement, ref=True)
+    bundle.add_relationship(relationship)
+
+    document = json.dumps(bundle.json)
+
+    for fp in [io.StringIO(document), io.BytesIO(bundle.to_bytes())]:
+        loaded_bundle = Bundle.load(fp)
+
+        assert loaded_bundle.json == bundle.json
+        assert list(loaded_bundle.json) == list(bundle.json)
+        assert loaded_bundle.get_entity(judgement.id) == judgement.json
+
+    entities = list(Bundle.iter_load(io.StringIO(document)))
+
+    assert [type(entity) for entity in entities] == [
+        Judgement, Judgement, Relationship,
+    ]
+    for entity, expected_entity in zip(
+        entities, [judgement, other_judgement, relationship],
+    ):
+        assert entity.json == expected_entity.json
+        assert entity.id == expected_entity.id
+        assert entity.external_ids == expected_entity.external_ids
+
+
+def test_bundle_load_with_duplicates_and_invalid_entities():
+    judgement = make_judgement()
+    document = json.dumps({
+        'judgements': [judgement.json, {**judgement.json, 'priority': 10}],
+    })
+
+    bundle = Bundle.load(io.StringIO(document), duplicate_policy='keep_last')
+    assert bundle.json['judgements'] == [{**judgement.json, 'priority': 10}]
+
+    with assert_raises(ValueError):
+        Bundle.load(io.StringIO('{"judgements": ["transient:judgement"]}'))
+
+    with assert_raises(ValueError):
+        list(Bundle.iter_load(io.StringIO('{"judgements": [1]}')))
+
+    with assert_raises(ValueError):
+        Bundle.load(io.StringIO('{}'), duplicate_policy='keep_all')
+
+
+def test_add_entities_mixin_requires_add_methods():
+    class Collector(AddEntitiesMixin):
+        def _add(self, entity, type_, ref):
+            pass
+
+    with assert_raises(TypeError):
+        Collector()
+
+    class ListCollector(Collector):
+        def __init__(self):
+            self.items = []
+
+        def _add_many(self, entities, type_, ref):
+            self.items.extend(entities)
+
+    collector = ListCollector()
+    collector.add_judgements([1, 2])
+
+    assert collector.items == [1, 2]
@@ -1,3 +1,6 @@
+import datetime as dt
+import json
+
 from pytest import raises as assert_raises
 
 from bundlebuilder.constants import (
@@ -19,6 +22,7 @@ from bundlebuilder.models import (
     Observable,
     ValidTime,
 )
+from bundlebuilder.session import Session
 from tests.unit.utils import (
     mock_transient_id,
     mock_external_id,
@@ -127,3 +131,182 @@ def test_judgement_validation_succeeds():
         ],
         **judgement_data
     }
+
+
+def test_judgement_from_trusted_succeeds():
+    judgement_data = {
+        'confidence': 'Medium',
+        'disposition': 3,
+        'disposition_name': 'Suspicious',
+        'observable': Observable(type='domain', value='cisco.com'),
+        'priority': 50,
+        'severity': 'Medium',
+        'valid_time': ValidTime(start_time=utc_now_iso()),
+        'external_ids': ['judgement-1'],
+        'timestamp': utc_now_iso(),
+    }
+
+    judgement = Judgement(**judgement_data)
+
+    trusted = Judgement.from_trusted({
+        **judgement_data,
+        'observable': judgement.observable,
+        'valid_time': judgement.valid_time,
+    })
+
+    assert trusted.id != judgement.id
+    assert trusted.json == {**judgement.json, 'id': trusted.id}
+
+    # Rebuilding an entity from its own JSON doesn't duplicate any XIDs.
+    assert Judgement.from_trusted(judgement.json).json == {
+        **judgement.json,
+        'id': mock_transient_id(DEFAULT_SESSION_EXTERNAL_ID_PREFIX,
+                                'judgement'),
+    }
+
+
+def test_judgement_keeps_external_ids_specified_as_is():
+    judgement = Judgement(
+        confidence='Medium',
+        disposition=3,
+        disposition_name='Suspicious',
+        observable=Observable(type='domain', value='cisco.com'),
+        priority=50,
+        severity='Medium',
+        valid_time=ValidTime(),
+        external_ids=['judgement-1', 'judgement-1'],
+    )
+
+    generated, *external_ids = judgement.external_ids
+    assert external_ids == ['judgement-1', 'judgement-1']
+
+    # Only the XIDs generated before are skipped when rebuilding the entity.
+    assert Judgement.from_trusted(judgement.json).external_ids == [
+        generated, 'judgement-1', 'judgement-1',
+    ]
+
+
+def test_judgement_validation_levels():
+    judgement_data = {
+        'confidence': 'Unbelievable',
+        'disposition': 3,
+        'disposition_name': 'Malicious',
+        'observable': Observable(type='domain', value='cisco.com'),
+        'priority': PRIORITY_MAX_VALUE + 1,
+        'severity': 'Medium',
+        'valid_time': ValidTime(),
+    }
+
+    session = Session(
+        external_id_prefix=DEFAULT_SESSION_EXTERNAL_ID_PREFIX,
+        source=DEFAULT_SESSION_SOURCE,
+        source_uri=DEFAULT_SESSION_SOURCE_URI,
+        validation_level='structural',
+    )
+
+    with session.set():
+        # The values are invalid but the structure is valid.
+        judgement = Judgement(**judgement_data)
+
+        assert judgement.confidence == 'Unbelievable'
+        assert judgement.observable == {'type': 'domain', 'value': 'cisco.com'}
+
+        with assert_raises(ValidationError) as exc_info:
+            Judgement(**{**judgement_data, 'observable': 'cisco.com'})
+
+        assert exc_info.value.args == ({
+            'observable': ['Not a valid CTIM Observable.'],
+        },)
+
+    with session._replace(validation_level='off').set():
+        judgement = Judgement(**{**judgement_data, 'greeting': '¡Hola!'})
+
+        assert judgement.greeting == '¡Hola!'
+        assert judgement.observable == {'type': 'domain', 'value': 'cisco.com'}
+        assert judgement.valid_time == {}
+
+
+def test_judgement_normalizes_datetimes_with_validation_off():
+    session = Session(
+        external_id_prefix='ctim',
+        source='src',
+        source_uri='uri',
+        validation_level='off',
+    )
+
+    judgement_data = {
+        'confidence': 'High',
+        'disposition': 2,
+        'disposition_name': 'Malicious',
+        'priority': 90,
+        'severity': 'Medium',
+    }
+
+    with session.set():
+        judgement = Judgement(
+            **judgement_data,
+            observable={'type': 'domain', 'value': 'cisco.com'},
+            valid_time=ValidTime(start_time=1577836800),
+            timestamp=dt.datetime(2020, 1, 1),
+        )
+
+        assert judgement.timestamp == '2020-01-01T00:00:00.000Z'
+        assert judgement.valid_time == {
+            'start_time': '2020-01-01T00:00:00.000Z',
+        }
+        assert json.loads(judgement.to_bytes()) == judgement.json
+
+        # Nothing is checked, so invalid datetimes are kept as is.
+        assert Judgement(
+            **judgement_data,
+            observable={'type': 'domain', 'value': 'cisco.com'},
+            timestamp='yesterday',
+        ).timestamp == 'yesterday'
+
+    # The external IDs are the same as for the normalized values.
+    with session._replace(validation_level='full').set():
+        expected_judgement = Judgement(
+            **judgement_data,
+            observable=Observable(type='domain', value='cisco.com'),
+            valid_time=ValidTime(start_time='2020-01-01T00:00:00.000Z'),
+            timestamp='2020-01-01T00:00:00.000Z',
+        )
+
+    assert judgement.external_ids == expected_judgement.external_ids
+
+
+def test_judgement_build_many():
+    observable = Observable(type='domain', value='cisco.com')
+    valid_time = ValidTime(start_time=utc_now_iso())
+
+    rows = [
+        {
+            'confidence': 'Medium',
+            'disposition': disposition,
+            'disposition_name': disposition_name,
+            'observable': observable,
+            'priority': 50,
+            'severity': 'Medium',
+            'valid_time': valid_time,
+        }
+        for disposition, disposition_name in [
+            (1, 'Clean'),
+            (2, 'Clean'),
+            (3, 'Suspicious'),
+            (4, 'Common'),
+        ]
+    ]
+    rows[3]['external_references'] = [object()]
+
+    judgements, failures = Judgement.build_many(rows)
+
+    assert [judgement.json for judgement in judgements] == [
+        {**Judgement(**rows[0]).json, 'id': judgements[0].id},
+        {**Judgement(**rows[2]).json, 'id': judgements[1].id},
+    ]
+
+    assert failures == [
+        (1, (), 'Not a consistent disposition name for the specified '
+                "disposition number. Must be 'Malicious'."),
+        (3, ('external_references', 0), 'Not a valid CTIM ExternalReference.'),
+    ]
@@ -125,3 +125,37 @@ def test_relationship_validation_succeeds():
         ],
         **relationship_data
     }
+
+
+def test_relationship_build_many():
+    judgement = Judgement(
+        confidence='Low',
+        disposition=4,
+        disposition_name='Common',
+        observable=Observable(type='domain', value='cisco.com'),
+        priority=25,
+        severity='Low',
+        valid_time=ValidTime(),
+    )
+
+    rows = [
+        {
+            'relationship_type': 'based-on',
+            'source_ref': judgement,
+            'target_ref': judgement,
+        },
+        {},
+    ]
+
+    relationships, failures = Relationship.build_many(rows)
+
+    assert [relationship.json for relationship in relationships] == [
+        {**Relationship(**rows[0]).json, 'id': relationships[0].id},
+    ]
+    assert relationships[0].source_ref_external_ids == judgement.external_ids
+
+    assert failures == [
+        (1, ('relationship_type',), 'Missing data for required field.'),
+        (1, ('source_ref',), 'Missing data for required field.'),
+        (1, ('target_ref',), 'Missing data for required field.'),
+    ]
@@ -1,3 +1,9 @@
+import copy
+import inspect
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from marshmallow import fields
 from pytest import raises as assert_raises
 
 from bundlebuilder.constants import (
@@ -6,12 +12,22 @@ from bundlebuilder.constants import (
     DEFAULT_SESSION_SOURCE_URI,
     DEFAULT_SESSION_EXTERNAL_ID_PREFIX,
 )
+from bundlebuilder import models
 from bundlebuilder.exceptions import SchemaError
+from bundlebuilder.models import (
+    Bundle,
+    Judgement,
+    Observable,
+    Relationship,
+    ValidTime,
+)
 from bundlebuilder.models.entity import (
     EntitySchema,
     BaseEntity,
     PrimaryEntity,
     SecondaryEntity,
+    get_validation_engine,
+    use_validation_engine,
 )
 from bundlebuilder.session import (
     get_session,
@@ -138,3 +154,205 @@ def test_secondary_entity_subclass_validation_with_empty_schema_succeeds():
     good = Good()
 
     assert good.json == {}
+
+
+def test_entity_schema_is_instantiated_only_once_per_class():
+    class GoodSchema(EntitySchema):
+        pass
+
+    class Good(SecondaryEntity):
+        schema = GoodSchema
+
+    assert isinstance(Good._schema, GoodSchema)
+
+    schema = Good._schema
+
+    Good()
+    Good()
+
+    assert Good._schema is schema
+
+
+def test_entity_schema_and_signature_are_computed_lazily():
+    instances = []
+
+    class GoodSchema(EntitySchema):
+        name = fields.String()
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            instances.append(self)
+
+    class Good(SecondaryEntity):
+        schema = GoodSchema
+
+    assert instances == []
+
+    assert list(inspect.signature(Good).parameters) == ['name']
+    assert instances == [Good._schema]
+    # Both are stored in the class itself from now on.
+    assert Good.__dict__['_schema'] is Good._schema
+    assert isinstance(Good.__dict__['__signature__'], inspect.Signature)
+
+
+def test_entity_to_bytes_is_cached_until_json_is_replaced():
+    class GoodSchema(EntitySchema):
+        pass
+
+    class Good(SecondaryEntity):
+        schema = GoodSchema
+
+    good = Good()
+
+    data = good.to_bytes()
+
+    assert data == b'{}'
+    assert good.to_bytes() is data
+
+    good.json = {'title': 'Good'}
+
+    assert good.to_bytes() == b'{"title":"Good"}'
+
+
+def test_entity_pickling_and_copying():
+    class GoodSchema(EntitySchema):
+        pass
+
+    class Good(SecondaryEntity):
+        schema = GoodSchema
+
+    judgement = Judgement(
+        confidence='High',
+        disposition=2,
+        disposition_name='Malicious',
+        observable=Observable(type='ip', value='127.0.0.1'),
+        priority=90,
+        severity='High',
+        source='Python',
+        valid_time=ValidTime(),
+    )
+    relationship = Relationship(
+        relationship_type='based-on',
+        source_ref=judgement,
+        target_ref=judgement,
+    )
+    bundle = Bundle(duplicate_policy='merge', judgements=[judgement])
+    # Make sure that the JSON isn't validated again (it is invalid here).
+    observable = Observable._from_json({'type': 'unknown'})
+
+    for entity in [observable, judgement, relationship, bundle]:
+        for copied_entity in [
+            pickle.loads(pickle.dumps(entity)),
+            copy.copy(entity),
+            copy.deepcopy(entity),
+        ]:
+            assert type(copied_entity) is type(entity)
+            assert copied_entity.json == entity.json
+            assert copied_entity.json is not entity.json
+
+    assert pickle.loads(pickle.dumps(bundle)).duplicate_policy == 'merge'
+
+    for copied_relationship in [
+        pickle.loads(pickle.dumps(relationship)),
+        copy.copy(relationship),
+        copy.deepcopy(relationship),
+    ]:
+        for name in ['source_ref_external_ids', 'target_ref_external_ids']:
+            assert getattr(copied_relationship, name) == (
+                judgement.external_ids
+            )
+    assert copy.copy(bundle).get_entity(judgement.id) == judgement.json
+
+    # Shallow copies share nested values, deep copies don't.
+    assert copy.copy(judgement).observable is judgement.observable
+    assert copy.deepcopy(judgement).observable is not judgement.observable
+
+    # Entities of local classes can still be copied (but not pickled).
+    assert copy.copy(Good()).json == {}
+
+
+def test_entity_private_attributes_are_not_looked_up_in_json():
+    observable = Observable(type='ip', value='127.0.0.1')
+
+    with assert_raises(AttributeError):
+        observable._unknown
+
+    with assert_raises(AttributeError):
+        Observable.__new__(Observable).json
+
+
+def test_entities_have_no_instance_dicts():
+    judgement = Judgement(
+        confidence='High',
+        disposition=2,
+        disposition_name='Malicious',
+        observable=Observable(type='ip', value='127.0.0.1'),
+        priority=90,
+        severity='High',
+        source='Python',
+        valid_time=ValidTime(),
+    )
+
+    for entity in [judgement, Observable(type='ip', value='127.0.0.1')]:
+        assert not hasattr(entity, '__dict__')
+
+    # The fast accessors are consistent with the rest of the API.
+    for field in ['disposition', 'observable', 'source', 'timestamp']:
+        assert getattr(judgement, field) == judgement.get(field)
+    assert judgement.source == judgement['source'] == 'Python'
+    assert judgement.json['external_ids']
+    assert judgement.confidence == 'High'
+    assert judgement.unknown is None
+
+    with assert_raises(AttributeError):
+        judgement.confidence = 'Low'
+
+    # Each model declares its slots explicitly.
+    for name in models.__all__:
+        model = getattr(models, name)
+        if model is not Bundle:
+            assert '__dict__' not in dir(model), name
+
+    # Bundles still have instance dicts though.
+    assert hasattr(Bundle(), '__dict__')
+
+
+def test_entity_subclasses_without_slots_have_instance_dicts():
+    class TaggedObservable(Observable):
+        type = Observable.type
+
+        schema = Observable.schema
+
+    observable = TaggedObservable(type='ip', value='127.0.0.1')
+    observable.tag = 'blocked'
+
+    assert observable.tag == 'blocked'
+    assert observable.value == '127.0.0.1'
+    assert observable.json == {'type': 'ip', 'value': '127.0.0.1'}
+    assert hasattr(observable, '__dict__')
+
+
+def test_use_validation_engine_is_local_to_context(validation_engine):
+    other_engine = (
+        'compiled' if validation_engine == 'marshmallow' else 'marshmallow'
+    )
+
+    with use_validation_engine(other_engine):
+        assert get_validation_engine() == other_engine
+
+        with use_validation_engine(validation_engine):
+            assert get_validation_engine() == validation_engine
+
+        assert get_validation_engine() == other_engine
+
+        # Other threads keep using the global engine.
+        with ThreadPoolExecutor(1) as executor:
+            assert executor.submit(
+                get_validation_engine,
+            ).result() == validation_engine
+
+    assert get_validation_engine() == validation_engine
+
+    with assert_raises(ValueError):
+        with use_validation_engine('interpreted'):
+            pass
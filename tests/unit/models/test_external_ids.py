@@ -0,0 +1,155 @@
+from hashlib import sha256
+from itertools import chain
+
+from bundlebuilder.constants import DEFAULT_SESSION_EXTERNAL_ID_PREFIX
+from bundlebuilder.models import (
+    Observable,
+    ObservedTime,
+    Relationship,
+    Sighting,
+)
+from bundlebuilder.models.external_ids import (
+    ExternalIdGenerator,
+    get_external_id_generator,
+)
+from bundlebuilder.session import Session
+from tests.unit.utils import (
+    make_judgement,
+    utc_now_iso,
+)
+
+
+def reference_external_id(external_id_prefix, type_, seed_values, salts):
+    # The original (i.e. straightforward) way of generating XIDs.
+    value = '|'.join(
+        filter(bool, chain((external_id_prefix,) + seed_values, salts))
+    )
+    return '{prefix}-{type}-{sha256}'.format(
+        prefix=external_id_prefix,
+        type=type_,
+        sha256=sha256(bytes(value, 'utf-8')).hexdigest(),
+    )
+
+
+def test_external_id_generator_matches_reference():
+    cases = [
+        ((), ()),
+        (('',), ('',)),
+        (('judgement', 'Python', '127.0.0.1', '2', '2019-03-01'), ()),
+        (('sighting', '', '', '10.0.0.1'), ('salt', 'pepper')),
+        (('relationship', 'based-on', 'None', 'None'), ('\U0001f9c2',)),
+    ]
+
+    for external_id_prefix in ['ctim', 'ctim-bundle-builder', '', 'ΧΙΔ']:
+        generator = ExternalIdGenerator(external_id_prefix, 'judgement')
+
+        for seed_values, salts in cases:
+            expected = reference_external_id(
+                external_id_prefix, 'judgement', seed_values, salts,
+            )
+            # The second call is served from the cache.
+            assert generator.generate([seed_values], salts) == [expected]
+            assert generator.generate([seed_values], salts) == [expected]
+
+
+def test_external_id_generator_is_shared_per_prefix_and_type():
+    generator = get_external_id_generator('ctim', 'judgement')
+
+    assert get_external_id_generator('ctim', 'judgement') is generator
+    assert get_external_id_generator('ctim', 'sighting') is not generator
+    assert get_external_id_generator('xid', 'judgement') is not generator
+
+
+def test_external_ids_are_computed_lazily():
+    session = Session(
+        external_id_prefix='lazy',
+        source='Lazy',
+        source_uri='https://example.com/lazy',
+    )
+
+    with session.set():
+        sighting = Sighting(
+            confidence='High',
+            count=1,
+            observed_time=ObservedTime(
+                start_time='2019-03-01T22:26:29.229Z',
+            ),
+            observables=[
+                Observable(type='ip', value=f'10.0.0.{index}')
+                for index in range(3)
+            ],
+            timestamp='2019-03-01T22:26:29.229Z',
+            title='Seen on the network',
+            external_id_salt_values=['salt'],
+            external_ids=['lazy-sighting-custom'],
+        )
+
+    assert sighting._pending_external_ids is not None
+
+    # Accessing any other fields doesn't compute the XIDs.
+    assert sighting.id.startswith('transient:lazy-sighting-')
+    assert sighting['title'] == 'Seen on the network'
+    assert sighting.get('source') == 'Lazy'
+    assert sighting._pending_external_ids is not None
+
+    seed_values_list = [
+        ('sighting', 'Seen on the network', '2019-03-01', f'10.0.0.{index}')
+        for index in range(3)
+    ]
+    expected = [
+        reference_external_id('lazy', 'sighting', seed_values, ['salt'])
+        for seed_values in seed_values_list
+    ] + ['lazy-sighting-custom']
+
+    assert sighting.external_ids == expected
+    assert sighting._pending_external_ids is None
+    assert list(sighting.json) == [
+        'type', 'schema_version', 'source', 'source_uri', 'id',
+        'external_ids', 'confidence', 'count', 'observed_time',
+        'observables', 'timestamp', 'title',
+    ]
+    assert sighting.json['external_ids'] == expected
+
+
+def test_external_ids_are_resolved_once_when_raced():
+    judgement = make_judgement(timestamp='2019-03-01T22:26:29.229Z')
+    pending = judgement._pending_external_ids
+
+    # Another thread resolves the XIDs right after this one read the pending
+    # ones, so they are resolved twice, but the result must be the same.
+    expected = judgement.external_ids
+    judgement._resolve_external_ids(pending)
+
+    assert judgement.external_ids == expected
+    assert judgement._pending_external_ids is None
+
+    # Nothing is left to resolve once the pending XIDs are reset.
+    judgement._resolve_external_ids(None)
+
+    assert judgement.external_ids == expected
+
+
+def test_external_ids_reflect_initial_state_of_entities():
+    judgement = make_judgement(timestamp='2019-03-01T22:26:29.229Z')
+    expected = judgement.external_ids
+
+    # Changing an entity after its creation doesn't affect its XIDs.
+    judgement = make_judgement(timestamp='2019-03-01T22:26:29.229Z')
+    judgement.json['timestamp'] = utc_now_iso()
+    assert judgement.external_ids == expected
+
+    # Relationships set the XIDs of their refs only after initialization.
+    relationship = Relationship(
+        relationship_type='based-on',
+        source_ref=judgement,
+        target_ref=judgement,
+    )
+    assert relationship.external_ids == [
+        reference_external_id(
+            DEFAULT_SESSION_EXTERNAL_ID_PREFIX,
+            'relationship',
+            ('relationship', 'based-on', 'None', 'None'),
+            [],
+        )
+    ]
+    assert relationship.source_ref_external_ids == expected
@@ -0,0 +1,111 @@
+import datetime as dt
+
+from pytest import raises as assert_raises
+from marshmallow.exceptions import ValidationError
+
+from bundlebuilder.models import (
+    JudgementSpecification,
+    OpenIOCSpecification,
+    RelatedJudgement,
+    SnortSpecification,
+)
+from bundlebuilder.models.fields import (
+    DateTimeField,
+    EntityField,
+    UnionField,
+)
+
+
+class CountingEntityField(EntityField):
+
+    def __init__(self, **kwargs):
+        self.calls = 0
+        super().__init__(**kwargs)
+
+    def deserialize(self, *args, **kwargs):
+        self.calls += 1
+        return super().deserialize(*args, **kwargs)
+
+
+def test_union_field_dispatches_entities_by_class():
+    candidates = [
+        CountingEntityField(type=JudgementSpecification),
+        CountingEntityField(type=SnortSpecification),
+        CountingEntityField(type=OpenIOCSpecification),
+    ]
+    field = UnionField(candidates=candidates)
+
+    specification = OpenIOCSpecification(open_IOC='<ioc/>')
+
+    assert field.deserialize(specification) == specification.json
+    assert field.deserialize(specification) == specification.json
+
+    assert [candidate.calls for candidate in candidates] == [0, 0, 2]
+
+    specification = JudgementSpecification(
+        judgements=['judgement'],
+        required_judgements=[RelatedJudgement(judgement_id='judgement_id')],
+    )
+
+    assert field.deserialize(specification) == specification.json
+
+    assert [candidate.calls for candidate in candidates] == [1, 0, 2]
+
+
+def test_union_field_falls_back_to_trying_each_candidate():
+    candidates = [
+        CountingEntityField(type=JudgementSpecification),
+        CountingEntityField(type=OpenIOCSpecification),
+    ]
+    field = UnionField(candidates=candidates)
+
+    with assert_raises(ValidationError) as exc_info:
+        field.deserialize(SnortSpecification(snort_sig='alert'))
+
+    assert exc_info.value.messages == [
+        'Not a valid CTIM JudgementSpecification.',
+        'Not a valid CTIM OpenIOCSpecification.',
+    ]
+
+    assert [candidate.calls for candidate in candidates] == [1, 1]
+
+
+def test_datetime_field_normalizes_supported_values():
+    field = DateTimeField()
+
+    expected = '2019-03-01T22:26:29.229Z'
+
+    for value in [
+        '2019-03-01T22:26:29.229Z',
+        '2019-03-01T22:26:29.229123Z',
+        '2019-03-01T23:26:29.229+01:00',
+        '2019-03-01 22:26:29.229',
+        dt.datetime(2019, 3, 1, 22, 26, 29, 229000),
+        dt.datetime(2019, 3, 1, 17, 26, 29, 229000,
+                    tzinfo=dt.timezone(-dt.timedelta(hours=5))),
+        1551479189.229,
+        1551479189229,
+    ]:
+        assert field.deserialize(value) == expected
+
+    assert field.deserialize('2019-03-01T22:26:29Z') == (
+        '2019-03-01T22:26:29.000Z'
+    )
+
+
+def test_datetime_field_rejects_unsupported_values():
+    field = DateTimeField()
+
+    for value in [
+        '4:20',
+        '2019-02-30T22:26:29.229Z',
+        '2019-03-01T24:26:29.229Z',
+        True,
+        float('nan'),
+        10 ** 30,
+        [],
+    ]:
+        with assert_raises(ValidationError) as exc_info:
+            field.deserialize(value)
+
+        assert exc_info.value.messages == ['Not a valid datetime.']
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+from pytest import raises as assert_raises
+
+from bundlebuilder import models
+from bundlebuilder.models import primary
+
+
+def test_models_are_imported_lazily():
+    # Run a fresh interpreter, since the models are already imported here.
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        'import sys, bundlebuilder.models; '
+        'print("bundlebuilder.models.primary.bundle" in sys.modules, '
+        '"marshmallow" in sys.modules)',
+    ])
+    assert output.split() == [b'False', b'False']
+
+
+def test_lazy_exports():
+    assert models.Bundle is primary.Bundle
+    assert 'Bundle' in models.__all__
+    assert 'ValidTime' in dir(models)
+
+    with assert_raises(AttributeError):
+        models.Unknown
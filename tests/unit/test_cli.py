@@ -0,0 +1,135 @@
+import json
+
+from bundlebuilder.cli import main
+from bundlebuilder.constants import VALIDATION_ENGINE_CHOICES
+from bundlebuilder.models.entity import get_validation_engine
+from tests.unit.utils import make_bundle_json
+
+
+def test_validate(tmp_path, capsys):
+    bundle_json = make_bundle_json()
+
+    valid_path = tmp_path / 'valid.json'
+    valid_path.write_text(json.dumps(bundle_json))
+
+    bundle_json['judgements'][0]['priority'] = 101
+    invalid_path = tmp_path / 'invalid.json'
+    invalid_path.write_text(json.dumps(bundle_json))
+
+    missing_path = tmp_path / 'missing.json'
+
+    assert main(['validate', '-w', '1', str(valid_path)]) == 0
+
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert captured.err.startswith('Validated 4 entities in ')
+
+    assert main([
+        'validate', '-w', '2', str(invalid_path), str(missing_path),
+    ]) == 1
+
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines()
+    assert lines[0] == (
+        f'{invalid_path}: $.judgements[0].priority: '
+        'Must be less than or equal to 100.'
+    )
+    assert lines[1].startswith(f'{missing_path}: ')
+    assert captured.err.startswith('Validated 4 entities in ')
+    assert captured.err.endswith('found 2 errors.\n')
+
+
+def test_validate_keeps_validation_engine(tmp_path, validation_engine):
+    path = tmp_path / 'bundle.json'
+    path.write_text(json.dumps(make_bundle_json()))
+
+    for engine in VALIDATION_ENGINE_CHOICES:
+        argv = ['validate', '-w', '1', '--engine', engine, str(path)]
+        assert main(argv) == 0
+
+        # The engine is used only while the command is running.
+        assert get_validation_engine() == validation_engine
+
+
+def test_build(tmp_path, capsys):
+    mapping_path = tmp_path / 'mapping.json'
+    mapping_path.write_text(json.dumps({
+        'observable': {'type': 'ip', 'value': '$ip'},
+        'judgement': {
+            'confidence': 'High',
+            'disposition': 2,
+            'disposition_name': 'Malicious',
+            'priority': '$priority',
+            'severity': 'High',
+            'valid_time': {},
+        },
+    }))
+
+    feed_path = tmp_path / 'feed.csv'
+    feed_path.write_text(
+        'ip,priority\n127.0.0.1,95\n127.0.0.2,101\n127.0.0.3,90\n'
+    )
+
+    output_path = tmp_path / 'bundle.json'
+
+    assert main([
+        'build', str(feed_path), '-m', str(mapping_path),
+        '-o', str(output_path), '-w', '2', '--max-entities', '1',
+    ]) == 1
+
+    captured = capsys.readouterr()
+    assert captured.err.splitlines()[0] == (
+        f'{feed_path}: record 2: '
+        'judgement.priority: Must be less than or equal to 100.'
+    )
+    assert captured.err.endswith('Wrote 2 bundles.\n')
+
+    for index, value in [(1, '127.0.0.1'), (2, '127.0.0.3')]:
+        bundle_json = json.loads(
+            (tmp_path / f'bundle-{index}.json').read_text()
+        )
+        assert [
+            judgement['observable']['value']
+            for judgement in bundle_json['judgements']
+        ] == [value]
+
+    assert main([
+        'validate', str(tmp_path / 'bundle-1.json'),
+        str(tmp_path / 'bundle-2.json'),
+    ]) == 0
+
+    # The format of the feed can't be guessed.
+    assert main([
+        'build', str(mapping_path), '-m', str(mapping_path),
+        '-o', str(output_path),
+    ]) == 2
+
+
+def test_build_reports_output_errors(tmp_path, capsys):
+    mapping_path = tmp_path / 'mapping.json'
+    mapping_path.write_text(json.dumps({
+        'observable': {'type': 'ip', 'value': '$ip'},
+        'sighting': {
+            'confidence': 'High',
+            'count': 1,
+            'observed_time': {'start_time': '2019-03-01T22:26:29.229Z'},
+        },
+    }))
+
+    feed_path = tmp_path / 'feed.csv'
+    feed_path.write_text('ip\n127.0.0.1\n127.0.0.2\n')
+
+    output_path = tmp_path / 'missing' / 'bundle.json'
+
+    # The last bundle is written on closing, the others while reading.
+    for args, name in [
+        ([], output_path),
+        (['--max-entities', '1'], tmp_path / 'missing' / 'bundle-1.json'),
+    ]:
+        assert main([
+            'build', str(feed_path), '-m', str(mapping_path),
+            '-o', str(output_path), '-w', '1', *args,
+        ]) == 2
+
+        captured = capsys.readouterr()
+        assert captured.err.splitlines()[-1].startswith(f'{name}: ')
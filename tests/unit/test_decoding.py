@@ -0,0 +1,73 @@
+import io
+import json
+
+from pytest import raises as assert_raises
+
+from bundlebuilder.decoding import iter_object
+
+
+def test_iter_object():
+    data = {
+        'title': 'Démo',
+        'judgements': [{'priority': 12345, 'tags': ['a', 'b']}, {}],
+        'judgement_refs': [],
+        'count': 1234567,
+        'valid': True,
+    }
+    document = json.dumps(data, ensure_ascii=False, indent=2)
+
+    expected_items = [
+        (('title',), 'Démo'),
+        (('judgements', 0), {'priority': 12345, 'tags': ['a', 'b']}),
+        (('judgements', 1), {}),
+        (('judgement_refs',), []),
+        (('count',), 1234567),
+        (('valid',), True),
+    ]
+
+    # Make sure that values split across chunks are decoded properly.
+    for chunk_size in [1, 2, 3, 5, 8, 1024]:
+        for fp in [io.StringIO(document),
+                   io.BytesIO(document.encode('utf-8'))]:
+            items = list(iter_object(
+                fp,
+                expand={'judgements', 'judgement_refs'},
+                chunk_size=chunk_size,
+            ))
+            assert items == expected_items
+
+    assert list(iter_object(io.StringIO(' {} '))) == []
+
+
+def test_iter_object_with_multibyte_characters_split_across_reads():
+    document = '{"a": "ééé", "b": ["€", "ü"]}'.encode('utf-8')
+
+    for chunk_size in [1, 2, 3]:
+        items = list(iter_object(
+            io.BytesIO(document), expand={'b'}, chunk_size=chunk_size,
+        ))
+        assert items == [(('a',), 'ééé'), (('b', 0), '€'), (('b', 1), 'ü')]
+
+    # Sockets and pipes may return less than requested (e.g. a single byte).
+    class ShortReader(io.BytesIO):
+        def read(self, size=-1):
+            return super().read(1)
+
+    assert list(iter_object(ShortReader(document), chunk_size=8)) == [
+        (('a',), 'ééé'), (('b',), ['€', 'ü']),
+    ]
+
+    # A character truncated at the very end is still an error.
+    with assert_raises(ValueError):
+        list(iter_object(io.BytesIO(document[:8]), chunk_size=1))
+
+
+def test_iter_object_with_invalid_json_fails():
+    for document in ['', '[]', '{"a": 1', '{"a": 1}}', '{"a" 1}',
+                     '{"a": [1,]}', '{1: 2}', '{"a": tru}']:
+        with assert_raises(ValueError):
+            list(iter_object(io.StringIO(document), expand={'a'},
+                             chunk_size=2))
+
+    with assert_raises(ValueError):
+        list(iter_object(io.StringIO('{}'), chunk_size=0))
@@ -0,0 +1,70 @@
+import json
+
+from pytest import (
+    fixture,
+    importorskip,
+    raises as assert_raises,
+)
+
+from bundlebuilder.constants import JSON_ENCODER_CHOICES
+from bundlebuilder.encoding import (
+    encode,
+    get_json_encoder,
+    set_json_encoder,
+)
+
+
+@fixture(params=JSON_ENCODER_CHOICES)
+def json_encoder(request):
+    if request.param == 'orjson':
+        importorskip('orjson')
+
+    previous_encoder = get_json_encoder()
+    set_json_encoder(request.param)
+    yield request.param
+    set_json_encoder(previous_encoder)
+
+
+def test_set_json_encoder_with_invalid_encoder_fails():
+    with assert_raises(ValueError):
+        set_json_encoder('simplejson')
+
+
+def test_encode(json_encoder):
+    data = {
+        'title': 'Démo ✓',
+        'count': 1,
+        'priority': 95.5,
+        'observables': [{'type': 'ip', 'value': '127.0.0.1'}],
+        'tlp': None,
+        'internal': False,
+    }
+
+    encoded = encode(data)
+
+    # All the encoders produce exactly the same compact UTF-8 output.
+    assert encoded == json.dumps(
+        data, ensure_ascii=False, separators=(',', ':'),
+    ).encode('utf-8')
+    assert json.loads(encoded) == data
+
+
+def test_encode_floats():
+    orjson = importorskip('orjson')
+
+    data = [95.5, 0.1, -0.0, 1e16, 1e-7, 1.5e300, 5e-324]
+
+    previous_encoder = get_json_encoder()
+    try:
+        set_json_encoder('orjson')
+        encoded = encode(data)
+    finally:
+        set_json_encoder(previous_encoder)
+
+    assert encoded == orjson.dumps(data)
+    assert json.loads(encoded) == data
+
+    # Only floats in exponent notation are encoded differently.
+    assert encoded == json.dumps(data, separators=(',', ':')).replace(
+        'e+', 'e',
+    ).replace('e-0', 'e-').encode('utf-8')
@@ -0,0 +1,147 @@
+import io
+
+from pytest import raises as assert_raises
+
+from bundlebuilder.exceptions import ValidationError
+from bundlebuilder.feeds import (
+    EntityMapping,
+    iter_feed_entities,
+    read_records,
+)
+from bundlebuilder.models import (
+    Judgement,
+    Sighting,
+    Verdict,
+)
+
+MAPPING = {
+    'observable': {'type': 'ip', 'value': '$ip'},
+    'judgement': {
+        'confidence': 'High',
+        'disposition': 2,
+        'disposition_name': 'Malicious',
+        'priority': '$priority',
+        'severity': 'High',
+        'valid_time': {'start_time': '$start_time'},
+        'reason': '$$reason',
+    },
+    'sighting': {
+        'confidence': 'High',
+        'count': 1,
+        'observed_time': {'start_time': '2019-03-01T22:26:29.229Z'},
+        'severity': 'High',
+    },
+    'verdict': True,
+}
+
+
+def test_read_records():
+    assert list(read_records(io.StringIO('ip,priority\n127.0.0.1,95\n'),
+                             'csv')) == [{'ip': '127.0.0.1', 'priority': '95'}]
+
+    assert list(read_records(io.StringIO('{"ip": "127.0.0.1"}\n\n'),
+                             'ndjson')) == [{'ip': '127.0.0.1'}]
+
+    for document in ['{"ip": \n', '[]\n']:
+        with assert_raises(ValueError):
+            list(read_records(io.StringIO(document), 'ndjson'))
+
+    with assert_raises(ValueError):
+        list(read_records(io.StringIO(''), 'xml'))
+
+
+def test_entity_mapping_with_invalid_mapping_fails():
+    for mapping in [
+        [],
+        {},
+        {'observable': 'ip'},
+        {'observable': {}, 'indicator': {}},
+        {'observable': {}, 'verdict': 'yes'},
+        {'observable': {}, 'verdict': True},
+    ]:
+        with assert_raises(ValueError):
+            EntityMapping(mapping)
+
+
+def test_entity_mapping_build():
+    mapping = EntityMapping(MAPPING)
+
+    judgement, verdict, sighting = mapping.build({
+        'ip': '127.0.0.1',
+        'priority': '95',
+        'start_time': '',
+    })
+
+    assert isinstance(judgement, Judgement)
+    assert judgement.observable == {'type': 'ip', 'value': '127.0.0.1'}
+    assert judgement.priority == 95
+    assert judgement.reason == '$reason'
+    assert judgement.valid_time == {}
+
+    assert isinstance(verdict, Verdict)
+    assert verdict.judgement_id == judgement.id
+
+    assert isinstance(sighting, Sighting)
+    assert sighting.observables == [judgement.observable]
+
+
+def test_entity_mapping_build_with_invalid_nested_entities_fails():
+    mapping = EntityMapping({
+        **MAPPING,
+        'sighting': {
+            **MAPPING['sighting'],
+            'observed_time': {'start_time': '$seen'},
+            'external_references': [
+                {'source_name': 'Feed', 'external_id': '1'},
+                {'source_name': 'Feed', 'external_id': '2', 'url': 5},
+            ],
+        },
+    })
+
+    with assert_raises(ValidationError) as exc_info:
+        mapping.build({'ip': '127.0.0.1', 'priority': '95', 'seen': 'now'})
+
+    assert exc_info.value.args == ({
+        'sighting': {
+            'observed_time': {'start_time': ['Not a valid datetime.']},
+        },
+    },)
+
+    with assert_raises(ValidationError) as exc_info:
+        mapping.build({
+            'ip': '127.0.0.1',
+            'priority': '95',
+            'seen': '2019-03-01T22:26:29.229Z',
+        })
+
+    assert exc_info.value.args == ({
+        'sighting': {
+            'external_references': {1: {'url': ['Not a valid string.']}},
+        },
+    },)
+
+
+def test_iter_feed_entities():
+    records = [
+        {'ip': '127.0.0.1', 'priority': '95'},
+        {'ip': '127.0.0.2', 'priority': '101'},
+        {'ip': '127.0.0.3', 'priority': '90'},
+    ]
+
+    for workers in [1, 2]:
+        results = list(iter_feed_entities(
+            records, EntityMapping(MAPPING), workers=workers, batch_size=2,
+        ))
+
+        assert [index for index, _, _ in results] == [0, 1, 2]
+        assert [key for key, _ in results[0][1]] == [
+            'judgements', 'verdicts', 'sightings',
+        ]
+        assert results[0][2] is None
+        assert results[1] == (
+            1, [], 'judgement.priority: Must be less than or equal to 100.',
+        )
+        assert results[2][1][0][1]['observable']['value'] == '127.0.0.3'
+
+    with assert_raises(ValueError):
+        list(iter_feed_entities(records, EntityMapping(MAPPING), workers=0))
@@ -0,0 +1,170 @@
+import io
+import json
+
+from pytest import raises as assert_raises
+
+from bundlebuilder.exceptions import ValidationError
+from bundlebuilder.models import (
+    Bundle,
+    Observable,
+)
+from bundlebuilder.parallel import (
+    build,
+    build_batch,
+    iter_batches,
+    map_batches,
+)
+from bundlebuilder.session import Session
+from bundlebuilder.splitter import BundleSplitter
+from bundlebuilder.threadsafe import ThreadSafeBundle
+from bundlebuilder.transient_ids import DeterministicTransientIdGenerator
+from bundlebuilder.writer import BundleWriter
+from tests.unit.utils import (
+    make_judgement,
+    make_judgement_and_verdict,
+)
+
+
+# Factories must be picklable, i.e. defined at the module level.
+
+def make_observable(value):
+    return Observable(type='ip', value=value)
+
+
+def get_session_source(batch):
+    from bundlebuilder.session import get_session
+    return [get_session().source for _ in batch]
+
+
+def test_iter_batches():
+    assert list(iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    with assert_raises(ValueError):
+        list(iter_batches(range(5), 0))
+
+
+def test_map_batches_carries_session_into_workers():
+    session = Session(
+        external_id_prefix='parallel',
+        source='Parallel',
+        source_uri='https://example.com/parallel',
+    )
+
+    with session.set():
+        for workers in [1, 2]:
+            results = list(map_batches(
+                get_session_source, iter_batches(range(5), 2), workers,
+            ))
+            assert results == [['Parallel'] * 2] * 2 + [['Parallel']]
+
+    with assert_raises(ValueError):
+        list(map_batches(get_session_source, [], workers=0))
+
+
+def test_build():
+    values = [f'127.0.0.{index}' for index in range(10)]
+
+    bundles = [
+        build(values, make_judgement_and_verdict, workers=workers,
+              batch_size=3)
+        for workers in [1, 2]
+    ]
+
+    for bundle in bundles:
+        assert [
+            judgement['observable']['value']
+            for judgement in bundle.json['judgements']
+        ] == values
+        assert [
+            verdict['judgement_id'] for verdict in bundle.json['verdicts']
+        ] == [judgement['id'] for judgement in bundle.json['judgements']]
+
+    # The transient IDs don't clash across the batches.
+    ids = [
+        judgement['id']
+        for bundle in bundles
+        for judgement in bundle.json['judgements']
+    ]
+    assert len(set(ids)) == len(ids)
+
+    bundle = Bundle(description='Parallel')
+    assert build(values, make_judgement, workers=1, bundle=bundle) is bundle
+    assert len(bundle.json['judgements']) == len(values)
+
+
+def test_build_with_deterministic_transient_ids_is_reproducible():
+    session = Session(
+        external_id_prefix='golden',
+        source='Golden',
+        source_uri='https://example.com/golden',
+        transient_id_generator=DeterministicTransientIdGenerator(seed=7),
+    )
+
+    values = [f'127.0.0.{index}' for index in range(10)]
+
+    with session.set():
+        bundles = [
+            build(values, make_judgement, workers=workers, batch_size=3,
+                  bundle=Bundle())
+            for workers in [1, 2]
+        ]
+
+    ids = [judgement['id'] for judgement in bundles[0].json['judgements']]
+    assert len(set(ids)) == len(ids)
+
+    assert bundles[0].json['judgements'] == bundles[1].json['judgements']
+
+
+def test_build_batch_and_insert_items():
+    session = Session(
+        external_id_prefix='batch',
+        source='Batch',
+        source_uri='https://example.com/batch',
+        transient_id_generator=DeterministicTransientIdGenerator(seed=7),
+    )
+
+    values = [f'127.0.0.{index}' for index in range(5)]
+
+    with session.set():
+        expected = build(values, make_judgement_and_verdict, workers=1,
+                         batch_size=2)
+
+        # Run the batches by other means in any order.
+        batches = list(enumerate(iter_batches(values, 2)))
+        results = {
+            index: build_batch(make_judgement_and_verdict, batch, index)
+            for index, batch in reversed(batches)
+        }
+
+    fp = io.StringIO()
+    sinks = [
+        Bundle(),
+        ThreadSafeBundle(),
+        BundleSplitter(),
+        BundleWriter(fp),
+    ]
+
+    for sink in sinks:
+        for index in sorted(results):
+            sink.insert_items(results[index])
+
+    bundle, threadsafe_bundle, splitter, writer = sinks
+    [split_bundle] = splitter.close()
+    writer.close()
+
+    for data in [
+        bundle.json,
+        threadsafe_bundle.json,
+        split_bundle.json,
+        json.loads(fp.getvalue()),
+    ]:
+        assert data['judgements'] == expected.json['judgements']
+        assert data['verdicts'] == expected.json['verdicts']
+
+
+def test_build_with_invalid_entities_fails():
+    with assert_raises(ValidationError):
+        build(['127.0.0.1', ''], make_judgement, workers=2)
+
+    with assert_raises(ValidationError):
+        build(['127.0.0.1'], make_observable, workers=1)
@@ -0,0 +1,124 @@
+from pytest import raises as assert_raises
+
+from bundlebuilder.models import (
+    Relationship,
+    Verdict,
+)
+from bundlebuilder.partitioner import BundlePartitioner
+from tests.unit.utils import (
+    make_judgement,
+    make_sighting,
+)
+
+
+def make_relationship(source, target):
+    return Relationship(
+        relationship_type='based-on',
+        source_ref=source,
+        target_ref=target,
+    )
+
+
+def get_ids(bundle):
+    return {
+        entity['id']
+        for key, value in bundle.json.items()
+        if key.endswith('s') and isinstance(value, list)
+        for entity in value
+        if isinstance(entity, dict) and 'id' in entity
+    }
+
+
+def test_bundle_partitioner_keeps_related_entities_together():
+    sightings = [make_sighting(f'10.0.0.{index}') for index in range(3)]
+    judgements = [make_judgement(f'10.0.0.{index}') for index in range(3)]
+    relationships = [
+        make_relationship(sighting, judgement)
+        for sighting, judgement in zip(sightings, judgements)
+    ]
+    verdicts = [Verdict.from_judgement(judgement) for judgement in judgements]
+
+    partitioner = BundlePartitioner(max_entities=5)
+    # A plain split would separate the related entities from each other.
+    partitioner.add_sightings(sightings)
+    partitioner.add_judgements(judgements)
+    partitioner.add_relationships(relationships)
+    partitioner.add_verdicts(verdicts)
+    partitioner.add_judgement(judgements[1], ref=True)
+    bundles = partitioner.close()
+
+    assert [
+        sorted(get_ids(bundle)) for bundle in bundles
+    ] == [
+        sorted([sighting.id, judgement.id, relationship.id])
+        for sighting, judgement, relationship
+        in zip(sightings, judgements, relationships)
+    ]
+    assert [
+        [verdict['judgement_id'] for verdict in bundle.verdicts]
+        for bundle in bundles
+    ] == [[judgement.id] for judgement in judgements]
+    assert [bundle.judgement_refs for bundle in bundles] == [
+        None, [judgements[1].id], None,
+    ]
+    assert len({bundle.external_ids[0] for bundle in bundles}) == 3
+
+    with assert_raises(ValueError):
+        partitioner.add_sighting(sightings[0])
+
+
+def test_bundle_partitioner_refers_to_duplicates_kept():
+    judgement = make_judgement('127.0.0.1')
+    duplicate = make_judgement('127.0.0.1')
+    sighting = make_sighting('127.0.0.1')
+    relationship = make_relationship(sighting, duplicate)
+
+    assert duplicate.external_ids == judgement.external_ids
+
+    partitioner = BundlePartitioner()
+    partitioner.add_many([judgement, duplicate, sighting, relationship])
+    [bundle] = partitioner.close()
+
+    assert bundle.judgements == [judgement.json]
+    assert bundle.relationships == [
+        {**relationship.json, 'target_ref': judgement.id},
+    ]
+    # The original entity is left intact.
+    assert relationship.target_ref == duplicate.id
+
+
+def test_bundle_partitioner_splits_too_large_groups():
+    sighting = make_sighting('127.0.0.1')
+    judgements = [make_judgement(f'10.0.0.{index}') for index in range(4)]
+    relationships = [
+        make_relationship(sighting, judgement) for judgement in judgements
+    ]
+
+    partitioner = BundlePartitioner(max_entities=4)
+    partitioner.add_many([sighting] + judgements + relationships)
+    bundles = partitioner.close()
+
+    assert [len(get_ids(bundle)) for bundle in bundles] == [4, 4, 1]
+
+    ids = [get_ids(bundle) for bundle in bundles]
+    external_ids = {
+        entity.id: entity.external_ids[0]
+        for entity in [sighting] + judgements
+    }
+
+    for relationship in relationships:
+        [position] = [
+            position for position, bundle_ids in enumerate(ids)
+            if relationship.id in bundle_ids
+        ]
+        [data] = [
+            data for data in bundles[position].relationships
+            if data['id'] == relationship.id
+        ]
+        for field in ['source_ref', 'target_ref']:
+            original = relationship.json[field]
+            if original in ids[position]:
+                assert data[field] == original
+            else:
+                # Refer to entities from other bundles by their XIDs.
+                assert data[field] == external_ids[original]
@@ -0,0 +1,168 @@
+import asyncio
+import io
+import json
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+from pytest import raises as assert_raises
+
+from bundlebuilder.constants import VALIDATION_ENGINE_CHOICES
+from bundlebuilder.exceptions import ValidationError
+from bundlebuilder.models.entity import (
+    get_validation_engine,
+    use_validation_engine,
+)
+from bundlebuilder.parallel import build
+from bundlebuilder.pipeline import (
+    build_async,
+    iter_build_async,
+)
+from bundlebuilder.session import Session
+from bundlebuilder.splitter import BundleSplitter
+from bundlebuilder.transient_ids import DeterministicTransientIdGenerator
+from bundlebuilder.writer import BundleWriter
+from tests.unit.utils import (
+    make_judgement,
+    make_judgement_and_verdict,
+    make_sighting,
+    run,
+)
+
+
+# Factories must be picklable, i.e. defined at the module level.
+
+def make_judgement_with_engine(value):
+    return make_judgement(value, reason=get_validation_engine())
+
+
+async def aiter_values(count, read=None):
+    for index in range(count):
+        # Pretend that the records are fetched from somewhere.
+        await asyncio.sleep(0)
+        if read is not None:
+            read.append(index)
+        yield f'127.0.0.{index}'
+
+
+def test_build_async():
+    session = Session(
+        external_id_prefix='pipeline',
+        source='Pipeline',
+        source_uri='https://example.com/pipeline',
+        transient_id_generator=DeterministicTransientIdGenerator(seed=0),
+    )
+
+    with session.set():
+        expected = build(
+            [f'127.0.0.{index}' for index in range(10)],
+            make_judgement_and_verdict,
+            workers=1,
+            batch_size=3,
+        )
+
+        for executor in [None, ThreadPoolExecutor(2), ProcessPoolExecutor(2)]:
+            bundle = run(build_async(
+                aiter_values(10), make_judgement_and_verdict,
+                executor=executor, batch_size=3, max_pending=2,
+            ))
+            assert bundle.judgements == expected.judgements
+            assert bundle.verdicts == expected.verdicts
+
+            if executor is not None:
+                executor.shutdown()
+
+
+def test_build_async_into_writer_and_splitter():
+    values = [f'127.0.0.{index}' for index in range(5)]
+    session = Session(
+        external_id_prefix='pipeline',
+        source='Pipeline',
+        source_uri='https://example.com/pipeline',
+        transient_id_generator=DeterministicTransientIdGenerator(seed=0),
+    )
+    with session.set():
+        expected = build(values, make_judgement, workers=1)
+
+    fp = io.StringIO()
+    with session.set(), BundleWriter(fp) as writer:
+        run(build_async(values, make_judgement, bundle=writer))
+    assert json.loads(fp.getvalue())['judgements'] == expected.judgements
+
+    splitter = BundleSplitter(max_entities=2)
+    run(build_async(values, make_judgement, bundle=splitter))
+    bundles = splitter.close()
+    assert [len(bundle.judgements) for bundle in bundles] == [2, 2, 1]
+
+
+def test_build_async_sessions_are_isolated_per_task():
+    async def build_source(source):
+        session = Session(
+            external_id_prefix=source.lower(),
+            source=source,
+            source_uri=f'https://example.com/{source.lower()}',
+        )
+        with session.set():
+            bundle = await build_async(
+                aiter_values(5), make_sighting, batch_size=2,
+            )
+        return {sighting['source'] for sighting in bundle.sightings}
+
+    async def main():
+        return await asyncio.gather(
+            build_source('First'), build_source('Second'),
+        )
+
+    assert run(main()) == [{'First'}, {'Second'}]
+
+
+def test_build_async_uses_validation_engine_of_task(validation_engine):
+    values = [f'127.0.0.{index}' for index in range(5)]
+
+    for engine in VALIDATION_ENGINE_CHOICES:
+        for executor in [ThreadPoolExecutor(2), ProcessPoolExecutor(2)]:
+            with executor, use_validation_engine(engine):
+                bundle = run(build_async(
+                    values, make_judgement_with_engine,
+                    executor=executor, batch_size=2,
+                ))
+
+            assert {
+                judgement['reason'] for judgement in bundle.judgements
+            } == {engine}
+
+    # The global validation engine is left intact.
+    assert get_validation_engine() == validation_engine
+
+
+def test_iter_build_async_applies_backpressure():
+    read = []
+
+    async def main():
+        async for _ in iter_build_async(
+            aiter_values(100, read), make_judgement,
+            batch_size=1, max_pending=2,
+        ):
+            # Let the producer run ahead as far as it can.
+            await asyncio.sleep(0.05)
+            return len(read)
+
+    # The batch just consumed + the batches pending + the one being queued.
+    assert run(main()) <= 1 + 2 + 1
+
+
+def test_build_async_errors():
+    async def aiter_failing():
+        yield '127.0.0.1'
+        raise RuntimeError('Upstream is down.')
+
+    with assert_raises(RuntimeError):
+        run(build_async(aiter_failing(), make_judgement, batch_size=1))
+
+    with assert_raises(ValidationError):
+        run(build_async(['127.0.0.1', 1], make_judgement, batch_size=1))
+
+    for name in ['batch_size', 'max_pending']:
+        with assert_raises(ValueError):
+            run(build_async([], make_judgement, **{name: 0}))
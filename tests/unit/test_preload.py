@@ -0,0 +1,42 @@
+import gc
+
+from bundlebuilder import preload
+from bundlebuilder.constants import VALIDATION_LEVEL_CHOICES
+from bundlebuilder.models import (
+    Bundle,
+    Judgement,
+    Observable,
+    Sighting,
+)
+from bundlebuilder.models.external_ids import get_external_id_generator
+from bundlebuilder.session import get_session
+
+
+def test_preload():
+    for cls in [Judgement, Observable, Sighting]:
+        cls._compiled_loads.clear()
+    Bundle._fields.clear()
+    get_external_id_generator.cache_clear()
+
+    preload(freeze=False)
+
+    for cls in [Judgement, Observable, Sighting]:
+        assert set(cls._compiled_loads) == set(VALIDATION_LEVEL_CHOICES)
+
+    assert (Judgement, True) in Bundle._fields
+    assert (Sighting, False) in Bundle._fields
+
+    hits = get_external_id_generator.cache_info().hits
+    get_external_id_generator(get_session().external_id_prefix, 'judgement')
+    assert get_external_id_generator.cache_info().hits == hits + 1
+
+
+def test_preload_freezes_objects():
+    if not hasattr(gc, 'freeze'):
+        return
+
+    try:
+        preload()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
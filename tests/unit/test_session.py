@@ -0,0 +1,199 @@
+import asyncio
+import sys
+import threading
+
+import pytest
+from pytest import raises as assert_raises
+
+from bundlebuilder.constants import (
+    SOURCE_MAX_LENGTH,
+    VALIDATION_LEVEL_CHOICES,
+)
+from bundlebuilder.exceptions import ValidationError
+from bundlebuilder.session import (
+    Session,
+    get_default_session,
+    get_session,
+    set_default_session,
+    set_session,
+)
+from tests.unit.utils import (
+    make_sighting,
+    run,
+)
+
+
+def make_session(index):
+    return Session(
+        external_id_prefix=f'prefix-{index}',
+        source=f'Source #{index}',
+        source_uri=f'https://example.com/{index}',
+    )
+
+
+def assert_built_with(entity, session):
+    assert entity.json['source'] == session.source
+    assert entity.json['source_uri'] == session.source_uri
+    assert entity.json['id'].startswith(
+        f'transient:{session.external_id_prefix}-{entity.type}-'
+    )
+    assert all(
+        external_id.startswith(f'{session.external_id_prefix}-{entity.type}-')
+        for external_id in entity.json['external_ids']
+    )
+
+
+def test_session_validation_fails():
+    session = Session(
+        external_id_prefix='',
+        source='\U0001f4a9' * (SOURCE_MAX_LENGTH + 1),
+        source_uri=None,
+        validation_level='lenient',
+        transient_id_generator=object(),
+    )
+
+    with assert_raises(ValidationError) as exc_info:
+        with session.set():
+            pass
+
+    assert exc_info.value.args == ({
+        'external_id_prefix': ['Field may not be blank.'],
+        'source': [
+            f'Must be at most {SOURCE_MAX_LENGTH} characters long.'
+        ],
+        'source_uri': ['Field may not be null.'],
+        'validation_level': [
+            f'Must be one of: '
+            f'{", ".join(map(repr, VALIDATION_LEVEL_CHOICES))}.'
+        ],
+        'transient_id_generator': ['Not a valid transient ID generator.'],
+    },)
+
+    assert get_session() == get_default_session()
+
+
+def test_session_set_and_restore():
+    outer, inner = make_session(1), make_session(2)
+
+    with outer.set():
+        assert get_session() == outer
+
+        with inner.set():
+            assert get_session() == inner
+
+        assert get_session() == outer
+
+    assert get_session() == get_default_session()
+
+    set_session(*outer)
+    try:
+        assert get_session() == outer
+    finally:
+        set_default_session()
+
+    assert get_session() == get_default_session()
+
+
+def test_set_session_applies_to_all_threads():
+    process_session, thread_session = make_session(1), make_session(2)
+    sessions = {}
+
+    def target():
+        sessions['before'] = get_session()
+        with thread_session.set():
+            sessions['within'] = get_session()
+        sessions['after'] = get_session()
+
+    set_session(*process_session)
+    try:
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+
+        # Overriding the session in the thread doesn't affect the process.
+        assert get_session() == process_session
+
+        with thread_session.set():
+            # Setting the session of the process doesn't affect overrides.
+            set_session(*make_session(3))
+            assert get_session() == thread_session
+    finally:
+        set_default_session()
+
+    assert sessions == {
+        'before': process_session,
+        'within': thread_session,
+        'after': process_session,
+    }
+    assert get_session() == get_default_session()
+
+
+def test_session_is_isolated_between_threads():
+    threads_count = 16
+    iterations = 50
+
+    barrier = threading.Barrier(threads_count)
+    failures = []
+
+    def target(index):
+        session = make_session(index)
+        try:
+            # Start all the threads at once to maximize interleaving.
+            barrier.wait()
+
+            assert get_session() == get_default_session()
+
+            with session.set():
+                for _ in range(iterations):
+                    assert get_session() == session
+                    assert_built_with(make_sighting(), session)
+
+            assert get_session() == get_default_session()
+        except BaseException as error:
+            failures.append(error)
+
+    threads = [
+        threading.Thread(target=target, args=(index,))
+        for index in range(threads_count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not failures
+    assert get_session() == get_default_session()
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 7),
+    reason='requires asyncio support for context variables',
+)
+def test_session_is_isolated_between_asyncio_tasks():
+    tasks_count = 16
+    iterations = 50
+
+    async def task(index):
+        session = make_session(index)
+
+        with session.set():
+            for _ in range(iterations):
+                # Yield control to other tasks while the session is set.
+                await asyncio.sleep(0)
+
+                assert get_session() == session
+                assert_built_with(make_sighting(), session)
+
+        assert get_session() == parent
+
+    async def main():
+        with parent.set():
+            await asyncio.gather(*map(task, range(tasks_count)))
+
+            assert get_session() == parent
+
+    parent = make_session(-1)
+
+    run(main())
+
+    assert get_session() == get_default_session()
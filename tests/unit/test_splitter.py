@@ -0,0 +1,143 @@
+import json
+
+from pytest import raises as assert_raises
+
+from bundlebuilder.models import (
+    Judgement,
+    Observable,
+    ValidTime,
+)
+from bundlebuilder.session import Session
+from bundlebuilder.splitter import BundleSplitter
+
+
+def make_judgements(count, reason=''):
+    return [
+        Judgement(
+            confidence='High',
+            disposition=2,
+            disposition_name='Malicious',
+            observable=Observable(type='ip', value=f'10.0.0.{index}'),
+            priority=90,
+            severity='High',
+            source='Python',
+            valid_time=ValidTime(),
+            reason=reason or 'Malicious',
+        )
+        for index in range(count)
+    ]
+
+
+def test_bundle_splitter_validation_fails():
+    for kwargs in [{'max_entities': 0}, {'max_bytes': '1MB'}]:
+        with assert_raises(ValueError):
+            BundleSplitter(**kwargs)
+
+    with assert_raises(ValueError):
+        BundleSplitter(judgements=[])
+
+    splitter = BundleSplitter()
+    splitter.close()
+
+    with assert_raises(ValueError):
+        splitter.add_many(make_judgements(1))
+
+
+def test_bundle_splitter_splits_by_entity_count():
+    session = Session(
+        external_id_prefix='splitter',
+        source='Splitter',
+        source_uri='https://example.com/splitter',
+    )
+
+    with session.set():
+        judgements = make_judgements(5)
+
+    # The session of the splitter is used regardless of the current one.
+    with session.set():
+        splitter = BundleSplitter(max_entities=4, title='Split')
+
+    splitter.add_many(judgements)
+    splitter.add_judgements(judgements, ref=True)
+    # Duplicates aren't counted.
+    splitter.add_judgement(judgements[-1], ref=True)
+    bundles = splitter.close()
+
+    assert [len(bundle.json.get('judgements', [])) for bundle in bundles] == [
+        4, 1, 0,
+    ]
+    assert [
+        len(bundle.json.get('judgement_refs', [])) for bundle in bundles
+    ] == [0, 3, 2]
+
+    assert len({bundle.external_ids[0] for bundle in bundles}) == 3
+    for bundle in bundles:
+        assert bundle.source == session.source
+        assert bundle.source_uri == session.source_uri
+        assert bundle.title == 'Split'
+        assert bundle.external_ids[0].startswith('splitter-bundle-')
+
+
+def test_bundle_splitter_splits_by_byte_size():
+    judgements = make_judgements(20, reason='x' * 500)
+    max_bytes = 4096
+
+    emitted = []
+    with BundleSplitter(max_bytes=max_bytes, on_bundle=emitted.append) as s:
+        for judgement in judgements:
+            s.add_judgement(judgement)
+            s.add_judgement(judgement, ref=True)
+
+    assert s.bundles == []
+    assert len(emitted) > 1
+
+    sizes = [len(json.dumps(bundle.json)) for bundle in emitted]
+    assert all(size <= max_bytes for size in sizes)
+
+    # The estimates are exact, so each bundle is as full as it can be.
+    for size, bundle in zip(sizes[:-1], emitted[1:]):
+        next_entry = json.dumps(bundle.json['judgements'][0])
+        assert size + len(', ') + len(next_entry) > max_bytes
+
+    assert [
+        judgement for bundle in emitted for judgement in bundle.judgements
+    ] == [judgement.json for judgement in judgements]
+
+
+def test_bundle_splitter_accounts_for_replaced_and_merged_duplicates():
+    max_bytes = 2500
+
+    for duplicate_policy in ['merge', 'keep_last']:
+        splitter = BundleSplitter(
+            max_bytes=max_bytes,
+            duplicate_policy=duplicate_policy,
+        )
+
+        tags = []
+        for index in range(10):
+            # Each duplicate (matched by its ID) is larger than the last one.
+            tags = tags + ['x' * 100 + str(index)]
+            splitter.insert_items(
+                ('judgements', {'id': f'judgement-{number}', 'tags': tags})
+                for number in range(5)
+            )
+
+        bundles = splitter.close()
+
+        assert len(bundles) > 1
+        assert all(
+            len(json.dumps(bundle.json)) <= max_bytes for bundle in bundles
+        )
+        assert bundles[-1].judgements[-1]['tags'] == tags
+
+
+def test_bundle_splitter_puts_oversized_entities_into_separate_bundles():
+    judgements = make_judgements(3, reason='x' * 1000)
+
+    splitter = BundleSplitter(max_bytes=1000)
+    splitter.add_many(judgements)
+    bundles = splitter.close()
+
+    assert [bundle.judgements for bundle in bundles] == [
+        [judgement.json] for judgement in judgements
+    ]
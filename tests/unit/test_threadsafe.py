@@ -0,0 +1,111 @@
+import copy
+import io
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from bundlebuilder.models import (
+    Bundle,
+    Verdict,
+)
+from bundlebuilder.threadsafe import ThreadSafeBundle
+from tests.unit.utils import make_judgement
+
+
+def test_thread_safe_bundle_is_a_bundle():
+    bundle = ThreadSafeBundle(description='Threads')
+
+    assert isinstance(bundle, Bundle)
+    assert bundle.type == 'bundle'
+    assert bundle.json['type'] == 'bundle'
+    assert bundle.description == 'Threads'
+
+
+def test_thread_safe_bundle_merges_in_the_order_of_adding():
+    judgements = [make_judgement(f'127.0.0.{index}') for index in range(3)]
+    verdict = Verdict.from_judgement(judgements[0])
+
+    bundle = ThreadSafeBundle()
+
+    def add(index):
+        bundle.add(judgements[index])
+
+    # Add the entities from different threads one after another.
+    with ThreadPoolExecutor(2) as executor:
+        executor.submit(add, 0).result()
+        executor.submit(add, 1).result()
+        executor.submit(bundle.add_many, [judgements[2], verdict]).result()
+        executor.submit(add, 1).result()
+
+    expected = Bundle()
+    expected.add_many(judgements + [verdict])
+
+    assert bundle.judgements == expected.judgements
+    assert bundle.verdicts == expected.verdicts
+
+
+def test_thread_safe_bundle_handles_duplicates_like_bundle():
+    judgement = make_judgement('127.0.0.1')
+    duplicate = copy.copy(judgement)
+    duplicate.json = {**judgement.json, 'reason': 'Duplicate'}
+
+    for duplicate_policy in ['keep_first', 'keep_last', 'merge']:
+        bundle = ThreadSafeBundle(duplicate_policy=duplicate_policy)
+        with ThreadPoolExecutor(2) as executor:
+            executor.submit(bundle.add, judgement).result()
+            executor.submit(bundle.add, duplicate).result()
+
+        expected = Bundle(duplicate_policy=duplicate_policy)
+        expected.add_many([judgement, duplicate])
+
+        assert bundle.judgements == expected.judgements
+
+
+def test_thread_safe_bundle_with_concurrent_threads():
+    threads_count = 8
+    values = [f'127.0.0.{index}' for index in range(50)]
+    # Make sure that all the threads are actually adding at the same time.
+    barrier = Barrier(threads_count)
+
+    bundle = ThreadSafeBundle()
+
+    def add_all(_):
+        judgements = [make_judgement(value) for value in values]
+        barrier.wait()
+        for judgement in judgements:
+            bundle.add_judgement(judgement)
+            # Refs to the same judgements are duplicates too.
+            bundle.add_judgement(judgement, ref=True)
+
+    with ThreadPoolExecutor(threads_count) as executor:
+        list(executor.map(add_all, range(threads_count)))
+
+    # Each thread built its own judgements (with their own IDs), but they
+    # share the same XIDs, so only one of each is kept.
+    assert len(bundle.judgements) == len(values)
+    assert len(bundle.judgement_refs) == len(values) * threads_count
+
+    # Anything added after finalizing gets merged as well.
+    bundle.add(make_judgement('127.0.0.255'))
+    assert len(bundle.json['judgements']) == len(values) + 1
+
+
+def test_thread_safe_bundle_pickling_and_loading():
+    judgement = make_judgement('127.0.0.1')
+
+    bundle = ThreadSafeBundle(duplicate_policy='merge')
+    bundle.add(judgement)
+
+    for copied_bundle in [
+        pickle.loads(pickle.dumps(bundle)),
+        copy.copy(bundle),
+        ThreadSafeBundle.load(io.BytesIO(bundle.to_bytes()), 'merge'),
+    ]:
+        assert type(copied_bundle) is ThreadSafeBundle
+        assert copied_bundle.json == bundle.json
+        assert copied_bundle.duplicate_policy == 'merge'
+
+        copied_bundle.add(make_judgement('127.0.0.2'))
+        assert len(copied_bundle.judgements) == 2
+
+    assert bundle.get_entity(judgement.id) == judgement.json
@@ -0,0 +1,168 @@
+import os
+import pickle
+import re
+import threading
+
+import pytest
+
+from bundlebuilder.models import (
+    Bundle,
+    Judgement,
+    Observable,
+    ValidTime,
+)
+from bundlebuilder.session import Session
+from bundlebuilder.transient_ids import (
+    CounterTransientIdGenerator,
+    DeterministicTransientIdGenerator,
+    RandomTransientIdGenerator,
+    get_default_transient_id_generator,
+)
+
+
+ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+def make_bundle(session):
+    with session.set():
+        bundle = Bundle()
+        for value in ['127.0.0.1', '127.0.0.2']:
+            judgement = Judgement(
+                confidence='High',
+                disposition=2,
+                disposition_name='Malicious',
+                observable=Observable(type='ip', value=value),
+                priority=90,
+                severity='High',
+                source='Python',
+                valid_time=ValidTime(),
+            )
+            bundle.add_judgement(judgement)
+        return bundle.json
+
+
+def test_transient_id_generators_generate_unique_hex_strings():
+    for generator in [
+        RandomTransientIdGenerator(),
+        CounterTransientIdGenerator(),
+        DeterministicTransientIdGenerator(seed=42),
+        get_default_transient_id_generator(),
+    ]:
+        ids = [generator.generate() for _ in range(1000)]
+
+        assert all(ID_RE.match(id_) for id_ in ids)
+        assert len(set(ids)) == len(ids)
+
+
+def test_counter_transient_id_generator_is_thread_safe():
+    generator = CounterTransientIdGenerator()
+    results = []
+
+    def target():
+        results.append([generator.generate() for _ in range(1000)])
+
+    threads = [threading.Thread(target=target) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [id_ for ids in results for id_ in ids]
+
+    assert len(set(ids)) == len(ids) == 8000
+
+
+def test_counter_transient_id_generator_gets_new_prefix_when_copied():
+    generator = CounterTransientIdGenerator()
+    copy = pickle.loads(pickle.dumps(generator))
+
+    assert generator.generate()[:16] != copy.generate()[:16]
+
+
+@pytest.mark.skipif(
+    not hasattr(os, 'register_at_fork'),
+    reason='requires os.register_at_fork',
+)
+def test_counter_transient_id_generator_gets_new_prefix_after_fork():
+    generator = get_default_transient_id_generator()
+    parent_id = generator.generate()
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            os.write(write_fd, generator.generate().encode())
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as fin:
+        child_id = fin.read().decode()
+    os.waitpid(pid, 0)
+
+    assert ID_RE.match(child_id)
+    assert child_id[:16] != parent_id[:16]
+    assert generator.generate()[:16] == parent_id[:16]
+
+
+def test_deterministic_transient_id_generator_is_reproducible():
+    def make_session():
+        return Session(
+            external_id_prefix='golden',
+            source='Golden',
+            source_uri='https://example.com/golden',
+            transient_id_generator=DeterministicTransientIdGenerator(seed=7),
+        )
+
+    bundle = make_bundle(make_session())
+
+    assert bundle == make_bundle(make_session())
+    assert bundle['id'] == (
+        'transient:golden-bundle-'
+        + DeterministicTransientIdGenerator(seed=7).generate()
+    )
+    assert bundle != make_bundle(
+        make_session()._replace(
+            transient_id_generator=DeterministicTransientIdGenerator(seed=8),
+        )
+    )
+
+    generator = DeterministicTransientIdGenerator(seed=7)
+    ids = [generator.generate() for _ in range(3)]
+    generator.reset()
+    assert [generator.generate() for _ in range(3)] == ids
+    assert pickle.loads(pickle.dumps(generator)).generate() == ids[0]
+
+
+def test_default_transient_id_generator_is_used_by_default():
+    prefix = get_default_transient_id_generator().generate()[:16]
+
+    bundle = make_bundle(
+        Session(
+            external_id_prefix='default',
+            source='Default',
+            source_uri='https://example.com/default',
+        )
+    )
+
+    assert bundle['id'][-32:-16] == prefix
+
+
+def test_spawned_transient_id_generators_dont_clash():
+    for generator in [RandomTransientIdGenerator(),
+                      CounterTransientIdGenerator(),
+                      DeterministicTransientIdGenerator(seed=7)]:
+        generators = [generator] + [generator.spawn(key) for key in range(3)]
+        ids = {
+            generator.generate()
+            for generator in generators
+            for _ in range(10)
+        }
+        assert len(ids) == 40
+
+    # Spawning deterministic generators is reproducible too.
+    generator = DeterministicTransientIdGenerator(seed=7)
+    assert generator.spawn(1).generate() == (
+        DeterministicTransientIdGenerator(seed=7).spawn(1).generate()
+    )
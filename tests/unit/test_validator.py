@@ -0,0 +1,84 @@
+import io
+import json
+
+from pytest import raises as assert_raises
+
+from bundlebuilder.models import Judgement
+from bundlebuilder.validator import (
+    BundleValidator,
+    format_path,
+    iter_entity_errors,
+)
+from tests.unit.utils import make_bundle_json
+
+
+def test_format_path():
+    assert format_path(()) == '$'
+    assert format_path(('sightings', 0, 'count')) == '$.sightings[0].count'
+
+
+def test_iter_entity_errors():
+    bundle_json = make_bundle_json()
+    judgement_json = bundle_json['judgements'][0]
+
+    assert list(iter_entity_errors(Judgement, judgement_json)) == []
+
+    assert list(iter_entity_errors(Judgement, [])) == [
+        ((), 'Not a valid CTIM Judgement.'),
+    ]
+
+    judgement_json = {
+        **judgement_json,
+        'type': 'sighting',
+        'observable': {'type': 'ip', 'value': ''},
+        'unknown': 'value',
+    }
+
+    assert list(iter_entity_errors(Judgement, judgement_json, ('x',))) == [
+        (('x', 'type'), "Must be equal to 'judgement'."),
+        (('x', 'observable', 'value'), 'Field may not be blank.'),
+        (('x', 'unknown'), 'Unknown field.'),
+    ]
+
+
+def test_bundle_validator():
+    bundle_json = make_bundle_json()
+
+    for workers in [1, 2]:
+        validator = BundleValidator(workers=workers, batch_size=1)
+        errors = list(validator.iter_errors(
+            io.StringIO(json.dumps(bundle_json))
+        ))
+        assert errors == []
+        assert validator.count == 4
+
+    bundle_json['judgements'][0]['priority'] = 101
+    bundle_json['judgement_refs'].append(1)
+    bundle_json['relationships'][0]['source_ref'] = None
+    bundle_json['verdicts'][0]['judgement_id'] = 1
+    bundle_json['tlp'] = 'blue'
+
+    for workers in [1, 2]:
+        validator = BundleValidator(workers=workers, batch_size=2)
+        errors = list(validator.iter_errors(
+            io.BytesIO(json.dumps(bundle_json).encode('utf-8'))
+        ))
+        assert [format_path(path) for path, _ in errors] == [
+            '$.judgements[0].priority',
+            '$.judgement_refs[1]',
+            '$.relationships[0].source_ref',
+            '$.verdicts[0].judgement_id',
+            '$.tlp',
+        ]
+        assert validator.count == 5
+
+    with assert_raises(ValueError):
+        list(BundleValidator().iter_errors(io.StringIO('{"judgements": [')))
+
+
+def test_bundle_validator_with_invalid_arguments_fails():
+    with assert_raises(ValueError):
+        BundleValidator(workers=0)
+
+    with assert_raises(ValueError):
+        BundleValidator(batch_size='1000')
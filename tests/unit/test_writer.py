@@ -0,0 +1,127 @@
+import io
+import json
+
+from pytest import raises as assert_raises
+
+from bundlebuilder.exceptions import ValidationError
+from bundlebuilder.models import (
+    Bundle,
+    Judgement,
+    Observable,
+    ObservedTime,
+    Relationship,
+    Sighting,
+    ValidTime,
+    Verdict,
+)
+from bundlebuilder.session import Session
+from bundlebuilder.transient_ids import DeterministicTransientIdGenerator
+from bundlebuilder.writer import BundleWriter
+
+
+def make_session():
+    return Session(
+        external_id_prefix='writer',
+        source='Writer',
+        source_uri='https://example.com/writer',
+        transient_id_generator=DeterministicTransientIdGenerator(),
+    )
+
+
+def make_entities():
+    entities = []
+    for index in range(5):
+        observable = Observable(type='ip', value=f'10.0.0.{index}')
+        judgement = Judgement(
+            confidence='High',
+            disposition=2,
+            disposition_name='Malicious',
+            observable=observable,
+            priority=90,
+            severity='High',
+            source='Python',
+            valid_time=ValidTime(),
+            reason='¡Hola!',
+        )
+        sighting = Sighting(
+            confidence='High',
+            count=1,
+            observed_time=ObservedTime(
+                start_time='2019-03-01T22:26:29.229Z',
+            ),
+            observables=[observable],
+        )
+        relationship = Relationship(
+            relationship_type='based-on',
+            source_ref=sighting,
+            target_ref=judgement,
+        )
+        entities.extend([
+            (sighting, False),
+            (judgement, False),
+            (relationship, False),
+            (judgement, True),
+            (Verdict.from_judgement(judgement), False),
+        ])
+    return entities
+
+
+def test_bundle_writer_output_matches_bundle_json():
+    with make_session().set():
+        entities = make_entities()
+        data = {'title': 'Streamed', 'tlp': 'white'}
+
+        bundle = Bundle(**data)
+        for entity, ref in entities:
+            bundle.add(entity, ref)
+
+        fp = io.StringIO()
+        with BundleWriter(fp, **data) as writer:
+            for entity, ref in entities[:10]:
+                writer.add(entity, ref)
+            writer.add_many(
+                [entity for entity, ref in entities[10:] if not ref]
+            )
+            writer.add_judgements(
+                [entity for entity, ref in entities[10:] if ref], ref=True,
+            )
+
+    # The bundles have different transient IDs, but the same XIDs.
+    expected = json.dumps({**bundle.json, 'id': writer.bundle.id})
+
+    assert fp.getvalue() == expected
+    assert json.loads(fp.getvalue())['judgement_refs'] == [
+        entity.id for entity, ref in entities if ref
+    ]
+
+
+def test_bundle_writer_of_empty_bundle():
+    fp = io.StringIO()
+
+    with BundleWriter(fp) as writer:
+        pass
+
+    assert fp.getvalue() == json.dumps(writer.bundle.json)
+
+    # Closing again is a no-op.
+    writer.close()
+    assert fp.getvalue() == json.dumps(writer.bundle.json)
+
+    with assert_raises(ValueError):
+        writer.add(make_entities()[0][0])
+
+
+def test_bundle_writer_validation_fails():
+    with assert_raises(ValueError):
+        BundleWriter(io.StringIO(), judgements=[])
+
+    with assert_raises(ValidationError):
+        BundleWriter(io.StringIO(), tlp='razzmatazz')
+
+    writer = BundleWriter(io.StringIO())
+
+    with assert_raises(ValidationError):
+        writer.add_sighting(make_entities()[1][0])
+
+    with assert_raises(ValidationError):
+        writer.add_many([None])
@@ -1,7 +1,20 @@
+import asyncio
 import datetime as dt
+import json
 import re
 from unittest.mock import MagicMock
 
+from bundlebuilder.models import (
+    Bundle,
+    Judgement,
+    Observable,
+    ObservedTime,
+    Relationship,
+    Sighting,
+    ValidTime,
+    Verdict,
+)
+
 
 def mock_transient_id(external_id_prefix, type):
     id_mock = MagicMock()
@@ -33,3 +46,69 @@ def utc_now_iso():
     # Python datetime objects don't have time zone info by default,
     # and without it, Python actually violates the ISO 8601 specification.
     return dt.datetime.utcnow().isoformat(timespec='milliseconds') + 'Z'
+
+
+# Factories may be passed to worker processes, so they must be picklable,
+# i.e. defined at the module level.
+
+def make_judgement(value='127.0.0.1', **data):
+    return Judgement(
+        **{
+            'confidence': 'High',
+            'disposition': 2,
+            'disposition_name': 'Malicious',
+            'observable': Observable(type='ip', value=value),
+            'priority': 90,
+            'severity': 'High',
+            'source': 'Python',
+            'valid_time': ValidTime(),
+            **data
+        }
+    )
+
+
+def make_judgement_and_verdict(value):
+    judgement = make_judgement(value)
+    return [judgement, Verdict.from_judgement(judgement)]
+
+
+def make_sighting(value='127.0.0.1', **data):
+    # The source of the sighting comes from the current session by default.
+    return Sighting(
+        **{
+            'confidence': 'High',
+            'count': 1,
+            'observed_time': ObservedTime(
+                start_time='2019-03-01T22:26:29.229Z',
+            ),
+            'observables': [Observable(type='ip', value=value)],
+            **data
+        }
+    )
+
+
+def make_bundle_json():
+    judgement = make_judgement()
+
+    bundle = Bundle(description='Bundle')
+    bundle.add_judgement(judgement)
+    bundle.add_judgement(judgement, ref=True)
+    bundle.add_relationship(Relationship(
+        relationship_type='based-on',
+        source_ref=judgement,
+        target_ref=judgement,
+    ))
+    bundle.add_verdict(Verdict.from_judgement(judgement))
+
+    # Make sure that the JSON is plain (i.e. not shared with the entities).
+    return json.loads(json.dumps(bundle.json))
+
+
+def run(coroutine):
+    # Same as `asyncio.run` (which is only available since Python 3.7).
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()